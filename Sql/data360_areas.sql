@@ -0,0 +1,15 @@
+-- countries of WB_FINDEX with their labels,
+-- read once to build the country crosswalk;
+-- aggregate regions come from data360_aggregate_areas
+-- created by data360_prepare.sql
+select
+	distinct REF_AREA,
+	REF_AREA_LABEL
+from
+	WB_FINDEX
+where
+	REF_AREA not in (
+	select
+		REF_AREA
+	from
+		data360_aggregate_areas);
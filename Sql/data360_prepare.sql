@@ -0,0 +1,29 @@
+-- precomputes the aggregate regions of WB_FINDEX
+-- (income groups, world, regional aggregates)
+-- so that excluding them is an indexed lookup
+-- instead of LIKE scans of every row
+drop table if exists data360_aggregate_areas;
+create table data360_aggregate_areas (
+	REF_AREA text primary key
+) without rowid;
+insert into data360_aggregate_areas
+select
+	distinct REF_AREA
+from
+	WB_FINDEX
+where
+	REF_AREA_LABEL like '%income%'
+	or REF_AREA_LABEL like '%world%'
+	or REF_AREA_LABEL like '%asia%';
+
+-- serves the dimension filters of the base series
+create index if not exists idx_wb_findex_dimensions on WB_FINDEX (
+	UNIT_MEASURE,
+	SEX,
+	AGE,
+	URBANISATION,
+	COMP_BREAKDOWN_1,
+	COMP_BREAKDOWN_2,
+	COMP_BREAKDOWN_3,
+	TIME_PERIOD
+);
@@ -0,0 +1,25 @@
+-- base series values of Data360,
+-- same filters as base_series_data360.sql
+-- served by idx_wb_findex_dimensions;
+-- aggregate regions come from data360_aggregate_areas
+-- created by data360_prepare.sql
+select
+	substr(indicator, 11) as indicator,
+	REF_AREA as country_id,
+	TIME_PERIOD as year,
+	OBS_VALUE as value
+from
+	WB_FINDEX
+where
+	UNIT_MEASURE = 'PT_RESP'
+	and SEX = '_T'
+	and AGE = 'Y_GE15'
+	and URBANISATION = '_T'
+	and COMP_BREAKDOWN_1 = '_T'
+	and COMP_BREAKDOWN_2 = '_T'
+	and COMP_BREAKDOWN_3 = '_T'
+	and REF_AREA not in (
+	select
+		REF_AREA
+	from
+		data360_aggregate_areas);
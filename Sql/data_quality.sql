@@ -0,0 +1,34 @@
+-- one scan of the base series values
+-- counts rows, non-null and zero values
+-- per series, wave and country;
+-- zeros are ambiguous, they are returned as null values
+select
+	series_id,
+	wave_id,
+	iso3_id as country_id,
+	count(*) as n_rows,
+	count(series_value) as n_values,
+	sum(series_value = 0) as n_zero,
+	max(nullif(series_value, 0)) as value
+from
+	series_values
+where
+	source_code = 'WB'
+	and series_id in (
+	select
+		distinct series_id
+	from
+		series
+	where
+		series_id not glob '*.[0-9]'
+		and series_id not glob '*.1[0-2]'
+		and series_id not glob '*.s'
+		-- fin24other_SD_ND and fin24other_VD
+		-- are stratifications of fin24other
+		-- deviating from the usual stratification structure
+		and series_id not glob '*D'
+	)
+group by
+	series_id,
+	wave_id,
+	iso3_id;
@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+from scipy import stats
+
+
+def _between_group_sums(
+    membership: np.ndarray,
+    values: np.ndarray,
+    availability: np.ndarray,
+) -> np.ndarray:
+    """Sum of ``S**2 / n`` over groups for every indicator.
+
+    ``membership`` has shape (..., n_samples, n_groups); the leading axes
+    batch several labelings. Missing values are zero in ``values``.
+    """
+    counts = np.einsum("...ng,np->...gp", membership, availability)
+    sums = np.einsum("...ng,np->...gp", membership, values)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(counts > 0, sums**2 / counts, 0.0).sum(axis=-2)
+
+
+def _permutation_exceedances(
+    codes: np.ndarray,
+    n_groups: int,
+    values: np.ndarray,
+    availability: np.ndarray,
+    observed: np.ndarray,
+    n_permutations: int,
+    batch_size: int,
+    seed: np.random.SeedSequence,
+) -> np.ndarray:
+    """Count permutations whose between-group sum reaches the observed one."""
+    rng = np.random.default_rng(seed)
+    exceedances = np.zeros(values.shape[1], dtype=np.int64)
+    group_ids = np.arange(n_groups)
+    for start in range(0, n_permutations, batch_size):
+        size = min(batch_size, n_permutations - start)
+        # one row of labels per permutation
+        permuted = rng.permuted(np.tile(codes, (size, 1)), axis=1)
+        membership = (permuted[:, :, None] == group_ids).astype(np.float64)
+        between = _between_group_sums(membership, values, availability)
+        exceedances += (between >= observed * (1 - 1e-12)).sum(axis=0)
+    return exceedances
+
+
+def cluster_association(
+    data: pd.DataFrame,
+    labels: pd.Series | npt.ArrayLike,
+    *,
+    n_permutations: int = 999,
+    random_state: int | None = None,
+    batch_size: int = 100,
+    max_workers: int | None = None,
+) -> pd.DataFrame:
+    """Rank indicators by how strongly they separate clusters.
+
+    All indicators are tested at once. Every indicator uses the observations
+    where it is available. Between- and within-cluster sums of squares come
+    from products of a cluster membership matrix with the masked data;
+    permutation p-values shuffle the labels in batches of label matrices
+    spread across a process pool.
+
+    Parameters
+    ----------
+    data : pandas.DataFrame
+        Observations by row and indicators by column, missing values as
+        ``NaN``.
+    labels : pandas.Series or array-like of shape (n_samples,)
+        Cluster of every observation. A Series is aligned to ``data.index``;
+        observations without a label are dropped.
+    n_permutations : int, default=999
+        Number of label permutations. ``0`` skips permutation testing.
+    random_state : int or None, default=None
+        Seed of the permutations; each batch of work gets its own
+        deterministic child seed.
+    batch_size : int, default=100
+        Permutations evaluated in one array computation.
+    max_workers : int or None, default=None
+        Size of the process pool. ``1`` permutes in the calling process.
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per indicator, sorted by decreasing ``eta_squared``, with the
+        number of observations and clusters, ANOVA ``f_statistic`` and
+        ``f_pvalue``, effect sizes ``eta_squared`` and ``omega_squared``,
+        Kruskal-Wallis ``kruskal_h``, ``kruskal_pvalue`` and
+        ``epsilon_squared``, and ``permutation_pvalue`` of the ANOVA
+        statistic.
+    """
+    if isinstance(labels, pd.Series):
+        labels = labels.reindex(data.index)
+    label_series = pd.Series(np.asarray(labels), index=data.index).dropna()
+    frame = data.loc[label_series.index]
+    codes, _ = pd.factorize(label_series, sort=True)
+    n_groups = codes.max() + 1
+
+    raw = frame.to_numpy(dtype=np.float64)
+    mask = ~np.isnan(raw)
+    availability = mask.astype(np.float64)
+    # centering does not change the statistics and limits cancellation
+    values = np.where(mask, raw - np.nanmean(raw, axis=0), 0.0)
+    membership = (codes[:, None] == np.arange(n_groups)).astype(np.float64)
+
+    n_obs = availability.sum(axis=0)
+    group_counts = membership.T @ availability
+    present_groups = (group_counts > 0).sum(axis=0)
+    total = values.sum(axis=0)
+    correction = np.divide(
+        total**2, n_obs, out=np.zeros_like(n_obs), where=n_obs > 0
+    )
+    between_sums = _between_group_sums(membership, values, availability)
+    ss_between = between_sums - correction
+    ss_total = (values**2).sum(axis=0) - correction
+    ss_within = ss_total - ss_between
+
+    df_between = present_groups - 1
+    df_within = n_obs - present_groups
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ms_within = ss_within / df_within
+        f_statistic = (ss_between / df_between) / ms_within
+        eta_squared = ss_between / ss_total
+        omega_squared = (ss_between - df_between * ms_within) / (
+            ss_total + ms_within
+        )
+    f_pvalue = stats.f.sf(f_statistic, df_between, df_within)
+
+    # Kruskal-Wallis from average ranks of the observed values
+    ranks = stats.rankdata(raw, axis=0, nan_policy="omit")
+    tie_sizes = (
+        stats.rankdata(raw, axis=0, method="max", nan_policy="omit")
+        - stats.rankdata(raw, axis=0, method="min", nan_policy="omit")
+        + 1
+    )
+    rank_sums = membership.T @ np.nan_to_num(ranks)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        h_statistic = 12 / (n_obs * (n_obs + 1)) * np.where(
+            group_counts > 0, rank_sums**2 / group_counts, 0.0
+        ).sum(axis=0) - 3 * (n_obs + 1)
+        # summing t**3 - t over tie groups equals summing t**2 - 1 over values
+        tie_sum = np.nansum(tie_sizes**2, axis=0) - n_obs
+        ties = 1 - tie_sum / (n_obs**3 - n_obs)
+        h_statistic = h_statistic / ties
+        epsilon_squared = h_statistic / (n_obs - 1)
+    kruskal_pvalue = stats.chi2.sf(h_statistic, df_between)
+
+    result = pd.DataFrame(
+        {
+            "n_obs": n_obs.astype(int),
+            "n_clusters": present_groups,
+            "f_statistic": f_statistic,
+            "f_pvalue": f_pvalue,
+            "eta_squared": eta_squared,
+            "omega_squared": omega_squared,
+            "kruskal_h": h_statistic,
+            "kruskal_pvalue": kruskal_pvalue,
+            "epsilon_squared": epsilon_squared,
+        },
+        index=data.columns,
+    )
+
+    if n_permutations > 0:
+        n_batches = -(-n_permutations // batch_size)
+        seeds = np.random.SeedSequence(random_state).spawn(n_batches)
+        sizes = [
+            min(batch_size, n_permutations - batch * batch_size)
+            for batch in range(n_batches)
+        ]
+        arguments = [
+            (
+                codes,
+                n_groups,
+                values,
+                availability,
+                between_sums,
+                size,
+                batch_size,
+                seed,
+            )
+            for size, seed in zip(sizes, seeds)
+        ]
+        if max_workers == 1:
+            exceedances = sum(
+                _permutation_exceedances(*argument) for argument in arguments
+            )
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                exceedances = sum(
+                    pool.map(_permutation_exceedances, *zip(*arguments))
+                )
+        result["permutation_pvalue"] = (1 + exceedances) / (1 + n_permutations)
+
+    return result.sort_values("eta_squared", ascending=False)
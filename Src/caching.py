@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+from os import PathLike
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+
+DEFAULT_MAX_BYTES = 256 * 2**20
+
+
+def array_fingerprint(*arrays: npt.ArrayLike, **params: Any) -> str:
+    """Hash array contents together with the parameters that produced a result.
+
+    Parameters
+    ----------
+    *arrays : array-like
+        Arrays whose shape, dtype, and bytes identify the input.
+    **params
+        JSON-serializable parameters, hashed in sorted key order.
+
+    Returns
+    -------
+    str
+        Hexadecimal SHA-256 digest.
+    """
+    digest = hashlib.sha256()
+    for array in arrays:
+        values = np.ascontiguousarray(array)
+        digest.update(f"{values.shape}{values.dtype.str}".encode())
+        digest.update(values.tobytes())
+    digest.update(json.dumps(params, sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+
+class ResultStore:
+    """Directory of compressed array bundles with size-bounded LRU eviction.
+
+    Every entry is one ``.npz`` file named after its key. Reading an entry
+    refreshes its modification time; when the directory grows beyond
+    ``max_bytes``, the least recently used entries are removed first.
+
+    Parameters
+    ----------
+    directory : str or path-like
+        Directory holding the entries. It is created when missing.
+    max_bytes : int, default=256 MiB
+        Upper bound on the total size of stored entries.
+    """
+
+    def __init__(
+        self,
+        directory: str | PathLike[str],
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.npz"
+
+    def get(self, key: str) -> dict[str, np.ndarray] | None:
+        """Return the arrays stored under ``key``, or ``None`` on a miss."""
+        path = self._path(key)
+        try:
+            with np.load(path, allow_pickle=False) as bundle:
+                arrays = {name: bundle[name] for name in bundle.files}
+        except (FileNotFoundError, ValueError, OSError):
+            return None
+        # the modification time records the last use
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        return arrays
+
+    def put(self, key: str, **arrays: npt.ArrayLike) -> None:
+        """Store ``arrays`` under ``key`` and evict entries over the size bound."""
+        # write to a temporary file first so readers never see partial entries
+        fd, temp_name = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as file:
+            np.savez_compressed(file, **arrays)
+        os.replace(temp_name, self._path(key))
+        self.evict()
+
+    def evict(self) -> int:
+        """Remove least recently used entries until the store fits its bound.
+
+        Returns
+        -------
+        int
+            Number of removed entries.
+        """
+        entries = []
+        for path in self.directory.glob("*.npz"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        return removed
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        for path in self.directory.glob("*.npz"):
+            path.unlink(missing_ok=True)
+
+    def __contains__(self, key: str) -> bool:
+        return self._path(key).exists()
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self.directory.glob("*.npz"))
@@ -1,22 +1,472 @@
 from __future__ import annotations
 
-from collections.abc import Iterable, Sequence
-from typing import Any
+from collections.abc import Iterable, Mapping, Sequence
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from os import PathLike
+from pathlib import Path
+from time import perf_counter
+from typing import Any, NamedTuple
 
 import numpy as np
 import numpy.typing as npt
 import pandas as pd
-from sklearn.metrics import confusion_matrix
 from scipy.optimize import linear_sum_assignment
+from scipy.sparse import csr_matrix
 from itertools import product
-from sklearn.cluster import KMeans
-from sklearn.metrics import silhouette_score, silhouette_samples
-from scipy.stats import mode
+from sklearn.cluster import AgglomerativeClustering, KMeans
+from sklearn.decomposition import PCA
+from sklearn.metrics import pairwise_distances, silhouette_score, silhouette_samples
+import sklearn
+
+from caching import ResultStore, array_fingerprint
 
 LabelMapping = tuple[np.ndarray, np.ndarray]
 MetricKey = tuple[Any, ...]
 
 
+class KMeansFit(NamedTuple):
+    """Fitted K-means solution, with the attribute names of ``KMeans``.
+
+    Only the fitted outputs are kept, so fits of every engine, and fits
+    read back from a ``caching.ResultStore``, have the same type whatever
+    the installed scikit-learn version.
+    """
+
+    cluster_centers_: np.ndarray
+    labels_: np.ndarray
+    inertia_: float
+    n_iter_: int
+
+
+def _stored_fit(result: Mapping[str, Any]) -> KMeansFit:
+    """Fit read back from a cache entry."""
+    return KMeansFit(
+        np.asarray(result["centroids"]),
+        np.asarray(result["labels"]),
+        float(result["inertia"]),
+        int(result["n_iter"]),
+    )
+
+
+def _estimator_fit(model: KMeans) -> KMeansFit:
+    """Fitted outputs of a ``KMeans`` estimator."""
+    return KMeansFit(
+        model.cluster_centers_, model.labels_, float(model.inertia_), model.n_iter_
+    )
+
+
+def _split_highest_sse_cluster(
+    data: np.ndarray,
+    centers: np.ndarray,
+    labels: np.ndarray,
+    random_state: int | None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Replace the cluster with the largest SSE by a 2-means split of it."""
+    residuals = ((data - centers[labels]) ** 2).sum(axis=1)
+    sse = np.bincount(labels, weights=residuals, minlength=len(centers))
+    target = int(np.argmax(sse))
+    members = data[labels == target]
+    if len(np.unique(members, axis=0)) >= 2:
+        halves = KMeans(n_clusters=2, n_init=1, random_state=random_state)
+        new_centers = halves.fit(members).cluster_centers_
+    else:
+        # nothing to split, seed the new cluster at the worst-fitted point
+        new_centers = np.vstack([centers[target], data[np.argmax(residuals)]])
+    centers = np.vstack([np.delete(centers, target, axis=0), new_centers])
+    distances = ((data[:, None, :] - centers[None, :, :]) ** 2).sum(axis=2)
+    return centers, distances.argmin(axis=1)
+
+
+def _fit_kmeans(
+    data: np.ndarray,
+    cluster_count: int,
+    model_options: dict[str, Any],
+    engine: str,
+) -> KMeansFit:
+    """Fit K-means with the requested engine."""
+    if engine in ("batched", "partial"):
+        n_init = model_options.get("n_init")
+        run = batched_kmeans if engine == "batched" else partial_distance_kmeans
+        centroids, labels, inertia, n_iter = run(
+            data,
+            cluster_count,
+            # "auto" and the default mean a single k-means++ run
+            n_init=n_init if isinstance(n_init, int) else 1,
+            random_state=model_options.get("random_state"),
+        )
+        return KMeansFit(centroids, labels, inertia, n_iter)
+    return _estimator_fit(KMeans(n_clusters=cluster_count, **model_options).fit(data))
+
+
+def _warm_start_kmeans(
+    data: np.ndarray,
+    previous: KMeansFit,
+    cluster_count: int,
+    n_init: int,
+    random_state: int | None,
+    engine: str = "sklearn",
+) -> KMeansFit:
+    """Fit K-means seeded from a solution with fewer clusters.
+
+    The highest-SSE cluster of ``previous`` is split until ``cluster_count``
+    centers exist. The seeded fit competes with ``n_init`` random restarts and
+    the model with the lower inertia is returned.
+    """
+    centers = previous.cluster_centers_
+    labels = previous.labels_
+    while len(centers) < cluster_count:
+        centers, labels = _split_highest_sse_cluster(
+            data, centers, labels, random_state
+        )
+    model = _estimator_fit(
+        KMeans(n_clusters=cluster_count, init=centers, n_init=1).fit(data)
+    )
+    if n_init > 0:
+        restart_options: dict[str, Any] = {"n_init": n_init}
+        if random_state is not None:
+            restart_options["random_state"] = random_state
+        restarts = _fit_kmeans(data, cluster_count, restart_options, engine)
+        if restarts.inertia_ < model.inertia_:
+            model = restarts
+    return model
+
+
+def _batched_squared_distances(
+    data: np.ndarray,
+    data_sq_norms: np.ndarray,
+    centers: np.ndarray,
+) -> np.ndarray:
+    """Squared distances of shape (restarts, n_clusters, n_samples)."""
+    restarts, n_clusters, n_features = centers.shape
+    # one matrix product for the centroids of all restarts
+    distances = (centers.reshape(-1, n_features) @ data.T).reshape(
+        restarts, n_clusters, -1
+    )
+    distances *= -2
+    distances += data_sq_norms
+    distances += np.einsum("rkd,rkd->rk", centers, centers)[:, :, None]
+    return np.maximum(distances, 0, out=distances)
+
+
+def _batched_kmeans_plusplus(
+    data: np.ndarray,
+    data_sq_norms: np.ndarray,
+    n_clusters: int,
+    n_init: int,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    """Greedy k-means++ seeding of ``n_init`` restarts at once."""
+    n_samples = data.shape[0]
+    n_local_trials = 2 + int(np.log(n_clusters))
+    restarts = np.arange(n_init)
+
+    first = rng.integers(n_samples, size=n_init)
+    centers = np.empty((n_init, n_clusters, data.shape[1]), dtype=data.dtype)
+    centers[:, 0] = data[first]
+    closest = _batched_squared_distances(
+        data, data_sq_norms, centers[:, :1]
+    )[:, 0]
+    for cluster in range(1, n_clusters):
+        potential = np.cumsum(closest, axis=1)
+        # sample candidates proportionally to the squared distance
+        thresholds = rng.random((n_init, n_local_trials)) * potential[:, -1:]
+        candidates = (potential[:, None, :] < thresholds[:, :, None]).sum(axis=2)
+        candidates = np.minimum(candidates, n_samples - 1)
+        candidate_distances = _batched_squared_distances(
+            data, data_sq_norms, data[candidates]
+        )
+        candidate_closest = np.minimum(closest[:, None, :], candidate_distances)
+        best = candidate_closest.sum(axis=2).argmin(axis=1)
+        centers[:, cluster] = data[candidates[restarts, best]]
+        closest = candidate_closest[restarts, best]
+    return centers
+
+
+def batched_kmeans(
+    data: npt.ArrayLike,
+    n_clusters: int,
+    *,
+    n_init: int = 10,
+    max_iter: int = 300,
+    tol: float = 1e-4,
+    random_state: int | None = None,
+) -> tuple[np.ndarray, np.ndarray, float, int]:
+    """Run all K-means restarts simultaneously as one array computation.
+
+    Centroids of every restart are stacked into a (restarts, clusters,
+    features) array and updated together with Lloyd's algorithm; distances to
+    the data share the precomputed squared norms of the observations.
+    Converged restarts are dropped from further iterations. Seeding uses
+    greedy k-means++ and convergence follows scikit-learn: a restart stops
+    when its labels no longer change or its centroid shift falls below
+    ``tol`` times the mean feature variance.
+
+    This engine targets small matrices with many restarts, where per-restart
+    overhead of sequential fits dominates the arithmetic.
+
+    Parameters
+    ----------
+    data : array-like of shape (n_samples, n_features)
+        Observations to cluster. ``float32`` data is processed in ``float32``;
+        other types are converted to ``float64``.
+    n_clusters : int
+        Number of clusters.
+    n_init : int, default=10
+        Number of simultaneous restarts.
+    max_iter : int, default=300
+        Maximum number of Lloyd iterations of every restart.
+    tol : float, default=1e-4
+        Relative tolerance of the centroid shift.
+    random_state : int or None, default=None
+        Seed of the k-means++ sampling.
+
+    Returns
+    -------
+    centroids : numpy.ndarray of shape (n_clusters, n_features)
+        Centroids of the restart with the lowest inertia.
+    labels : numpy.ndarray of shape (n_samples,)
+        Cluster assignments of that restart.
+    inertia : float
+        Sum of squared distances to the closest centroid.
+    n_iter : int
+        Lloyd iterations run by that restart.
+    """
+    data_array = np.asarray(data)
+    if data_array.dtype not in (np.float32, np.float64):
+        data_array = data_array.astype(np.float64)
+    n_samples = data_array.shape[0]
+    if n_samples < n_clusters:
+        raise ValueError(
+            f"n_samples={n_samples} should be >= n_clusters={n_clusters}."
+        )
+    rng = np.random.default_rng(random_state)
+    data_sq_norms = np.einsum("nd,nd->n", data_array, data_array)
+    tolerance = tol * np.mean(np.var(data_array, axis=0))
+
+    centers = _batched_kmeans_plusplus(
+        data_array, data_sq_norms, n_clusters, n_init, rng
+    )
+    labels = np.full((n_init, n_samples), -1)
+    n_iter = np.zeros(n_init, dtype=int)
+    active = np.arange(n_init)
+    cluster_ids = np.arange(n_clusters)
+    sample_ids = np.arange(n_samples)
+    for _ in range(max_iter):
+        distances = _batched_squared_distances(
+            data_array, data_sq_norms, centers[active]
+        )
+        new_labels = distances.argmin(axis=1)
+        membership = new_labels[:, None, :] == cluster_ids[:, None]
+        counts = membership.sum(axis=2)
+        sums = (
+            membership.reshape(-1, n_samples).astype(data_array.dtype)
+            @ data_array
+        ).reshape(new_labels.shape[0], n_clusters, -1)
+        new_centers = np.divide(
+            sums,
+            counts[:, :, None],
+            out=centers[active].copy(),
+            where=counts[:, :, None] > 0,
+        )
+        # relocate empty clusters to the worst-fitted observations
+        for row, cluster in zip(*np.nonzero(counts == 0)):
+            residuals = distances[row, new_labels[row], sample_ids]
+            farthest = int(np.argmax(residuals))
+            new_centers[row, cluster] = data_array[farthest]
+            distances[row, :, farthest] = 0
+
+        shift = ((new_centers - centers[active]) ** 2).sum(axis=(1, 2))
+        unchanged = (new_labels == labels[active]).all(axis=1)
+        centers[active] = new_centers
+        labels[active] = new_labels
+        n_iter[active] += 1
+        active = active[~(unchanged | (shift <= tolerance))]
+        if len(active) == 0:
+            break
+
+    distances = _batched_squared_distances(data_array, data_sq_norms, centers)
+    labels = distances.argmin(axis=1)
+    inertia = np.take_along_axis(distances, labels[:, None, :], axis=1).sum(
+        axis=(1, 2)
+    )
+    best = int(np.argmin(inertia))
+    return centers[best], labels[best], float(inertia[best]), int(n_iter[best])
+
+
+def _partial_squared_distances(
+    values: np.ndarray,
+    observed: np.ndarray,
+    centers: np.ndarray,
+    available: np.ndarray,
+) -> np.ndarray:
+    """Partial squared distances of shape (restarts, n_clusters, n_samples).
+
+    Sums run over the coordinates observed in the sample and available in
+    the centroid and are scaled by the number of features over the number
+    of such coordinates. ``values`` and ``centers`` hold zeros where
+    ``observed`` and ``available`` are zero.
+    """
+    restarts, n_clusters, n_features = centers.shape
+    flat_centers = centers.reshape(-1, n_features)
+    flat_available = available.reshape(-1, n_features)
+    # sum over shared coordinates of x**2 - 2 x c + c**2
+    sums = (values**2) @ flat_available.T
+    sums -= 2 * values @ flat_centers.T
+    sums += observed @ (flat_centers**2).T
+    shared = observed @ flat_available.T
+    with np.errstate(divide="ignore", invalid="ignore"):
+        distances = np.where(shared > 0, n_features * sums / shared, np.inf)
+    distances = np.maximum(distances, 0)
+    return distances.T.reshape(restarts, n_clusters, -1)
+
+
+def partial_distance_kmeans(
+    data: npt.ArrayLike,
+    n_clusters: int,
+    *,
+    n_init: int = 10,
+    max_iter: int = 300,
+    tol: float = 1e-4,
+    random_state: int | None = None,
+) -> tuple[np.ndarray, np.ndarray, float, int]:
+    """Run K-means on data with missing values without imputing them.
+
+    Distances between an observation and a centroid use only the
+    coordinates observed in both and are scaled by the number of features
+    over the number of shared coordinates, so observations with few values
+    are not drawn to any centroid. Centroid coordinates are means over the
+    members observing them. All restarts run at once as in
+    ``batched_kmeans``; distances for every sample, centroid, and restart
+    come from three masked matrix products, so the cost grows with the size
+    of the matrix, not with the number of complete submatrices.
+
+    Parameters
+    ----------
+    data : array-like of shape (n_samples, n_features)
+        Observations to cluster, missing values as ``NaN``. Every
+        observation needs at least one value.
+    n_clusters : int
+        Number of clusters.
+    n_init : int, default=10
+        Number of simultaneous restarts, seeded by k-means++ on partial
+        distances.
+    max_iter : int, default=300
+        Maximum number of Lloyd iterations of every restart.
+    tol : float, default=1e-4
+        Relative tolerance of the centroid shift, in units of the mean
+        observed feature variance.
+    random_state : int or None, default=None
+        Seed of the k-means++ sampling.
+
+    Returns
+    -------
+    centroids : numpy.ndarray of shape (n_clusters, n_features)
+        Centroids of the restart with the lowest inertia, ``NaN`` where no
+        member observes a feature.
+    labels : numpy.ndarray of shape (n_samples,)
+        Cluster assignments of that restart.
+    inertia : float
+        Sum of partial squared distances to the closest centroid.
+    n_iter : int
+        Lloyd iterations run by that restart.
+    """
+    data_array = np.asarray(data)
+    if data_array.dtype not in (np.float32, np.float64):
+        data_array = data_array.astype(np.float64)
+    n_samples, n_features = data_array.shape
+    if n_samples < n_clusters:
+        raise ValueError(
+            f"n_samples={n_samples} should be >= n_clusters={n_clusters}."
+        )
+    mask = ~np.isnan(data_array)
+    if not mask.any(axis=1).all():
+        raise ValueError("Every observation needs at least one value.")
+    observed = mask.astype(data_array.dtype)
+    values = np.where(mask, data_array, 0).astype(data_array.dtype)
+    with np.errstate(invalid="ignore"):
+        tolerance = tol * np.nanmean(np.nanvar(data_array, axis=0))
+    rng = np.random.default_rng(random_state)
+    restarts = np.arange(n_init)
+
+    # k-means++ seeding on partial distances
+    centers = np.zeros((n_init, n_clusters, n_features), dtype=data_array.dtype)
+    available = np.zeros_like(centers)
+    chosen = rng.integers(n_samples, size=n_init)
+    centers[:, 0], available[:, 0] = values[chosen], observed[chosen]
+    closest = _partial_squared_distances(
+        values, observed, centers[:, :1], available[:, :1]
+    )[:, 0]
+    for cluster in range(1, n_clusters):
+        weights = np.where(np.isfinite(closest), closest, 0)
+        potential = np.cumsum(weights, axis=1)
+        thresholds = rng.random(n_init) * potential[:, -1]
+        chosen = (potential < thresholds[:, None]).sum(axis=1)
+        chosen = np.minimum(chosen, n_samples - 1)
+        centers[:, cluster] = values[chosen]
+        available[:, cluster] = observed[chosen]
+        closest = np.minimum(
+            closest,
+            _partial_squared_distances(
+                values,
+                observed,
+                centers[:, cluster : cluster + 1],
+                available[:, cluster : cluster + 1],
+            )[:, 0],
+        )
+
+    labels = np.full((n_init, n_samples), -1)
+    n_iter = np.zeros(n_init, dtype=int)
+    active = restarts
+    cluster_ids = np.arange(n_clusters)
+    sample_ids = np.arange(n_samples)
+    for _ in range(max_iter):
+        distances = _partial_squared_distances(
+            values, observed, centers[active], available[active]
+        )
+        new_labels = distances.argmin(axis=1)
+        membership = (
+            (new_labels[:, None, :] == cluster_ids[:, None])
+            .reshape(-1, n_samples)
+            .astype(data_array.dtype)
+        )
+        # per-coordinate means over the members observing it
+        sums = (membership @ values).reshape(len(active), n_clusters, -1)
+        counts = (membership @ observed).reshape(len(active), n_clusters, -1)
+        new_available = (counts > 0).astype(data_array.dtype)
+        new_centers = np.divide(
+            sums, counts, out=np.zeros_like(sums), where=counts > 0
+        )
+        # relocate empty clusters to the worst-fitted observations
+        empty = membership.reshape(len(active), n_clusters, -1).sum(axis=2) == 0
+        for row, cluster in zip(*np.nonzero(empty)):
+            residuals = distances[row, new_labels[row], sample_ids]
+            residuals = np.where(np.isfinite(residuals), residuals, -1)
+            farthest = int(np.argmax(residuals))
+            new_centers[row, cluster] = values[farthest]
+            new_available[row, cluster] = observed[farthest]
+            distances[row, :, farthest] = 0
+
+        both = new_available * available[active]
+        shift = (both * (new_centers - centers[active]) ** 2).sum(axis=(1, 2))
+        unchanged = (new_labels == labels[active]).all(axis=1)
+        centers[active] = new_centers
+        available[active] = new_available
+        labels[active] = new_labels
+        n_iter[active] += 1
+        active = active[~(unchanged | (shift <= tolerance))]
+        if len(active) == 0:
+            break
+
+    distances = _partial_squared_distances(values, observed, centers, available)
+    labels = distances.argmin(axis=1)
+    inertia = np.take_along_axis(distances, labels[:, None, :], axis=1).sum(
+        axis=(1, 2)
+    )
+    best = int(np.argmin(inertia))
+    centroids = np.where(available[best] > 0, centers[best], np.nan)
+    return centroids, labels[best], float(inertia[best]), int(n_iter[best])
+
+
 def fit_kmeans_by_cluster_count(
     data: npt.ArrayLike,
     cluster_counts: Iterable[int],
@@ -24,7 +474,12 @@ def fit_kmeans_by_cluster_count(
     n_init: int | str | None = None,
     random_state: int | None = None,
     index: pd.Index,
-) -> tuple[dict[int, KMeans], pd.DataFrame]:
+    cache: ResultStore | None = None,
+    strategy: str = "independent",
+    warm_start_n_init: int = 5,
+    engine: str = "sklearn",
+    dtype: npt.DTypeLike | None = None,
+) -> tuple[dict[int, KMeansFit], pd.DataFrame]:
     """Fit K-means models for multiple cluster counts.
 
     Parameters
@@ -32,7 +487,7 @@ def fit_kmeans_by_cluster_count(
     data : array-like of shape (n_samples, n_features)
         Observations to cluster.
     cluster_counts : iterable of int
-        Numbers of clusters for which to fit independent models.
+        Numbers of clusters for which to fit models.
     n_init : int, str, or None, default=None
         Number of K-means initializations. When ``None``, the installed
         scikit-learn default is used.
@@ -42,38 +497,357 @@ def fit_kmeans_by_cluster_count(
     index : pandas.Index
         Observation index for the returned assignments. Its length must equal
         the number of rows in ``data``.
+    cache : caching.ResultStore or None, default=None
+        Store of earlier fits. Fits are looked up by a fingerprint of the data
+        bytes, the cluster count, ``n_init``, ``random_state``, the sweep
+        strategy, the engine, and the scikit-learn version, and new fits are added to it.
+        The cache is bypassed when ``random_state`` is ``None``, since such
+        fits are not reproducible.
+    strategy : {"independent", "warm_start"}, default="independent"
+        ``"independent"`` fits every cluster count with ``n_init`` random
+        restarts. ``"warm_start"`` fits the smallest count that way and seeds
+        every following count by splitting the highest-SSE cluster of the
+        previous solution, keeping the better of the seeded fit and
+        ``warm_start_n_init`` random restarts.
+    warm_start_n_init : int, default=5
+        Random restarts that compete with the seeded fit under
+        ``"warm_start"``.
+    engine : {"sklearn", "batched", "partial"}, default="sklearn"
+        ``"sklearn"`` runs restarts sequentially with
+        ``sklearn.cluster.KMeans``. ``"batched"`` runs all restarts at once
+        with ``batched_kmeans``, which is much faster for small matrices with
+        many restarts. ``"partial"`` runs ``partial_distance_kmeans`` and
+        accepts missing values, so a whole wave matrix can be clustered in
+        one fit; it does not support ``"warm_start"``.
+    dtype : data-type or None, default=None
+        Floating-point type in which to fit, such as ``numpy.float32``. When
+        ``None``, the type of ``data`` is kept.
 
     Returns
     -------
-    models : dict of int to sklearn.cluster.KMeans
-        Fitted model for each requested cluster count.
+    models : dict of int to KMeansFit
+        Fitted solution for each requested cluster count.
     labels : pandas.DataFrame
         Cluster assignments with cluster counts as columns.
     """
-    data_array = np.asarray(data)
+    data_array = np.asarray(data, dtype=dtype)
     if data_array.ndim == 0 or len(index) != data_array.shape[0]:
         raise ValueError(
             "The index length must equal the number of rows in data."
         )
+    if strategy not in ("independent", "warm_start"):
+        raise ValueError(f"Unknown strategy: {strategy!r}.")
+    if engine not in ("sklearn", "batched", "partial"):
+        raise ValueError(f"Unknown engine: {engine!r}.")
+    if engine == "partial" and strategy == "warm_start":
+        raise ValueError("The partial engine does not support warm starts.")
 
     model_options: dict[str, Any] = {}
     if n_init is not None:
         model_options["n_init"] = n_init
     if random_state is not None:
         model_options["random_state"] = random_state
+    use_cache = cache is not None and random_state is not None
+
+    requested_counts = [int(count) for count in cluster_counts]
+    fit_order = requested_counts
+    if strategy == "warm_start":
+        # every solution seeds the next larger cluster count
+        fit_order = sorted(set(requested_counts))
 
-    models: dict[int, KMeans] = {}
-    assignments: dict[int, np.ndarray] = {}
-    for requested_count in cluster_counts:
-        cluster_count = int(requested_count)
-        model = KMeans(n_clusters=cluster_count, **model_options)
+    models: dict[int, KMeansFit] = {}
+    previous: KMeansFit | None = None
+    for position, cluster_count in enumerate(fit_order):
+        key_params: dict[str, Any] = {
+            "n_clusters": cluster_count,
+            "n_init": n_init,
+            "random_state": random_state,
+            "engine": engine,
+            "sklearn": sklearn.__version__,
+        }
+        if strategy == "warm_start":
+            # a warm-started fit depends on the whole sweep leading to it
+            key_params.update(
+                strategy=strategy,
+                warm_start_n_init=warm_start_n_init,
+                sweep=fit_order[: position + 1],
+            )
+        key = array_fingerprint(data_array, **key_params) if use_cache else ""
+        result = cache.get(key) if use_cache else None
+
+        if result is not None:
+            model = _stored_fit(result)
+        elif previous is not None and strategy == "warm_start":
+            model = _warm_start_kmeans(
+                data_array,
+                previous,
+                cluster_count,
+                warm_start_n_init,
+                random_state,
+                engine,
+            )
+        else:
+            model = _fit_kmeans(data_array, cluster_count, model_options, engine)
+
+        if use_cache and result is None:
+            cache.put(
+                key,
+                labels=model.labels_,
+                centroids=model.cluster_centers_,
+                inertia=model.inertia_,
+                n_iter=model.n_iter_,
+            )
         models[cluster_count] = model
-        assignments[cluster_count] = model.fit_predict(data_array)
+        previous = model
+
+    models = {count: models[count] for count in requested_counts}
+    labels = pd.DataFrame(
+        {count: model.labels_ for count, model in models.items()},
+        index=index,
+    )
+    return models, labels
+
+
+def compare_sweep_inertia(
+    data: npt.ArrayLike,
+    cluster_counts: Iterable[int],
+    *,
+    n_init: int = 100,
+    warm_start_n_init: int = 5,
+    random_state: int | None = None,
+) -> pd.DataFrame:
+    """Compare a warm-started K sweep against independent full-restart fits.
+
+    Parameters
+    ----------
+    data : array-like of shape (n_samples, n_features)
+        Observations to cluster.
+    cluster_counts : iterable of int
+        Cluster counts of the sweep.
+    n_init : int, default=100
+        Random restarts of every independent fit and of the first
+        warm-started fit.
+    warm_start_n_init : int, default=5
+        Random restarts accompanying every seeded fit.
+    random_state : int or None, default=None
+        Random seed shared by both sweeps.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Inertia of both sweeps indexed by cluster count, and the relative
+        excess inertia of the warm-started sweep. Total wall-clock seconds of
+        each sweep are stored in ``attrs["seconds"]``.
+    """
+    data_array = np.asarray(data)
+    index = pd.RangeIndex(data_array.shape[0])
+    counts = sorted({int(count) for count in cluster_counts})
+
+    inertia: dict[str, dict[int, float]] = {}
+    seconds: dict[str, float] = {}
+    for strategy in ("independent", "warm_start"):
+        start = perf_counter()
+        models, _ = fit_kmeans_by_cluster_count(
+            data_array,
+            counts,
+            n_init=n_init,
+            random_state=random_state,
+            index=index,
+            strategy=strategy,
+            warm_start_n_init=warm_start_n_init,
+        )
+        seconds[strategy] = perf_counter() - start
+        inertia[strategy] = {k: model.inertia_ for k, model in models.items()}
+
+    comparison = pd.DataFrame(
+        {
+            "inertia_independent": inertia["independent"],
+            "inertia_warm_start": inertia["warm_start"],
+        }
+    ).rename_axis("k")
+    comparison["excess_inertia"] = (
+        comparison["inertia_warm_start"] / comparison["inertia_independent"] - 1
+    )
+    comparison.attrs["seconds"] = seconds
+    return comparison
+
+
+def fit_kmeans_by_submatrix(
+    submatrices: Sequence[pd.DataFrame],
+    n_clusters: int,
+    *,
+    n_init: int | str | None = None,
+    random_state: int | None = None,
+    cache: ResultStore | None = None,
+    engine: str = "sklearn",
+    dtype: npt.DTypeLike | None = None,
+) -> tuple[dict[int, KMeansFit], dict[int, np.ndarray]]:
+    """Fit one K-means model with a fixed cluster count to every submatrix.
+
+    Parameters
+    ----------
+    submatrices : sequence of pandas.DataFrame
+        Complete submatrices, such as those returned by
+        ``preparation.import_bicliques``.
+    n_clusters : int
+        Number of clusters for every model.
+    n_init, random_state, cache, engine, dtype
+        Passed to ``fit_kmeans_by_cluster_count``.
 
-    labels = pd.DataFrame(assignments, index=index)
+    Returns
+    -------
+    models : dict of int to KMeansFit
+        Fitted solution keyed by submatrix position.
+    labels : dict of int to numpy.ndarray
+        Cluster assignments keyed by submatrix position.
+    """
+    models: dict[int, KMeansFit] = {}
+    labels: dict[int, np.ndarray] = {}
+    for position, submatrix in enumerate(submatrices):
+        fitted, assignments = fit_kmeans_by_cluster_count(
+            submatrix,
+            [n_clusters],
+            n_init=n_init,
+            random_state=random_state,
+            index=submatrix.index,
+            cache=cache,
+            engine=engine,
+            dtype=dtype,
+        )
+        models[position] = fitted[n_clusters]
+        labels[position] = assignments[n_clusters].to_numpy()
     return models, labels
 
 
+def biclique_label_matrix(
+    submatrices: Sequence[pd.DataFrame],
+    labels: Mapping[int, npt.ArrayLike],
+) -> pd.DataFrame:
+    """Collect per-submatrix cluster assignments into one padded table.
+
+    Parameters
+    ----------
+    submatrices : sequence of pandas.DataFrame
+        Complete submatrices indexed by observation.
+    labels : mapping of int to array-like
+        Cluster assignments keyed by submatrix position, such as those returned
+        by ``fit_kmeans_by_submatrix``.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Observations, in order of first appearance, by submatrix position.
+        Observations outside a submatrix are labeled ``-1``.
+    """
+    observed_idx = pd.Index(
+        pd.unique(np.concatenate([df.index.to_numpy() for df in submatrices]))
+    )
+    clusters = pd.DataFrame(
+        -1, index=observed_idx, columns=range(len(submatrices))
+    )
+    for position, df in enumerate(submatrices):
+        clusters.loc[df.index, position] = np.asarray(labels[position])
+    return clusters
+
+
+def _count_dtype(max_count: int) -> np.dtype:
+    """Smallest of int16 and int32 that holds ``max_count``."""
+    if max_count <= np.iinfo(np.int16).max:
+        return np.dtype(np.int16)
+    return np.dtype(np.int32)
+
+
+def consensus_matrices(
+    clusters: pd.DataFrame,
+    n_clusters: int,
+    *,
+    dtype: npt.DTypeLike = np.float64,
+) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """Count co-observations and co-clusterings across submatrices.
+
+    Parameters
+    ----------
+    clusters : pandas.DataFrame
+        Padded label table as returned by ``biclique_label_matrix``, with
+        labels from ``0`` to ``n_clusters - 1`` and ``-1`` for observations
+        outside a submatrix.
+    n_clusters : int
+        Number of clusters in every submatrix clustering.
+    dtype : data-type, default=numpy.float64
+        Floating-point type of the consensus matrix. Counts are kept in
+        ``int16`` when the number of submatrices allows it, otherwise in
+        ``int32``.
+
+    Returns
+    -------
+    coobserved : pandas.DataFrame
+        Number of submatrices shared by every pair of observations; the
+        diagonal holds the number of submatrices containing the observation.
+    coclustered : pandas.DataFrame
+        Number of submatrices in which a pair shares a cluster.
+    consensus : pandas.DataFrame
+        ``coclustered / coobserved``, ``NaN`` for pairs never observed
+        together.
+    """
+    positions = clusters.to_numpy()
+    count_dtype = _count_dtype(positions.shape[1])
+    valid_positions = positions >= 0
+
+    observed = valid_positions.astype(count_dtype)
+    coobserved = observed @ observed.T
+
+    # one-hot membership of every (submatrix, cluster) pair
+    rows, columns = np.nonzero(valid_positions)
+    membership = csr_matrix(
+        (
+            np.ones(len(rows), dtype=count_dtype),
+            (rows, columns * n_clusters + positions[rows, columns]),
+        ),
+        shape=(positions.shape[0], positions.shape[1] * n_clusters),
+    )
+    coclustered = (membership @ membership.T).toarray().astype(count_dtype)
+
+    consensus = np.divide(
+        coclustered,
+        coobserved,
+        out=np.full(coclustered.shape, np.nan, dtype=dtype),
+        where=coobserved != 0,
+        dtype=dtype,
+    )
+    return tuple(
+        pd.DataFrame(matrix, index=clusters.index, columns=clusters.index)
+        for matrix in (coobserved, coclustered, consensus)
+    )
+
+
+def consensus_clustering(
+    consensus: pd.DataFrame | np.ndarray,
+    n_clusters: int,
+) -> np.ndarray:
+    """Cluster observations by average linkage on consensus dissimilarity.
+
+    Parameters
+    ----------
+    consensus : pandas.DataFrame or numpy.ndarray of shape (n_samples, n_samples)
+        Consensus matrix as returned by ``consensus_matrices``.
+    n_clusters : int
+        Number of final clusters.
+
+    Returns
+    -------
+    numpy.ndarray of shape (n_samples,)
+        Final cluster assignments.
+    """
+    dissimilarity = 1 - np.asarray(consensus)
+    np.fill_diagonal(dissimilarity, 0)
+    model = AgglomerativeClustering(
+        n_clusters=n_clusters,
+        metric="precomputed",
+        linkage="average",
+    )
+    return model.fit_predict(dissimilarity)
+
+
 def reassignment_purity(labels: pd.DataFrame) -> dict[str, float]:
     """Measure refinement purity between successive cluster assignments.
 
@@ -103,237 +877,463 @@ def reassignment_purity(labels: pd.DataFrame) -> dict[str, float]:
     return purity_scores
 
 
-'''Unused function retained for reference.
+def _label_set_scores(
+    values: np.ndarray,
+    distances: np.ndarray,
+    sq_norms: np.ndarray,
+    label_sets: np.ndarray,
+) -> np.ndarray:
+    """Silhouette, Davies-Bouldin, and Calinski-Harabasz of label sets.
+
+    ``label_sets`` has one row per labeling of the observations in
+    ``values`` (codes from ``0``, ``-1`` for unlabeled observations).
+    Mean distances to every cluster of every labeling come from one
+    product of ``distances`` with the stacked one-hot memberships; the
+    other scores use cluster sums and the squared norms.
+    """
+    n_sets, n_samples = label_sets.shape
+    n_clusters = int(label_sets.max()) + 1
+    scores = np.full((n_sets, 3), np.nan)
+    if n_clusters < 2:
+        return scores
+
+    onehot = (label_sets[:, :, None] == np.arange(n_clusters)).astype(np.float64)
+    counts = onehot.sum(axis=1)
+    # summed distance of every observation to every cluster of every set
+    to_clusters = np.einsum("ij,sjc->sic", distances, onehot, optimize=True)
+    sums = np.einsum("sic,id->scd", onehot, values, optimize=True)
+    for row in range(n_sets):
+        labeled = label_sets[row] >= 0
+        present = counts[row] > 0
+        k = int(present.sum())
+        n = int(labeled.sum())
+        if k < 2 or k >= n:
+            continue
+        labels = label_sets[row, labeled]
+        cluster_sizes = counts[row, present]
+        mean_to = to_clusters[row][labeled][:, present]
+        own = np.searchsorted(np.flatnonzero(present), labels)
+
+        own_size = cluster_sizes[own]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            intra = mean_to[np.arange(n), own] / (own_size - 1)
+            mean_to = mean_to / cluster_sizes
+        mean_to[np.arange(n), own] = np.inf
+        inter = mean_to.min(axis=1)
+        silhouette = np.where(
+            own_size > 1, (inter - intra) / np.maximum(intra, inter), 0.0
+        )
+
+        centroids = sums[row, present] / cluster_sizes[:, None]
+        centroid_sq = (centroids**2).sum(axis=1)
+        member_values = values[labeled]
+        member_sq = sq_norms[labeled]
+        overall = member_values.mean(axis=0)
+        between = cluster_sizes @ ((centroids - overall) ** 2).sum(axis=1)
+        within = member_sq.sum() - cluster_sizes @ centroid_sq
+
+        # distance of every member to its own centroid
+        to_centroid = np.sqrt(
+            np.maximum(
+                member_sq
+                - 2 * np.einsum("id,id->i", member_values, centroids[own])
+                + centroid_sq[own],
+                0,
+            )
+        )
+        spread = np.bincount(own, weights=to_centroid, minlength=k)
+        spread /= cluster_sizes
+        separation = np.sqrt(
+            np.maximum(
+                centroid_sq[:, None] + centroid_sq[None, :]
+                - 2 * centroids @ centroids.T,
+                0,
+            )
+        )
+        # a cluster is not compared with itself, and coinciding centroids
+        # do not count, as in scikit-learn
+        np.fill_diagonal(separation, np.inf)
+        separation[separation == 0] = np.inf
+        ratios = (spread[:, None] + spread[None, :]) / separation
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            scores[row] = (
+                silhouette.mean(),
+                ratios.max(axis=1).mean(),
+                (between / (k - 1)) / (within / (n - k)),
+            )
+    return scores
+
+
+def score_labels_on_bicliques(
+    submatrices: Sequence[pd.DataFrame],
+    labels: pd.DataFrame | pd.Series,
+    *,
+    per_biclique: pd.DataFrame | None = None,
+) -> pd.DataFrame:
+    """Score cluster assignments inside the feature space of every biclique.
+
+    For every submatrix the Gram matrix and squared norms are computed once
+    and shared by all labelings evaluated on it; scores equal those of
+    ``sklearn.metrics.silhouette_score``, ``davies_bouldin_score``, and
+    ``calinski_harabasz_score`` on the submatrix.
+
+    Parameters
+    ----------
+    submatrices : sequence of pandas.DataFrame
+        Complete submatrices indexed by observation, standardized as when
+        they were clustered.
+    labels : pandas.DataFrame or pandas.Series
+        Labelings scored on every submatrix, one per column, such as the
+        ``final`` column of a ``biclique_label_matrix`` table. Negative
+        labels and observations without a label are left out.
+    per_biclique : pandas.DataFrame or None, default=None
+        Padded table as returned by ``biclique_label_matrix``; column
+        ``position`` is scored only on submatrix ``position``, under the
+        name ``"own"``.
+
+    Returns
+    -------
+    pandas.DataFrame
+        ``n_obs``, ``n_clusters``, ``silhouette``, ``davies_bouldin``, and
+        ``calinski_harabasz``, indexed by submatrix position and labeling.
+        Scores are ``NaN`` where fewer than two clusters are present.
+    """
+    if isinstance(labels, pd.Series):
+        labels = labels.to_frame()
+    rows = []
+    for position, submatrix in enumerate(submatrices):
+        values = submatrix.to_numpy(np.float64)
+        sq_norms = np.einsum("id,id->i", values, values)
+        # one Gram matrix per submatrix, shared by every labeling
+        gram = values @ values.T
+        distances = np.sqrt(
+            np.maximum(sq_norms[:, None] + sq_norms[None, :] - 2 * gram, 0)
+        )
+        np.fill_diagonal(distances, 0)
 
-def find_label_alignement(
+        names = list(labels.columns)
+        table = labels.reindex(submatrix.index).fillna(-1).astype(int)
+        if per_biclique is not None:
+            own = per_biclique[position].reindex(submatrix.index)
+            table["own"] = own.fillna(-1).astype(int)
+            names.append("own")
+        codes = np.full((len(names), len(submatrix)), -1)
+        for row, name in enumerate(names):
+            assigned = table[name].to_numpy()
+            valid = assigned >= 0
+            codes[row, valid] = pd.factorize(assigned[valid], sort=True)[0]
+
+        scores = _label_set_scores(values, distances, sq_norms, codes)
+        for row, name in enumerate(names):
+            valid = codes[row] >= 0
+            rows.append(
+                {
+                    "biclique": position,
+                    "labels": name,
+                    "n_obs": int(valid.sum()),
+                    "n_clusters": len(np.unique(codes[row, valid])),
+                    "silhouette": scores[row, 0],
+                    "davies_bouldin": scores[row, 1],
+                    "calinski_harabasz": scores[row, 2],
+                }
+            )
+    return pd.DataFrame(rows).set_index(["biclique", "labels"])
+
+
+def label_confusion_matrices(
     reference: npt.ArrayLike,
     labels: npt.ArrayLike,
-) -> LabelMapping:
-    """Find the label permutation that best matches a reference clustering.
+    n_clusters: int | None = None,
+) -> np.ndarray:
+    """Build confusion matrices of many clusterings against one reference.
 
-    A confusion matrix measures overlap between the two clusterings. The
-    Hungarian assignment algorithm then finds the permutation that maximizes
-    total overlap.
+    All matrices are counted at once with a single ``numpy.bincount`` over
+    combined (run, reference label, label) codes. Negative labels mark
+    observations without an assignment and are ignored.
 
     Parameters
     ----------
     reference : array-like of shape (n_samples,)
         Reference cluster labels.
+    labels : array-like of shape (n_runs, n_samples) or (n_samples,)
+        Cluster labels to compare with ``reference``.
+    n_clusters : int or None, default=None
+        Size of every matrix. When ``None``, the largest label plus one.
 
-    labels : array-like of shape (n_samples,)
-        Cluster labels to align with ``reference``.
+    Returns
+    -------
+    numpy.ndarray of shape (n_runs, n_clusters, n_clusters)
+        ``C[r, i, j]`` counts observations labeled ``i`` in the reference and
+        ``j`` in run ``r``.
+    """
+    reference_array = np.asarray(reference)
+    label_array = np.atleast_2d(np.asarray(labels))
+    if n_clusters is None:
+        n_clusters = int(max(reference_array.max(), label_array.max())) + 1
+    n_runs = label_array.shape[0]
+
+    valid = (reference_array >= 0) & (label_array >= 0)
+    runs = np.broadcast_to(np.arange(n_runs)[:, None], label_array.shape)
+    codes = (
+        runs[valid] * n_clusters
+        + np.broadcast_to(reference_array, label_array.shape)[valid]
+    ) * n_clusters + label_array[valid]
+    counts = np.bincount(codes, minlength=n_runs * n_clusters * n_clusters)
+    return counts.reshape(n_runs, n_clusters, n_clusters)
+
+
+def _label_mappings(confusion: np.ndarray) -> np.ndarray:
+    """Hungarian label permutation for every confusion matrix."""
+    mappings = np.empty(confusion.shape[:2], dtype=int)
+    for run, matrix in enumerate(confusion):
+        # linear_sum_assignment maximizes the trace of the permuted matrix
+        desired, current = linear_sum_assignment(matrix, maximize=True)
+        mappings[run, current] = desired
+    return mappings
+
+
+def relabel(labels: npt.ArrayLike, mapping: npt.ArrayLike) -> np.ndarray:
+    """Apply a label permutation, leaving negative labels unchanged.
+
+    Parameters
+    ----------
+    labels : array-like of int
+        Cluster labels; negative values mark missing assignments.
+    mapping : array-like of int
+        ``mapping[j]`` is the new label of label ``j``.
 
     Returns
     -------
-    tuple of numpy.ndarray
-        Row and column indices returned by the Hungarian assignment. The first
-        array identifies desired labels and the second identifies labels to
-        replace.
-
-    Raises
-    ------
-    ValueError
-        If the two inputs contain different numbers of distinct clusters.
+    numpy.ndarray
+        Relabeled copy of ``labels``.
     """
-    # the number of clusters
-    no_clusters = len(set(labels))
-    
-    if no_clusters != len(set(reference)):
-        raise ValueError("Relabeling impossible: number of clusters in 'labels' differs from the number of labels in 'reference'.")
-    
-    # build a confusion matrix (C[i,j]: element labeled j is labeled i in the reference
-    cm = confusion_matrix(reference, labels)
-    # scipy.optimize.linear_sum_assignment solves the assignement problem
-    # here is finds such a permutation of the labels, which maximizes the trace (data points correctly assigned)
-    return linear_sum_assignment(cm, maximize = True)
-'''
-
-'''Unused function retained for reference.
-
-def relabel_clustering(
+    label_array = np.asarray(labels)
+    mapping_array = np.asarray(mapping)
+    return np.where(
+        label_array >= 0,
+        mapping_array[np.maximum(label_array, 0)],
+        label_array,
+    )
+
+
+def find_label_alignment(
     reference: npt.ArrayLike,
-    labels: np.ndarray,
-    mapping: LabelMapping,
+    labels: npt.ArrayLike,
+    n_clusters: int | None = None,
 ) -> np.ndarray:
-    """Apply a label mapping to a clustering assignment.
+    """Find the label permutation that best matches a reference clustering.
+
+    Observations unassigned in either clustering, marked by negative labels,
+    are ignored; every label still receives a distinct target.
 
     Parameters
     ----------
     reference : array-like of shape (n_samples,)
-        Reference labels associated with the mapping. Retained for interface
-        compatibility; the implementation does not inspect this argument.
-
-    labels : numpy.ndarray of shape (n_samples,)
-        Cluster labels to transform.
-
-    mapping : tuple of numpy.ndarray
-        Desired labels followed by the current labels they replace.
+        Reference cluster labels.
+    labels : array-like of shape (n_samples,)
+        Cluster labels to align with ``reference``.
+    n_clusters : int or None, default=None
+        Number of labels. When ``None``, the largest label plus one.
 
     Returns
     -------
-    numpy.ndarray
-        Labels aligned according to ``mapping``. If the mapping is already the
-        identity, the original ``labels`` array is returned.
+    numpy.ndarray of shape (n_clusters,)
+        ``mapping[j]`` is the reference label matching label ``j``; pass it to
+        ``relabel``.
     """
-    labels_match = (mapping[0] == mapping[1])
-    if np.all(labels_match):
-        #print("Labels match.")
-        return labels
-    relabeled = np.array(labels, copy = True)
-    for i in range(len(mapping[0])):
-        if labels_match[i] == False:
-            #print("Changing", mapping[1][i], "to", mapping[0][i])
-            mask = (labels == mapping[1][i])
-            relabeled[mask] = mapping[0][i]
-    return relabeled
-'''
-
-'''Unused function retained for reference.
-
-def align_labels(clusters: Sequence[np.ndarray]) -> np.ndarray:
-    """Align labels from repeated clustering runs to the first run.
+    confusion = label_confusion_matrices(reference, labels, n_clusters)
+    return _label_mappings(confusion)[0]
+
+
+def align_labels(
+    clusters: Sequence[npt.ArrayLike] | np.ndarray,
+    reference: npt.ArrayLike | None = None,
+) -> np.ndarray:
+    """Relabel clusterings to best match a reference clustering.
+
+    For every clustering, the Hungarian assignment on its confusion matrix
+    against the reference finds the label permutation that maximizes the
+    number of consistently labeled observations. The confusion matrices of
+    all clusterings are built in one pass. Negative labels, marking
+    observations without an assignment, are left unchanged.
 
     Parameters
     ----------
-    clusters : sequence of numpy.ndarray
-        Nonempty sequence of equal-length label arrays. The first array is used
-        as the reference labeling.
+    clusters : sequence of array-like or numpy.ndarray of shape (n_runs, n_samples)
+        Nonempty collection of equal-length label arrays.
+    reference : array-like of shape (n_samples,) or None, default=None
+        Labels to align to. When ``None``, the first clustering is used.
 
     Returns
     -------
-    numpy.ndarray of shape (n_iterations, n_samples)
-        Label assignments after aligning every run to the first run.
+    numpy.ndarray of shape (n_runs, n_samples)
+        Label assignments after alignment.
     """
-    reference_labels = clusters[0]
-    aligned_clusters = [clusters[0]]
-    for n in range(1, len(clusters)):
-        mapping = find_label_alignement(reference_labels, clusters[n])
-        aligned_clusters.append(relabel_clustering(reference_labels, clusters[n], mapping))
-    # each effect of the clustering is in a row
-    aligned_clusters = np.array(aligned_clusters)
-    return aligned_clusters
-'''
-
-'''Unused function retained for reference.
-
-def compute_kmeans_metrics(
-    X_PCA: np.ndarray,
-    param_grid: dict[str, Iterable[Any]],
+    label_array = np.atleast_2d(np.asarray(clusters))
+    reference_array = (
+        label_array[0] if reference is None else np.asarray(reference)
+    )
+    n_clusters = int(max(reference_array.max(), label_array.max())) + 1
+    mappings = _label_mappings(
+        label_confusion_matrices(reference_array, label_array, n_clusters)
+    )
+    return np.stack(
+        [relabel(run, mapping) for run, mapping in zip(label_array, mappings)]
+    )
+
+
+# data shared by the workers of evaluate_kmeans_grid
+_grid_data: dict[str, np.ndarray] = {}
+
+
+def _init_grid_worker(data_pca: np.ndarray, distances: np.ndarray) -> None:
+    _grid_data["data_pca"] = data_pca
+    _grid_data["distances"] = distances
+
+
+def _evaluate_grid_point(
+    param_settings: dict[str, Any],
+    iter_no: int,
+) -> pd.DataFrame:
+    """Fit and score one parameter combination ``iter_no`` times."""
+    data_pca = _grid_data["data_pca"]
+    distances = _grid_data["distances"]
+
+    kmeans_settings = dict(param_settings)
+    # the number of leading principal components used in KMeans
+    pcs = kmeans_settings.pop("pca_components", 3)
+    kmeans_settings.setdefault("n_init", 30)
+
+    wgss = []
+    silh_score = []
+    neg_silh_score = []
+    iter_labels = []
+    for _ in range(iter_no):
+        kmeans = KMeans(**kmeans_settings).fit(data_pca[:, :pcs])
+        # silhouettes are measured in the full PCA space
+        silhouettes = silhouette_samples(
+            distances, kmeans.labels_, metric="precomputed"
+        )
+        wgss.append(kmeans.inertia_)
+        silh_score.append(silhouettes.mean())
+        neg_silh_score.append(np.mean(silhouettes < 0))
+        iter_labels.append(kmeans.labels_)
+
+    # each row represents a clustering iteration
+    aligned_labels = align_labels(iter_labels)
+    return pd.DataFrame(
+        {
+            **{name: [value] * iter_no for name, value in param_settings.items()},
+            "iteration": range(iter_no),
+            "wgss": wgss,
+            "silhouette": silh_score,
+            "negative_silhouette_share": neg_silh_score,
+            "labels": list(aligned_labels),
+        }
+    )
+
+
+def evaluate_kmeans_grid(
+    data: npt.ArrayLike,
+    param_grid: Mapping[str, Iterable[Any]],
+    *,
     iter_no: int = 1,
-) -> tuple[
-    dict[MetricKey, float],
-    dict[MetricKey, float],
-    dict[MetricKey, float],
-    dict[MetricKey, np.ndarray],
-]:
+    max_workers: int | None = None,
+    output_dir: str | PathLike[str] | None = None,
+) -> pd.DataFrame:
     """Evaluate K-means parameter combinations over repeated fits.
 
-    K-means is fitted on the selected leading PCA components. Silhouette
-    metrics are calculated in the full supplied PCA space.
+    PCA is computed once for ``data`` and K-means is fitted on the selected
+    leading components. Silhouette metrics are calculated in the full PCA
+    space from one shared distance matrix. Parameter combinations are
+    evaluated in parallel on a process pool.
 
     Parameters
     ----------
-    X_PCA : numpy.ndarray of shape (n_samples, n_components)
-        PCA-transformed feature matrix.
+    data : array-like of shape (n_samples, n_features)
+        Feature matrix.
 
-    param_grid : dict of str to iterable
+    param_grid : mapping of str to iterable
         Values to evaluate for each K-means parameter. The optional
         ``pca_components`` entry controls how many leading components are used
-        for fitting and is not passed to ``KMeans``.
+        for fitting (3 when omitted) and is not passed to ``KMeans``.
+        ``n_init`` defaults to 30.
 
     iter_no : int, default=1
-        Number of fits to average for each parameter combination.
+        Number of fits of every parameter combination.
+
+    max_workers : int or None, default=None
+        Size of the process pool. ``1`` evaluates in the calling process.
+
+    output_dir : str, path-like, or None, default=None
+        Directory receiving one parquet file per finished combination, named
+        after a fingerprint of the PCA data, the combination, and
+        ``iter_no``. Combinations with an existing file are loaded instead of
+        recomputed, so an interrupted grid resumes where it stopped.
 
     Returns
     -------
-    mean_wgss : dict
-        Mean within-cluster sum of squares by parameter combination.
+    pandas.DataFrame
+        One row per combination and iteration with the parameter values,
+        ``wgss``, ``silhouette``, ``negative_silhouette_share``, and the
+        aligned ``labels`` of the fit.
+    """
+    data_pca = PCA().fit_transform(np.asarray(data))
+    distances = pairwise_distances(data_pca)
 
-    mean_silh_score : dict
-        Mean silhouette score by parameter combination.
+    param_names = list(param_grid.keys())
+    combinations = [
+        dict(zip(param_names, values))
+        for values in product(*(param_grid[name] for name in param_names))
+    ]
 
-    mean_neg_silh_score : dict
-        Mean fraction of observations with negative silhouette values.
+    output_path = None if output_dir is None else Path(output_dir)
+    if output_path is not None:
+        output_path.mkdir(parents=True, exist_ok=True)
 
-    labels : dict
-        Aligned label arrays for every fit and parameter combination.
-    """
-    # mean WGSS for each parameter combination
-    mean_wgss = {}
-    # mean silhouette score for each parameter combination
-    mean_silh_score = {}
-    # mean fraction of data points with a negative silhouette score
-    mean_neg_silh_score = {}
-    # clustering labels for each parameter combination
-    labels = {}
-    
-    # exstract the names of the parameters
-    param_names = list(param_grid.keys())
+    def part_file(param_settings: dict[str, Any]) -> Path | None:
+        if output_path is None:
+            return None
+        key = array_fingerprint(data_pca, iter_no=iter_no, **param_settings)
+        return output_path / f"{key}.parquet"
+
+    results: dict[int, pd.DataFrame] = {}
+    pending = []
+    for position, param_settings in enumerate(combinations):
+        part = part_file(param_settings)
+        if part is not None and part.exists():
+            results[position] = pd.read_parquet(part)
+        else:
+            pending.append(position)
+
+    def store(position: int, result: pd.DataFrame) -> None:
+        part = part_file(combinations[position])
+        if part is not None:
+            result.to_parquet(part)
+        results[position] = result
+
+    if max_workers == 1:
+        _init_grid_worker(data_pca, distances)
+        for position in pending:
+            store(position, _evaluate_grid_point(combinations[position], iter_no))
+    elif pending:
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_grid_worker,
+            initargs=(data_pca, distances),
+        ) as pool:
+            futures = {
+                pool.submit(
+                    _evaluate_grid_point, combinations[position], iter_no
+                ): position
+                for position in pending
+            }
+            for future in as_completed(futures):
+                store(futures[future], future.result())
 
-    default_param_settings = {}
-    if 'n_init' not in param_names:
-        default_param_settings['n_init'] = 30
-    #the default number of principal components used in KMeans
-    no_PCS = 3
-
-    # extract the no of data points
-    no_data_points = X_PCA.shape[0]
-
-    # for all combinations of parameters (cartesian product of parameters' values)
-    for values in product(*(param_grid[name] for name in param_names)):
-        # produce a tuple of Kmeans parameters
-        param_settings = dict(zip(param_names, values))
-        # extract the number of principal components from parameters
-        pcs = param_settings.pop('pca_components', no_PCS)
-
-        iter_wgss = []
-        iter_silh_score = []
-        iter_neg_silh_score = []
-
-        iter_labels = []
-
-        for _ in range(iter_no):
-            kmeans = KMeans(**param_settings, **default_param_settings).fit(X_PCA[:, 0:pcs])
-            iter_wgss.append(kmeans.inertia_)
-            iter_silh_score.append(silhouette_score(X_PCA, kmeans.labels_))
-            iter_neg_silh_score.append(np.sum(silhouette_samples(X_PCA, kmeans.labels_) < 0)/no_data_points)
-            iter_labels.append(kmeans.labels_)
-        
-        # reintroduce the number of principal components
-        # if provided in param_grid
-        if 'pca_components' in param_names:
-            param_settings['pca_components'] = pcs
-
-        param_key = tuple(param_settings.values())
-        mean_wgss[param_key] = np.mean(iter_wgss)
-        mean_silh_score[param_key] = np.mean(iter_silh_score)
-        mean_neg_silh_score[param_key] = np.mean(iter_neg_silh_score)
-
-        # handle labels
-        # each row represents a clustering iteration
-        aligned_labels = align_labels(iter_labels)
-
-        # return aligned labels matrix for now
-        labels[param_key] = aligned_labels
-        
-#        if np.all(aligned_labels[0, :] == aligned_labels):
-#            # if the labels are the same return them
-#            # print("All labeled the same.")
-#            labels[param_key] = aligned_labels[0,:]
-#        else:
-#            # if the labels differ return the most frequent ones
-#            # TODO substitute with consesus clustering
-#            # or add a possibility of consesus lustering through a parameter
-#            # print(param key)
-#            # print("There are differences in labeling.")
-#            labels[param_key], counts = mode(aligned_labels, axis=0)
-#        
-#        # TODO add a frequency matrix
-#        # frequency of labeling matrix
-#        # label_freq_arr = np.zeros((aligned_clusters.shape[1], K))
-#        # for l in range(K):
-#        #    label_freq_arr[:, l] = np.sum(aligned_clusters == l, axis = 0).T
-#        # label_freq[K] = label_freq_arr/N
-
-    return (mean_wgss, mean_silh_score, mean_neg_silh_score, labels)
-'''
+    if not results:
+        return pd.DataFrame()
+    return pd.concat(
+        [results[position] for position in sorted(results)], ignore_index=True
+    )
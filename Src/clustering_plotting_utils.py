@@ -8,6 +8,7 @@ import matplotlib.cm as cm
 import matplotlib as mpl
 import matplotlib.colors as mcolors
 from matplotlib.axes import Axes
+from matplotlib.figure import Figure
 from matplotlib.gridspec import GridSpec
 
 import pandas as pd
@@ -101,11 +102,11 @@ def plot_silhouette_scores_distribution(
     return ax
 
 
-def plot_clustering_metrics(
+def clustering_metrics_figure(
     results: Mapping[str, Mapping[str, Any]],
     ks: Sequence[int],
-) -> None:
-    """Plot K-means evaluation metrics for one or more clustering results.
+) -> Figure:
+    """Draw K-means evaluation metrics for one or more clustering results.
 
     Each result must provide ``data``, labels keyed by cluster count, fitted
     models keyed by cluster count, and a Matplotlib-compatible ``color``.
@@ -119,6 +120,11 @@ def plot_clustering_metrics(
         and ``color`` entries.
     ks : sequence of int
         Cluster counts to plot, in display order.
+
+    Returns
+    -------
+    matplotlib.figure.Figure
+        The drawn figure.
     """
     fig, axs = plt.subplots(
         nrows=1,
@@ -176,17 +182,30 @@ def plot_clustering_metrics(
     axs[2].yaxis.set_major_formatter(
         mpl.ticker.PercentFormatter(xmax=1, symbol=None)
     )
+    return fig
+
+
+def plot_clustering_metrics(
+    results: Mapping[str, Mapping[str, Any]],
+    ks: Sequence[int],
+) -> None:
+    """Plot K-means evaluation metrics for one or more clustering results.
+
+    See ``clustering_metrics_figure`` for the parameters.
+    """
+    clustering_metrics_figure(results, ks)
     plt.show()
 
 
-def plot_silhouette_and_cluster_map(
+def silhouette_and_cluster_map_figure(
     data: npt.ArrayLike,
     labels_by_k: pd.DataFrame,
     k: int,
     colors: Sequence[Any],
     title: str,
-) -> None:
-    """Plot silhouette diagnostics and a country cluster map for one K.
+    crosswalk: pd.DataFrame | None = None,
+) -> Figure:
+    """Draw silhouette diagnostics and a country cluster map for one K.
 
     The left column shows negatively silhouetted observation identifiers,
     grouped by assigned cluster, and the silhouette distribution. The right
@@ -205,6 +224,13 @@ def plot_silhouette_and_cluster_map(
         Matplotlib-compatible colors, one for each cluster.
     title : str
         Cluster-map title.
+    crosswalk : pandas.DataFrame or None, default=None
+        Country crosswalk, see ``plotting_utils.plot_cluster_map``.
+
+    Returns
+    -------
+    matplotlib.figure.Figure
+        The drawn figure.
     """
     fig = plt.figure(figsize=(22, 10), layout="tight")
     gs = GridSpec(3, 2, figure=fig, width_ratios=[1, 4.75])
@@ -249,16 +275,35 @@ def plot_silhouette_and_cluster_map(
         {label: str(label) for label in clusters},
         palette,
         title=title,
+        crosswalk=crosswalk,
     )
     map_ax.set_anchor("W")
+    return fig
+
+
+def plot_silhouette_and_cluster_map(
+    data: npt.ArrayLike,
+    labels_by_k: pd.DataFrame,
+    k: int,
+    colors: Sequence[Any],
+    title: str,
+    crosswalk: pd.DataFrame | None = None,
+) -> None:
+    """Plot silhouette diagnostics and a country cluster map for one K.
+
+    See ``silhouette_and_cluster_map_figure`` for the parameters.
+    """
+    silhouette_and_cluster_map_figure(
+        data, labels_by_k, k, colors, title, crosswalk=crosswalk
+    )
     plt.show()
 
 
-def plot_refinement(
+def refinement_figure(
     purity_scores: Mapping[str, float],
     title: str = "",
-) -> None:
-    """Plot reassignment purity between successive cluster counts.
+) -> Figure:
+    """Draw reassignment purity between successive cluster counts.
 
     Parameters
     ----------
@@ -266,6 +311,11 @@ def plot_refinement(
         Transition labels mapped to reassignment-purity values.
     title : str, default=""
         Optional title. A descriptive default is used when omitted.
+
+    Returns
+    -------
+    matplotlib.figure.Figure
+        The drawn figure.
     """
     fig, ax = plt.subplots(figsize=(10, 5))
     ax.plot(
@@ -301,6 +351,18 @@ def plot_refinement(
     ax.grid(True, alpha=0.2)
     for spine in ("top", "right"):
         ax.spines[spine].set_visible(False)
+    return fig
+
+
+def plot_refinement(
+    purity_scores: Mapping[str, float],
+    title: str = "",
+) -> None:
+    """Plot reassignment purity between successive cluster counts.
+
+    See ``refinement_figure`` for the parameters.
+    """
+    refinement_figure(purity_scores, title)
     plt.show()
 
 
@@ -429,90 +491,4 @@ def plot_metric_clusters(
         ax[i].set_xlabel(xlabel)
         ax[i].set_ylabel(ylabel)
         ax[i].grid(True)
-
-def align_country_codes(
-    df1: pd.DataFrame,
-    df2: pd.DataFrame,
-    df1_code_col: str,
-    df1_name_col: str,
-    df2_code_col: str,
-    df2_name_col: str,
-    updated_code_col: str = "Updated Country Code",
-    fuzzy_threshold: int = 60,
-) -> list[tuple[Any, Any, Any, Any]]:
-    """Update country codes in ``df1`` using direct or fuzzy matches in ``df2``.
-
-    ``df1`` is mutated by adding ``updated_code_col``. Direct code matches are
-    retained; unmatched codes fall back to fuzzy country-name matching.
-
-    Parameters
-    ----------
-    df1 : pandas.DataFrame
-        DataFrame whose country codes are updated. This object is modified in
-        place by adding ``updated_code_col``.
-
-    df2 : pandas.DataFrame
-        Reference DataFrame containing the desired country codes.
-
-    df1_code_col : str
-        Name of the country-code column in ``df1``.
-
-    df1_name_col : str
-        Name of the country-name column in ``df1``.
-
-    df2_code_col : str
-        Name of the country-code column in ``df2``.
-
-    df2_name_col : str
-        Name of the country-name column in ``df2``.
-
-    updated_code_col : str, default="Updated Country Code"
-        Name of the new column in ``df1`` that receives aligned codes.
-
-    fuzzy_threshold : int, default=60
-        Minimum accepted fuzzy-match score from 0 to 100.
-
-    Returns
-    -------
-    list of tuple
-        Source name, source code, matched name, and matched code for every row
-        whose code changed.
-    """
-
-    # Initialize the updated code column
-    df1[updated_code_col] = df1[df1_code_col].copy()
-
-    # Keep track of changes
-    changed_codes = []
-
-    # Iterate through rows of df1 by index
-    for idx in df1.index:
-        df1_code = df1.at[idx, df1_code_col]
-        df1_name = df1.at[idx, df1_name_col]
-
-        code_data_exists = df2[df2_code_col] == df1_code
-
-        if code_data_exists.sum() == 0:
-            # Fuzzy match fallback on country name
-            best_match = process.extractOne(
-                query = df1_name,
-                choices = df2[df2_name_col],
-                scorer = fuzz.ratio,
-                score_cutoff = fuzzy_threshold,
-            )
-            if best_match:
-                # best_match => (matched_name, score, matched_index)
-                matched_index = best_match[2]
-                matched_name = df2.iloc[matched_index][df2_name_col]
-                matched_code = df2.iloc[matched_index][df2_code_col]
-
-                # Record the change
-                changed_codes.append(
-                    (df1_name, df1_code, matched_name, matched_code)
-                )
-
-                # Update df1 with the matched code
-                df1.at[idx, updated_code_col] = matched_code
-
-    return changed_codes
 '''
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+
+def _correlation_block(
+    values_a: np.ndarray,
+    mask_a: np.ndarray,
+    values_b: np.ndarray,
+    mask_b: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Pairwise-complete correlations between two column blocks.
+
+    ``values_*`` hold centered data with missing entries set to zero and
+    ``mask_*`` the matching availability as floats.
+    """
+    counts = mask_a.T @ mask_b
+    # sums over the rows observed in both columns
+    sum_a = values_a.T @ mask_b
+    sum_b = mask_a.T @ values_b
+    sum_aa = (values_a**2).T @ mask_b
+    sum_bb = mask_a.T @ values_b**2
+    sum_ab = values_a.T @ values_b
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        covariance = sum_ab - sum_a * sum_b / counts
+        variance_a = sum_aa - sum_a**2 / counts
+        variance_b = sum_bb - sum_b**2 / counts
+        correlation = covariance / np.sqrt(variance_a * variance_b)
+    return np.clip(correlation, -1, 1), counts
+
+
+def pairwise_complete_correlation(
+    data: pd.DataFrame,
+    *,
+    min_periods: int = 3,
+    block_size: int | None = None,
+) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """Compute Pearson correlations of all column pairs on their shared rows.
+
+    Every pair uses the rows where both columns are observed, as
+    ``scipy.stats.pearsonr`` on pairwise-complete observations would, but all
+    pairs are computed together from a few masked matrix products.
+
+    Parameters
+    ----------
+    data : pandas.DataFrame
+        Observations by row and indicators by column, with missing values as
+        ``NaN``, such as a ``base_values_wave_N`` matrix.
+    min_periods : int, default=3
+        Minimum number of shared observations; pairs with fewer get ``NaN``.
+    block_size : int or None, default=None
+        When set, columns are processed in blocks of this size so that
+        intermediate products stay at ``block_size**2`` elements, for
+        matrices with thousands of columns.
+
+    Returns
+    -------
+    correlation : pandas.DataFrame
+        Pearson correlation of every column pair.
+    counts : pandas.DataFrame
+        Number of observations shared by every column pair.
+    pvalues : pandas.DataFrame
+        Two-sided p-values under the null of no correlation.
+    """
+    values = data.to_numpy(dtype=np.float64)
+    mask = ~np.isnan(values)
+    availability = mask.astype(np.float64)
+    # centering leaves correlations unchanged and limits cancellation;
+    # empty columns get a zero mean instead of a warning
+    observed = availability.sum(axis=0)
+    means = np.divide(
+        np.nansum(values, axis=0),
+        observed,
+        out=np.zeros(values.shape[1]),
+        where=observed > 0,
+    )
+    values = np.where(mask, values - means, 0.0)
+
+    n_columns = values.shape[1]
+    step = n_columns if block_size is None else block_size
+    correlation = np.empty((n_columns, n_columns))
+    counts = np.empty((n_columns, n_columns))
+    for start_a in range(0, n_columns, step):
+        block_a = slice(start_a, start_a + step)
+        for start_b in range(start_a, n_columns, step):
+            block_b = slice(start_b, start_b + step)
+            block_corr, block_counts = _correlation_block(
+                values[:, block_a],
+                availability[:, block_a],
+                values[:, block_b],
+                availability[:, block_b],
+            )
+            correlation[block_a, block_b] = block_corr
+            counts[block_a, block_b] = block_counts
+            correlation[block_b, block_a] = block_corr.T
+            counts[block_b, block_a] = block_counts.T
+
+    correlation[counts < max(min_periods, 2)] = np.nan
+    degrees = counts - 2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t_statistic = correlation * np.sqrt(degrees / (1 - correlation**2))
+        pvalues = 2 * stats.t.sf(np.abs(t_statistic), degrees)
+    pvalues[np.abs(correlation) == 1] = 0.0
+    pvalues[np.isnan(correlation)] = np.nan
+
+    def frame(matrix: np.ndarray) -> pd.DataFrame:
+        return pd.DataFrame(matrix, index=data.columns, columns=data.columns)
+
+    return frame(correlation), frame(counts.astype(np.int64)), frame(pvalues)
@@ -0,0 +1,264 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from functools import lru_cache
+from os import PathLike
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from scipy.sparse import csr_matrix
+from sklearn.feature_extraction.text import HashingVectorizer
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+CROSSWALK_FILE = PROJECT_ROOT / "Data" / "Processed" / "country_crosswalk.parquet"
+
+# Natural Earth code columns tried in order for an exact match
+WORLD_CODES = ("ISO_A3", "ISO_A3_EH", "ADM0_A3")
+# Natural Earth name columns offered to the fuzzy match
+WORLD_NAMES = ("NAME_LONG", "ADMIN", "NAME")
+# Findex codes spelled differently in Natural Earth
+ALIASES = {"XKX": "KOS"}
+
+_vectorizer = HashingVectorizer(
+    analyzer="char_wb",
+    ngram_range=(3, 3),
+    n_features=2**16,
+    strip_accents="unicode",
+)
+
+
+@lru_cache(maxsize=16)
+def _name_vectors(names: tuple[str, ...]) -> csr_matrix:
+    """L2-normalized character trigram counts of names, cached per tuple."""
+    return _vectorizer.transform(names)
+
+
+def match_names(
+    queries: Iterable[str],
+    choices: Iterable[str],
+    threshold: float = 0.8,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Find the most similar choice of every query name in one product.
+
+    Names are compared by the cosine similarity of their character trigram
+    counts. The vectors of ``choices`` are cached, so matching several
+    batches against the same choices vectorizes them once.
+
+    Parameters
+    ----------
+    queries, choices : iterable of str
+        Names to match and candidate names.
+    threshold : float, default=0.8
+        Minimum similarity of an accepted match.
+
+    Returns
+    -------
+    positions : numpy.ndarray
+        Position in ``choices`` of the match of every query, ``-1`` when
+        none reaches ``threshold``.
+    scores : numpy.ndarray
+        Similarity of the best choice of every query.
+    """
+    queries, choices = tuple(queries), tuple(choices)
+    if not queries or not choices:
+        return np.full(len(queries), -1), np.zeros(len(queries))
+    similarity = (_name_vectors(queries) @ _name_vectors(choices).T).toarray()
+    positions = similarity.argmax(axis=1)
+    scores = similarity[np.arange(len(queries)), positions]
+    positions[scores < threshold] = -1
+    return positions, scores
+
+
+def _code_index(table: pd.DataFrame, columns: Iterable[str]) -> pd.Series:
+    """Row label of every code found in ``columns``, earlier columns first."""
+    index = [
+        pd.Series(table.index, index=table[column])
+        for column in columns
+        if column in table.columns
+    ]
+    if not index:
+        return pd.Series(dtype=object)
+    codes = pd.concat(index)
+    codes = codes[codes.index.notna() & (codes.index != "-99")]
+    return codes[~codes.index.duplicated()]
+
+
+def build_crosswalk(
+    codes: Iterable[str],
+    world: pd.DataFrame,
+    data360_areas: pd.DataFrame | None = None,
+    *,
+    aliases: Mapping[str, str] = ALIASES,
+    threshold: float = 0.8,
+) -> pd.DataFrame:
+    """Match Findex country codes with Natural Earth and Data360 codes.
+
+    Every code is first looked up in hash indexes of the Natural Earth code
+    columns and of the Data360 ``REF_AREA`` codes, then in ``aliases``.
+    Codes still unmatched fall back to ``match_names`` on the country name.
+
+    Parameters
+    ----------
+    codes : iterable of str
+        Findex ISO3 codes, such as the index of a ``base_values_wave_N``
+        matrix.
+    world : pandas.DataFrame
+        Natural Earth countries, as returned by ``plotting_utils.load_world``.
+    data360_areas : pandas.DataFrame or None, default=None
+        ``REF_AREA`` and ``REF_AREA_LABEL`` of the Data360 countries, as
+        returned by ``data360.load_data360_areas``.
+    aliases : mapping of str to str, default=ALIASES
+        Natural Earth code of Findex codes spelled differently.
+    threshold : float, default=0.8
+        Minimum name similarity of a fuzzy match.
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per code with its ``iso3``, ``name``, the Natural Earth
+        ``adm0_a3`` and ``sov_a3``, the Data360 ``ref_area``, and ``match``:
+        ``"exact"``, ``"alias"``, ``"fuzzy"``, or missing when Natural Earth
+        has no match.
+    """
+    codes = pd.Index(pd.unique(pd.Index(codes).astype(str)), name="iso3")
+    world = world.reset_index(drop=True)
+    world_index = _code_index(world, WORLD_CODES)
+
+    if data360_areas is None:
+        data360_areas = pd.DataFrame(columns=["REF_AREA", "REF_AREA_LABEL"])
+    labels = data360_areas.drop_duplicates("REF_AREA").set_index("REF_AREA")[
+        "REF_AREA_LABEL"
+    ]
+    crosswalk = pd.DataFrame(
+        {
+            "name": codes.map(labels),
+            "adm0_a3": None,
+            "sov_a3": None,
+            "ref_area": codes.where(codes.isin(labels.index)),
+            "match": None,
+        },
+        index=codes,
+        dtype=object,
+    )
+
+    # position in world of every code, -1 when not found
+    positions = np.array(codes.map(world_index).fillna(-1), dtype=int)
+    crosswalk.loc[positions >= 0, "match"] = "exact"
+    aliased = codes.map(pd.Series(aliases)).map(world_index).fillna(-1)
+    use_alias = (positions < 0) & (aliased.to_numpy() >= 0)
+    positions[use_alias] = aliased.to_numpy(int)[use_alias]
+    crosswalk.loc[use_alias, "match"] = "alias"
+
+    # fuzzy fallback on every spelling of the Natural Earth names
+    unmatched = (positions < 0) & crosswalk["name"].notna().to_numpy()
+    if unmatched.any():
+        spellings = pd.concat(
+            [world[column].dropna() for column in WORLD_NAMES if column in world]
+        )
+        found, _ = match_names(
+            crosswalk["name"][unmatched], spellings.astype(str), threshold
+        )
+        fuzzy = np.flatnonzero(unmatched)[found >= 0]
+        positions[fuzzy] = spellings.index[found[found >= 0]]
+        crosswalk.iloc[fuzzy, crosswalk.columns.get_loc("match")] = "fuzzy"
+
+    matched = positions >= 0
+    for column, source in (("adm0_a3", "ADM0_A3"), ("sov_a3", "SOV_A3")):
+        if source in world:
+            crosswalk.loc[matched, column] = world[source].to_numpy()[
+                positions[matched]
+            ]
+    if "NAME_LONG" in world:
+        unnamed = matched & crosswalk["name"].isna().to_numpy()
+        crosswalk.loc[unnamed, "name"] = world["NAME_LONG"].to_numpy()[
+            positions[unnamed]
+        ]
+    return crosswalk.reset_index()
+
+
+def load_crosswalk(
+    crosswalk_file: str | PathLike[str] = CROSSWALK_FILE,
+    *,
+    codes: Iterable[str] | None = None,
+    world: pd.DataFrame | None = None,
+    data360_areas: pd.DataFrame | None = None,
+    refresh: bool = False,
+) -> pd.DataFrame:
+    """Return the persisted crosswalk, building it if needed.
+
+    The crosswalk is built when ``crosswalk_file`` does not exist, when
+    ``refresh`` is set, or when it lacks any of ``codes``; a rebuilt
+    crosswalk covers both ``codes`` and the codes of the persisted one.
+
+    Parameters
+    ----------
+    crosswalk_file : str or path-like, default=Data/Processed/country_crosswalk.parquet
+        Parquet file keeping the result of ``build_crosswalk``.
+    codes : iterable of str or None, default=None
+        Findex ISO3 codes the crosswalk must cover.
+    world, data360_areas
+        Passed to ``build_crosswalk`` with ``codes`` when a build is needed.
+    refresh : bool, default=False
+        Whether to rebuild the crosswalk and overwrite ``crosswalk_file``.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Result of ``build_crosswalk``.
+
+    Raises
+    ------
+    FileNotFoundError
+        If a build is needed and ``codes`` or ``world`` is missing.
+    """
+    crosswalk_file = Path(crosswalk_file)
+    codes = None if codes is None else list(codes)
+    if crosswalk_file.exists() and not refresh:
+        crosswalk = pd.read_parquet(crosswalk_file)
+        if codes is None or pd.Index(codes).isin(crosswalk["iso3"]).all():
+            return crosswalk
+        # the rebuilt crosswalk keeps the codes it already covers
+        codes = crosswalk["iso3"].tolist() + codes
+    if codes is None or world is None:
+        raise FileNotFoundError(
+            f"{crosswalk_file} is missing or incomplete and no codes and "
+            "countries were given to build it."
+        )
+    crosswalk = build_crosswalk(codes, world, data360_areas)
+    crosswalk_file.parent.mkdir(parents=True, exist_ok=True)
+    crosswalk.to_parquet(crosswalk_file, index=False)
+    return crosswalk
+
+
+def translate(
+    values: pd.Series,
+    crosswalk: pd.DataFrame,
+    *,
+    source: str = "iso3",
+    target: str = "adm0_a3",
+) -> pd.Series:
+    """Reindex a country-indexed series with another code through a crosswalk.
+
+    Parameters
+    ----------
+    values : pandas.Series
+        Values indexed by ``source`` codes, such as cluster labels.
+    crosswalk : pandas.DataFrame
+        Result of ``build_crosswalk`` or ``load_crosswalk``.
+    source, target : str, default="iso3" and "adm0_a3"
+        Crosswalk columns of the current and the new index; ``target`` can
+        also be ``"name"``.
+
+    Returns
+    -------
+    pandas.Series
+        ``values`` indexed by ``target``, countries without a ``target``
+        value left out.
+    """
+    lookup = crosswalk.dropna(subset=[source, target]).set_index(source)[target]
+    new_index = values.index.map(lookup)
+    found = new_index.notna()
+    translated = values[found]
+    translated.index = pd.Index(new_index[found], name=target)
+    return translated
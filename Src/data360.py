@@ -0,0 +1,245 @@
+from __future__ import annotations
+
+import sqlite3
+from collections.abc import Iterable, Mapping
+from contextlib import closing
+from os import PathLike
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+SQL_FOLDER = PROJECT_ROOT / "Sql"
+PROCESSED_DATA_FOLDER = PROJECT_ROOT / "Data" / "Processed"
+
+# reference year of every Findex wave in the Data360 TIME_PERIOD column
+WAVE_YEARS = {1: 2011, 2: 2014, 3: 2017, 4: 2021, 5: 2024}
+
+
+def prepare_data360(db_path: str | PathLike[str]) -> None:
+    """Create the aggregate-region lookup table and the dimension index.
+
+    Runs ``Sql/data360_prepare.sql``: aggregate regions are found once with
+    the LIKE filters and stored in the indexed ``data360_aggregate_areas``
+    table, and a composite index on the dimension columns of ``WB_FINDEX``
+    serves the base series filters. Run it once before reading, and again
+    after the database is refreshed; the read functions open the database
+    read-only and never prepare it themselves.
+
+    Parameters
+    ----------
+    db_path : str or path-like
+        Data360 SQLite database, opened for writing.
+    """
+    script = (SQL_FOLDER / "data360_prepare.sql").read_text()
+    with closing(sqlite3.connect(db_path)) as connection, connection:
+        connection.executescript(script)
+
+
+def _is_prepared(connection: sqlite3.Connection) -> bool:
+    found = connection.execute(
+        "select count(*) from sqlite_master"
+        " where name in ('data360_aggregate_areas', 'idx_wb_findex_dimensions')"
+    ).fetchone()[0]
+    return found == 2
+
+
+def _read_query(db_path: str | PathLike[str], sql_file: str) -> pd.DataFrame:
+    """Run a query of ``Sql/`` on a prepared database opened read-only."""
+    uri = Path(db_path).resolve().as_uri() + "?mode=ro"
+    with closing(sqlite3.connect(uri, uri=True)) as connection:
+        if not _is_prepared(connection):
+            raise ValueError(
+                f"{db_path} is not prepared, run data360.prepare_data360 first."
+            )
+        return pd.read_sql_query((SQL_FOLDER / sql_file).read_text(), connection)
+
+
+def _series_mapping(
+    codes: Iterable[str],
+    series_ids: Iterable[str] | None,
+) -> dict[str, str]:
+    """Map Data360 indicator codes to Findex series ids.
+
+    Data360 spells ``account.t.d`` as ``ACCOUNT_T_D``; codes are matched on
+    their lowercase form with dots as underscores and unmatched codes keep
+    their lowercase form.
+    """
+    known = {
+        series_id.lower().replace(".", "_"): series_id
+        for series_id in series_ids or ()
+    }
+    return {code: known.get(code.lower(), code.lower()) for code in codes}
+
+
+def load_data360_waves(
+    db_path: str | PathLike[str],
+    waves: Iterable[int] = WAVE_YEARS,
+    *,
+    series_ids: Iterable[str] | None = None,
+    wave_years: Mapping[int, int] = WAVE_YEARS,
+) -> dict[int, pd.DataFrame]:
+    """Build the country-by-indicator matrices of every wave from Data360.
+
+    The matrices follow the Findex path of the data preparation: one row per
+    country and one column per base series, zeros treated as missing.
+
+    Parameters
+    ----------
+    db_path : str or path-like
+        Data360 SQLite database with the ``WB_FINDEX`` table.
+    waves : iterable of int, default=1..5
+        Findex waves to build.
+    series_ids : iterable of str or None, default=None
+        Findex series ids used to name the columns, such as the columns of
+        a ``base_values_wave_N`` matrix.
+    wave_years : mapping of int to int, default=WAVE_YEARS
+        Data360 year of every wave.
+
+    Returns
+    -------
+    dict of int to pandas.DataFrame
+        Matrix of every wave, countries by row and series by column.
+
+    Raises
+    ------
+    ValueError
+        If the database was not prepared with ``prepare_data360``.
+    """
+    values = _read_query(db_path, "data360_values.sql")
+
+    values["year"] = pd.to_numeric(values["year"], downcast="integer")
+    values["value"] = pd.to_numeric(values["value"])
+    mapping = _series_mapping(values["indicator"].unique(), series_ids)
+    values["series_id"] = values["indicator"].map(mapping)
+
+    matrices = {}
+    for wave in waves:
+        wave_values = values[values["year"] == wave_years[wave]]
+        matrix = wave_values.pivot(
+            index="country_id", columns="series_id", values="value"
+        )
+        # zeros are ambiguous, they get changed into NaN
+        matrices[wave] = matrix.mask(matrix == 0)
+    return matrices
+
+
+def load_data360_areas(db_path: str | PathLike[str]) -> pd.DataFrame:
+    """Read the countries of Data360 with their labels.
+
+    Parameters
+    ----------
+    db_path : str or path-like
+        Data360 SQLite database with the ``WB_FINDEX`` table.
+
+    Returns
+    -------
+    pandas.DataFrame
+        ``REF_AREA`` and ``REF_AREA_LABEL`` of every country, aggregate
+        regions left out.
+
+    Raises
+    ------
+    ValueError
+        If the database was not prepared with ``prepare_data360``.
+    """
+    return _read_query(db_path, "data360_areas.sql")
+
+
+def compare_matrices(
+    findex: pd.DataFrame,
+    data360: pd.DataFrame,
+    *,
+    atol: float = 1e-6,
+    rtol: float = 1e-6,
+) -> pd.DataFrame:
+    """Compare two country-by-series matrices of the same wave.
+
+    Both matrices are aligned on the union of their countries and series and
+    compared as whole arrays.
+
+    Parameters
+    ----------
+    findex, data360 : pandas.DataFrame
+        Matrices built from the Findex and the Data360 databases.
+    atol, rtol : float, default=1e-6
+        Tolerances of ``numpy.isclose`` for values present in both.
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per series with ``n_both``, ``n_findex_only``, and
+        ``n_data360_only`` value counts, ``n_mismatch``, the values present
+        in both that differ, and ``max_abs_diff``.
+    """
+    countries = findex.index.union(data360.index)
+    series = findex.columns.union(data360.columns)
+    left = findex.reindex(index=countries, columns=series).to_numpy(np.float64)
+    right = data360.reindex(index=countries, columns=series).to_numpy(np.float64)
+
+    left_present = ~np.isnan(left)
+    right_present = ~np.isnan(right)
+    both = left_present & right_present
+    difference = np.where(both, np.abs(left - right), 0.0)
+    mismatch = both & ~np.isclose(left, right, rtol=rtol, atol=atol)
+
+    return pd.DataFrame(
+        {
+            "n_both": both.sum(axis=0),
+            "n_findex_only": (left_present & ~right_present).sum(axis=0),
+            "n_data360_only": (right_present & ~left_present).sum(axis=0),
+            "n_mismatch": mismatch.sum(axis=0),
+            "max_abs_diff": np.where(
+                both.any(axis=0), difference.max(axis=0, initial=0.0), np.nan
+            ),
+        },
+        index=pd.Index(series, name="series_id"),
+    )
+
+
+def check_consistency(
+    db_path: str | PathLike[str],
+    waves: Iterable[int] = WAVE_YEARS,
+    *,
+    processed_data_folder: str | PathLike[str] = PROCESSED_DATA_FOLDER,
+    wave_years: Mapping[int, int] = WAVE_YEARS,
+    atol: float = 1e-6,
+    rtol: float = 1e-6,
+) -> pd.DataFrame:
+    """Compare Data360 wave matrices with the Findex-derived matrices.
+
+    Parameters
+    ----------
+    db_path : str or path-like
+        Data360 SQLite database.
+    waves : iterable of int, default=1..5
+        Waves to compare.
+    processed_data_folder : str or path-like, default=Data/Processed
+        Folder with the ``base_values_wave_N.parquet`` files.
+    wave_years, atol, rtol
+        See ``load_data360_waves`` and ``compare_matrices``.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Result of ``compare_matrices`` for every wave, indexed by wave and
+        series.
+    """
+    folder = Path(processed_data_folder)
+    waves = list(waves)
+    findex = {
+        wave: pd.read_parquet(folder / f"base_values_wave_{wave}.parquet")
+        for wave in waves
+    }
+    series_ids = set().union(*(matrix.columns for matrix in findex.values()))
+    data360 = load_data360_waves(
+        db_path, waves, series_ids=series_ids, wave_years=wave_years
+    )
+    return pd.concat(
+        {
+            wave: compare_matrices(findex[wave], data360[wave], atol=atol, rtol=rtol)
+            for wave in waves
+        },
+        names=["wave_id"],
+    )
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import sqlite3
+from contextlib import closing
+from os import PathLike
+from pathlib import Path
+
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+SQL_FOLDER = PROJECT_ROOT / "Sql"
+# every (series, wave, country) cell of the scan, not only the summary counts
+CELLS_FILE = PROJECT_ROOT / "Data" / "Processed" / "data_quality_cells.parquet"
+
+_LEVELS = {
+    "series": ["series_id", "wave_id"],
+    "country": ["country_id", "wave_id"],
+    "wave": ["wave_id"],
+}
+
+
+def scan_data_quality(
+    db_path: str | PathLike[str],
+    sql_file: str | PathLike[str] = SQL_FOLDER / "data_quality.sql",
+) -> pd.DataFrame:
+    """Count present, zero, and null base series values in one grouped scan.
+
+    Replaces the separate ``series_population.sql`` and ``zero_vals.sql``
+    scans of ``series_values``: a single grouped query returns, for every
+    (series, wave, country) with at least one row, its row, non-null, and
+    zero counts together with the value, zeros returned as missing.
+
+    Parameters
+    ----------
+    db_path : str or path-like
+        Findex SQLite database.
+    sql_file : str or path-like, default=Sql/data_quality.sql
+        Query grouped by series, wave, and country.
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per (series, wave, country) with ``n_rows``, ``n_values``,
+        ``n_zero``, and ``value`` columns.
+    """
+    query = Path(sql_file).read_text()
+    with closing(sqlite3.connect(db_path)) as connection:
+        cells = pd.read_sql_query(query, connection)
+    counts = ["n_rows", "n_values", "n_zero"]
+    cells[counts] = cells[counts].fillna(0).astype("int32")
+    cells["wave_id"] = cells["wave_id"].astype("int8")
+    cells["value"] = cells["value"].astype("float64")
+    return cells
+
+
+def load_data_quality(
+    db_path: str | PathLike[str] | None = None,
+    cells_file: str | PathLike[str] = CELLS_FILE,
+    *,
+    refresh: bool = False,
+) -> pd.DataFrame:
+    """Return the cached cells of the data-quality scan, scanning if needed.
+
+    The cache keeps every (series, wave, country) cell of
+    ``scan_data_quality`` with its value, so both ``quality_summary`` and
+    ``wave_matrix`` are derived from it without reading the database. It
+    is about as large as the ``base_values_wave_N`` matrices together; the
+    summaries are small and cheap to recompute from it.
+
+    Parameters
+    ----------
+    db_path : str, path-like, or None, default=None
+        Findex SQLite database, only read when ``cells_file`` does not
+        exist or ``refresh`` is set.
+    cells_file : str or path-like, default=Data/Processed/data_quality_cells.parquet
+        Parquet cell cache keeping the result of ``scan_data_quality``.
+    refresh : bool, default=False
+        Whether to rescan the database and overwrite ``cells_file``.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Result of ``scan_data_quality``.
+
+    Raises
+    ------
+    FileNotFoundError
+        If a scan is needed and no ``db_path`` is given.
+    """
+    cells_file = Path(cells_file)
+    if cells_file.exists() and not refresh:
+        return pd.read_parquet(cells_file)
+    if db_path is None:
+        raise FileNotFoundError(
+            f"{cells_file} does not exist and no database was given to scan."
+        )
+    cells = scan_data_quality(db_path)
+    cells_file.parent.mkdir(parents=True, exist_ok=True)
+    cells.to_parquet(cells_file, index=False)
+    return cells
+
+
+def quality_summary(cells: pd.DataFrame, by: str = "series") -> pd.DataFrame:
+    """Count present, zero, and missing values per series, country, or wave.
+
+    The values of a wave form a matrix of the countries and series having
+    at least one row in that wave, as pivoted by ``wave_matrix``. A value is
+    present when it is neither null nor zero and missing when it is null or
+    has no row; zeros are counted apart.
+
+    Parameters
+    ----------
+    cells : pandas.DataFrame
+        Result of ``scan_data_quality`` or ``load_data_quality``.
+    by : {"series", "country", "wave"}, default="series"
+        Grouping level; series and countries are counted per wave.
+
+    Returns
+    -------
+    pandas.DataFrame
+        ``n_present``, ``n_zero``, and ``n_missing`` counts, their total
+        ``n_cells``, and ``fraction_missing``, the share of cells treated as
+        missing after zeros are masked.
+    """
+    if by not in _LEVELS:
+        raise ValueError(f"Unknown summary level: {by!r}.")
+    keys = _LEVELS[by]
+    # size of the wave matrices
+    n_countries = cells.groupby("wave_id")["country_id"].nunique()
+    n_series = cells.groupby("wave_id")["series_id"].nunique()
+
+    present = cells["value"].notna()
+    counts = (
+        cells.assign(n_present=present, n_zero=(cells["n_zero"] > 0) & ~present)
+        .groupby(keys)[["n_present", "n_zero"]]
+        .sum()
+    )
+    waves = counts.index.get_level_values("wave_id")
+    if by == "series":
+        n_cells = n_countries.reindex(waves).to_numpy()
+    elif by == "country":
+        n_cells = n_series.reindex(waves).to_numpy()
+    else:
+        n_cells = (n_countries * n_series).reindex(waves).to_numpy()
+
+    counts["n_missing"] = n_cells - counts["n_present"] - counts["n_zero"]
+    counts["n_cells"] = n_cells
+    counts["fraction_missing"] = 1 - counts["n_present"] / counts["n_cells"]
+    return counts
+
+
+def wave_matrix(cells: pd.DataFrame, wave: int) -> pd.DataFrame:
+    """Pivot one wave of the scan into the country-by-series value matrix.
+
+    Zeros are already missing in the scan, so the result equals the
+    ``base_values_wave_N`` matrices written by the data preparation.
+
+    Parameters
+    ----------
+    cells : pandas.DataFrame
+        Result of ``scan_data_quality`` or ``load_data_quality``.
+    wave : int
+        Findex wave.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Countries by row and series by column, missing and zero values as
+        ``NaN``.
+    """
+    return cells[cells["wave_id"] == wave].pivot(
+        index="country_id", columns="series_id", values="value"
+    )
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+import sklearn
+from sklearn.decomposition import PCA
+from sklearn.manifold import TSNE
+from sklearn.preprocessing import StandardScaler
+
+from caching import ResultStore, array_fingerprint
+
+# t-SNE settings used by the analysis notebooks
+TSNE_DEFAULTS: dict[str, Any] = {
+    "perplexity": 30,
+    "init": "pca",
+    "learning_rate": "auto",
+}
+
+
+def _settings(method: str, params: dict[str, Any]) -> dict[str, Any]:
+    if method == "pca":
+        return dict(params)
+    if method == "tsne":
+        return {**TSNE_DEFAULTS, **params}
+    raise ValueError(f"Unknown embedding method: {method!r}.")
+
+
+def _embed(
+    values: np.ndarray,
+    method: str,
+    standardize: bool,
+    settings: dict[str, Any],
+) -> np.ndarray:
+    if standardize:
+        values = StandardScaler().fit_transform(values)
+    if method == "pca":
+        return PCA(n_components=2, **settings).fit_transform(values)
+    return TSNE(n_components=2, **settings).fit_transform(values)
+
+
+def _key(
+    values: np.ndarray,
+    method: str,
+    standardize: bool,
+    settings: dict[str, Any],
+) -> str:
+    return array_fingerprint(
+        values,
+        method=method,
+        standardize=standardize,
+        sklearn=sklearn.__version__,
+        **settings,
+    )
+
+
+def embed_submatrix(
+    submatrix: pd.DataFrame | npt.ArrayLike,
+    method: str = "tsne",
+    *,
+    standardize: bool = True,
+    cache: ResultStore | None = None,
+    **params: Any,
+) -> np.ndarray:
+    """Project a submatrix onto two dimensions, reusing cached projections.
+
+    Parameters
+    ----------
+    submatrix : pandas.DataFrame or array-like of shape (n_samples, n_features)
+        Complete submatrix.
+    method : {"tsne", "pca"}, default="tsne"
+        Projection method. t-SNE defaults to ``TSNE_DEFAULTS``.
+    standardize : bool, default=True
+        Whether to standardize features before projecting.
+    cache : caching.ResultStore or None, default=None
+        Store of earlier projections, keyed by a fingerprint of the submatrix
+        values, the method, its parameters, and the scikit-learn version.
+        Without a ``random_state``, a cached t-SNE projection is one of the
+        possible random outcomes and is returned as is.
+    **params
+        Passed to ``sklearn.manifold.TSNE`` or ``sklearn.decomposition.PCA``.
+
+    Returns
+    -------
+    numpy.ndarray of shape (n_samples, 2)
+        Projection coordinates.
+    """
+    values = np.asarray(submatrix)
+    settings = _settings(method, params)
+    if cache is None:
+        return _embed(values, method, standardize, settings)
+
+    key = _key(values, method, standardize, settings)
+    cached = cache.get(key)
+    if cached is not None:
+        return cached["embedding"]
+    embedding = _embed(values, method, standardize, settings)
+    cache.put(key, embedding=embedding)
+    return embedding
+
+
+def embed_submatrices(
+    submatrices: Sequence[pd.DataFrame | npt.ArrayLike],
+    method: str = "tsne",
+    *,
+    standardize: bool = True,
+    cache: ResultStore | None = None,
+    max_workers: int | None = None,
+    **params: Any,
+) -> list[np.ndarray]:
+    """Project many submatrices onto two dimensions in parallel.
+
+    Cached projections are read in the calling process; the remaining ones are
+    computed on a process pool and added to the cache.
+
+    Parameters
+    ----------
+    submatrices : sequence of pandas.DataFrame or array-like
+        Complete submatrices, such as those returned by
+        ``preparation.import_bicliques``.
+    method, standardize, cache, **params
+        See ``embed_submatrix``.
+    max_workers : int or None, default=None
+        Size of the process pool.
+
+    Returns
+    -------
+    list of numpy.ndarray of shape (n_samples, 2)
+        Projection of every submatrix, in input order.
+    """
+    settings = _settings(method, params)
+    values = [np.asarray(submatrix) for submatrix in submatrices]
+    keys = [_key(value, method, standardize, settings) for value in values]
+
+    embeddings: list[np.ndarray | None] = [None] * len(values)
+    if cache is not None:
+        for position, key in enumerate(keys):
+            cached = cache.get(key)
+            if cached is not None:
+                embeddings[position] = cached["embedding"]
+
+    pending = [
+        position
+        for position, embedding in enumerate(embeddings)
+        if embedding is None
+    ]
+    if pending:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            computed = pool.map(
+                _embed,
+                [values[position] for position in pending],
+                [method] * len(pending),
+                [standardize] * len(pending),
+                [settings] * len(pending),
+            )
+            for position, embedding in zip(pending, computed):
+                embeddings[position] = embedding
+                if cache is not None:
+                    cache.put(keys[position], embedding=embedding)
+    return embeddings
@@ -0,0 +1,175 @@
+"""Measure the latency and throughput of the results query service.
+
+Usage::
+
+    python Src/load_test.py Data/Processed/results_4 Data/Processed/results_5
+    python Src/load_test.py --url http://127.0.0.1:8000 --threads 8
+"""
+from __future__ import annotations
+
+import argparse
+import json
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+from typing import Any
+from urllib.error import HTTPError
+from urllib.parse import urlencode
+from urllib.request import urlopen
+
+import numpy as np
+import pandas as pd
+
+from service import QueryService
+
+
+def make_queries(
+    catalogue: dict[str, Any],
+    n_queries: int = 1000,
+    random_state: int | None = 0,
+) -> dict[str, list[str]]:
+    """Draw random query paths of every kind.
+
+    Parameters
+    ----------
+    catalogue : dict
+        Answer of the ``/countries`` route.
+    n_queries : int, default=1000
+        Paths drawn per kind.
+    random_state : int or None, default=0
+        Seed of the draws.
+
+    Returns
+    -------
+    dict of str to list of str
+        Paths of the ``labels``, ``neighbours``, and ``profile`` queries.
+    """
+    rng = np.random.default_rng(random_state)
+    names = list(catalogue)
+    queries: dict[str, list[str]] = {"labels": [], "neighbours": [], "profile": []}
+    for _ in range(n_queries):
+        name = names[rng.integers(len(names))]
+        countries = catalogue[name]["countries"]
+        clusters = catalogue[name]["clusters"]
+        country = countries[rng.integers(len(countries))]
+        queries["labels"].append("/labels?" + urlencode({"country": country}))
+        queries["neighbours"].append(
+            "/neighbours?" + urlencode({"country": country, "results": name})
+        )
+        queries["profile"].append(
+            "/profile?"
+            + urlencode(
+                {"cluster": clusters[rng.integers(len(clusters))], "results": name}
+            )
+        )
+    return queries
+
+
+def _timed_call(answer: Callable[[str], int], path: str) -> float:
+    start = perf_counter()
+    status = answer(path)
+    elapsed = perf_counter() - start
+    if status != 200:
+        raise RuntimeError(f"{path} answered with status {status}.")
+    return elapsed
+
+
+def run_load_test(
+    answer: Callable[[str], int],
+    queries: dict[str, list[str]],
+    threads: int = 1,
+) -> pd.DataFrame:
+    """Send every query and summarize latencies and throughput per kind.
+
+    Parameters
+    ----------
+    answer : callable
+        Sends one path and returns the HTTP status.
+    queries : dict of str to list of str
+        Paths of every kind, see ``make_queries``.
+    threads : int, default=1
+        Concurrent senders.
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per query kind with the number of ``queries``, the
+        ``p50_us``, ``p99_us``, and ``max_us`` latencies in microseconds,
+        and ``per_second``, the throughput.
+    """
+    rows = {}
+    for kind, paths in queries.items():
+        start = perf_counter()
+        if threads == 1:
+            latencies = [_timed_call(answer, path) for path in paths]
+        else:
+            with ThreadPoolExecutor(max_workers=threads) as pool:
+                latencies = list(
+                    pool.map(lambda path: _timed_call(answer, path), paths)
+                )
+        elapsed = perf_counter() - start
+        micros = np.array(latencies) * 1e6
+        rows[kind] = {
+            "queries": len(paths),
+            "p50_us": np.percentile(micros, 50),
+            "p99_us": np.percentile(micros, 99),
+            "max_us": micros.max(),
+            "per_second": len(paths) / elapsed,
+        }
+    return pd.DataFrame.from_dict(rows, orient="index")
+
+
+def in_process(service: QueryService) -> Callable[[str], int]:
+    """Answer paths with ``service`` directly, serializing like the server."""
+
+    def answer(path: str) -> int:
+        status, payload = service.query(path)
+        json.dumps(payload)
+        return status
+
+    return answer
+
+
+def over_http(url: str) -> Callable[[str], int]:
+    """Answer paths with a running service at ``url``."""
+
+    def answer(path: str) -> int:
+        try:
+            with urlopen(url + path) as response:
+                response.read()
+                return response.status
+        except HTTPError as error:
+            return error.code
+
+    return answer
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "results", nargs="*", help="results folders queried in process"
+    )
+    parser.add_argument("--url", help="address of a running service")
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--threads", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    if bool(args.url) == bool(args.results):
+        parser.error("give either results folders or --url")
+
+    if args.url:
+        answer = over_http(args.url.rstrip("/"))
+        with urlopen(args.url.rstrip("/") + "/countries") as response:
+            catalogue = json.load(response)
+    else:
+        service = QueryService(args.results)
+        answer = in_process(service)
+        catalogue = service.countries()
+
+    queries = make_queries(catalogue, args.queries, args.seed)
+    summary = run_load_test(answer, queries, args.threads)
+    print(summary.to_string(float_format=lambda value: f"{value:,.1f}"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,298 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+from os import PathLike
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+# arrays of a saved model; biclique columns and centroids are ragged and
+# stored flat with offsets
+_ARRAYS = (
+    "countries",
+    "indicators",
+    "mean",
+    "scale",
+    "clusters",
+    "coobserved",
+    "coclustered",
+    "final",
+)
+
+
+def build_model(
+    result: Mapping[str, Any],
+    mean: pd.Series,
+    scale: pd.Series,
+) -> dict[str, Any]:
+    """Collect what out-of-sample assignment needs from a consensus run.
+
+    Parameters
+    ----------
+    result : mapping
+        Result of ``pipeline.run_consensus``, with standardized
+        ``submatrices``, fitted ``models``, the ``clusters`` table including
+        its ``final`` column, and the ``coobserved`` and ``coclustered``
+        counts.
+    mean, scale : pandas.Series
+        Standardization parameters of the run, as returned by
+        ``preparation.standardization_parameters``.
+
+    Returns
+    -------
+    dict
+        Model with the training ``countries``, the ``indicators`` used by any
+        biclique with their ``mean`` and ``scale``, the indicator positions
+        (``columns``) and ``centroids`` of every biclique, the ``clusters``
+        label table, the ``coobserved`` and ``coclustered`` counts, the
+        ``final`` labels, and ``n_clusters``.
+    """
+    submatrices = result["submatrices"]
+    indicators = pd.Index(
+        pd.unique(np.concatenate([df.columns.to_numpy() for df in submatrices]))
+    )
+    clusters = result["clusters"]
+    biclique_columns = [column for column in clusters.columns if column != "final"]
+    return {
+        "countries": clusters.index,
+        "indicators": indicators,
+        "mean": mean[indicators].to_numpy(np.float64),
+        "scale": scale[indicators].to_numpy(np.float64),
+        "columns": [indicators.get_indexer(df.columns) for df in submatrices],
+        "centroids": [
+            np.asarray(result["models"][position].cluster_centers_, np.float64)
+            for position in range(len(submatrices))
+        ],
+        "clusters": clusters[biclique_columns].to_numpy(np.int16),
+        "coobserved": np.asarray(result["coobserved"]),
+        "coclustered": np.asarray(result["coclustered"]),
+        "final": clusters["final"].to_numpy(),
+        "n_clusters": int(clusters["final"].max()) + 1,
+    }
+
+
+def save_model(model: Mapping[str, Any], path: str | PathLike[str]) -> None:
+    """Write a model to a compressed ``.npz`` file readable without pickle.
+
+    Parameters
+    ----------
+    model : mapping
+        Model as returned by ``build_model``.
+    path : str or path-like
+        Destination file.
+    """
+    arrays = {name: np.asarray(model[name]) for name in _ARRAYS}
+    arrays["countries"] = arrays["countries"].astype(str)
+    arrays["indicators"] = arrays["indicators"].astype(str)
+    arrays["column_offsets"] = np.cumsum([0] + [len(c) for c in model["columns"]])
+    arrays["column_positions"] = np.concatenate(model["columns"])
+    arrays["centroid_offsets"] = np.cumsum(
+        [0] + [centroids.size for centroids in model["centroids"]]
+    )
+    arrays["centroid_values"] = np.concatenate(
+        [centroids.ravel() for centroids in model["centroids"]]
+    )
+    arrays["n_clusters"] = np.asarray(model["n_clusters"])
+    with open(path, "wb") as file:
+        np.savez_compressed(file, **arrays)
+
+
+def load_model(path: str | PathLike[str]) -> dict[str, Any]:
+    """Read a model written by ``save_model``.
+
+    Parameters
+    ----------
+    path : str or path-like
+        Model file.
+
+    Returns
+    -------
+    dict
+        Model as returned by ``build_model``.
+    """
+    with np.load(path, allow_pickle=False) as stored:
+        model = {name: stored[name] for name in _ARRAYS}
+        column_offsets = stored["column_offsets"]
+        positions = stored["column_positions"]
+        centroid_offsets = stored["centroid_offsets"]
+        values = stored["centroid_values"]
+        model["n_clusters"] = int(stored["n_clusters"])
+
+    model["countries"] = pd.Index(model["countries"])
+    model["indicators"] = pd.Index(model["indicators"])
+    model["columns"] = [
+        positions[start:end]
+        for start, end in zip(column_offsets[:-1], column_offsets[1:])
+    ]
+    model["centroids"] = [
+        values[start:end].reshape(-1, len(columns))
+        for start, end, columns in zip(
+            centroid_offsets[:-1], centroid_offsets[1:], model["columns"]
+        )
+    ]
+    return model
+
+
+def _assign_bicliques(model: Mapping[str, Any], values: np.ndarray) -> np.ndarray:
+    """Nearest-centroid label of every row in every biclique it covers."""
+    standardized = (values - model["mean"]) / model["scale"]
+    labels = np.full((len(values), len(model["columns"])), -1, dtype=np.int16)
+    for position, (columns, centroids) in enumerate(
+        zip(model["columns"], model["centroids"])
+    ):
+        rows = standardized[:, columns]
+        covered = ~np.isnan(rows).any(axis=1)
+        if covered.any():
+            distances = (
+                (rows[covered, None, :] - centroids[None, :, :]) ** 2
+            ).sum(axis=-1)
+            labels[covered, position] = distances.argmin(axis=1)
+    return labels
+
+
+def _consensus_rows(
+    clusters: np.ndarray,
+    labels: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Co-observation and co-clustering counts of new rows with every row."""
+    covered = (labels >= 0).astype(np.int32)
+    observed = (clusters >= 0).astype(np.int32)
+    coobserved = covered @ observed.T
+    # a shared label only counts where the new row is covered
+    coclustered = (
+        (labels[:, None, :] == clusters[None, :, :]) & (labels[:, None, :] >= 0)
+    ).sum(axis=-1)
+    return coobserved, coclustered
+
+
+def _place(
+    coobserved: np.ndarray,
+    coclustered: np.ndarray,
+    final: np.ndarray,
+    n_clusters: int,
+) -> np.ndarray:
+    """Final cluster at the smallest average consensus dissimilarity.
+
+    Average linkage merges clusters on the mean dissimilarity of their
+    members, so a new row joins the final cluster it is on average closest
+    to. Pairs never observed together do not count.
+    """
+    dissimilarity = 1 - np.divide(
+        coclustered,
+        coobserved,
+        out=np.full(coobserved.shape, np.nan),
+        where=coobserved > 0,
+    )
+    placed = np.full(len(coobserved), -1)
+    averages = np.full((len(coobserved), n_clusters), np.nan)
+    for cluster in range(n_clusters):
+        members = dissimilarity[:, final == cluster]
+        counted = ~np.isnan(members)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            averages[:, cluster] = np.nansum(members, axis=1) / counted.sum(axis=1)
+    reachable = ~np.isnan(averages).all(axis=1)
+    placed[reachable] = np.nanargmin(averages[reachable], axis=1)
+    return placed
+
+
+def predict(model: Mapping[str, Any], rows: pd.DataFrame) -> pd.DataFrame:
+    """Assign new or revised countries without refitting any clustering.
+
+    Every row is standardized with the stored parameters and labeled by the
+    nearest centroid of every biclique whose indicators it fully covers. Its
+    co-observation and co-clustering counts with the training countries
+    then place it in the final cluster it is on average closest to in
+    consensus. A revised training country is compared with the other
+    training countries only.
+
+    Parameters
+    ----------
+    model : mapping
+        Model as returned by ``build_model`` or ``load_model``.
+    rows : pandas.DataFrame
+        Raw indicator values of the countries to assign, one row per
+        country; columns missing from ``rows`` count as missing values.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Label of every country (rows) in every biclique (columns), ``-1``
+        where a biclique is not covered, and its ``final`` cluster, ``-1``
+        when no biclique is covered.
+    """
+    values = rows.reindex(columns=model["indicators"]).to_numpy(np.float64)
+    labels = _assign_bicliques(model, values)
+    coobserved, coclustered = _consensus_rows(model["clusters"], labels)
+
+    # a revised country is not compared with its own previous version
+    own = model["countries"].get_indexer(rows.index)
+    revised = own >= 0
+    coobserved[np.flatnonzero(revised), own[revised]] = 0
+    coclustered[np.flatnonzero(revised), own[revised]] = 0
+
+    result = pd.DataFrame(labels, index=rows.index)
+    result["final"] = _place(
+        coobserved, coclustered, model["final"], model["n_clusters"]
+    )
+    return result
+
+
+def update_model(model: Mapping[str, Any], rows: pd.DataFrame) -> dict[str, Any]:
+    """Add new countries to a model or replace revised ones.
+
+    Only the rows and columns of the given countries change in the label
+    table and in the consensus counts; the other countries keep their final
+    labels.
+
+    Parameters
+    ----------
+    model : mapping
+        Model as returned by ``build_model`` or ``load_model``.
+    rows : pandas.DataFrame
+        Raw indicator values of the added or revised countries.
+
+    Returns
+    -------
+    dict
+        Updated copy of ``model``.
+    """
+    assigned = predict(model, rows)
+    labels = assigned.drop(columns="final").to_numpy(np.int16)
+
+    countries = model["countries"].append(
+        rows.index[~rows.index.isin(model["countries"])]
+    )
+    positions = countries.get_indexer(rows.index)
+    n_countries = len(countries)
+
+    def grow(matrix: np.ndarray) -> np.ndarray:
+        grown = np.zeros((n_countries, n_countries), dtype=matrix.dtype)
+        grown[: len(matrix), : len(matrix)] = matrix
+        return grown
+
+    clusters = np.full((n_countries, labels.shape[1]), -1, dtype=np.int16)
+    clusters[: len(model["clusters"])] = model["clusters"]
+    clusters[positions] = labels
+    final = np.full(n_countries, -1)
+    final[: len(model["final"])] = model["final"]
+    final[positions] = assigned["final"].to_numpy()
+
+    coobserved = grow(model["coobserved"])
+    coclustered = grow(model["coclustered"])
+    row_coobserved, row_coclustered = _consensus_rows(clusters, labels)
+    for matrix, patch in (
+        (coobserved, row_coobserved),
+        (coclustered, row_coclustered),
+    ):
+        matrix[positions, :] = patch
+        matrix[:, positions] = patch.T
+
+    return {
+        **model,
+        "countries": countries,
+        "clusters": clusters,
+        "coobserved": coobserved,
+        "coclustered": coclustered,
+        "final": final,
+    }
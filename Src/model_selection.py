@@ -0,0 +1,426 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+
+import clustering
+import pipeline
+
+# consensus values strictly between these bounds count as ambiguous
+AMBIGUOUS_INTERVAL = (0.1, 0.9)
+
+
+def _seed(rng: np.random.Generator) -> int:
+    return int(rng.integers(2**32))
+
+
+def _log_inertia(
+    data: np.ndarray,
+    n_clusters: int,
+    n_init: int,
+    seed: int,
+) -> float:
+    inertia = clustering.batched_kmeans(
+        data, n_clusters, n_init=n_init, random_state=seed
+    )[2]
+    return float(np.log(inertia)) if inertia > 0 else -np.inf
+
+
+def _gap_datasets(
+    values: np.ndarray,
+    n_references: int,
+    random_state: int | np.random.SeedSequence | None,
+) -> tuple[np.ndarray, list[int]]:
+    """Data and reference datasets stacked in one array, with fit seeds.
+
+    The first dataset is ``values``; the references are drawn uniformly over
+    its bounding box. Seeds are drawn up front, so fits can run in any order.
+    """
+    rng = np.random.default_rng(random_state)
+    references = rng.uniform(
+        values.min(axis=0),
+        values.max(axis=0),
+        size=(n_references, *values.shape),
+    )
+    datasets = np.concatenate([values[None], references])
+    return datasets, [_seed(rng) for _ in datasets]
+
+
+def _gap(log_inertias: Sequence[float]) -> tuple[float, float]:
+    """Gap and deviation from the log dispersions of data and references."""
+    observed = log_inertias[0]
+    reference_log = np.asarray(log_inertias[1:])
+    sd = reference_log.std() * np.sqrt(1 + 1 / len(reference_log))
+    return float(reference_log.mean() - observed), float(sd)
+
+
+def gap_statistic(
+    data: npt.ArrayLike,
+    n_clusters: int,
+    *,
+    n_references: int = 10,
+    n_init: int = 10,
+    random_state: int | np.random.SeedSequence | None = None,
+    max_workers: int | None = 1,
+) -> tuple[float, float]:
+    """Compute the gap statistic of one cluster count.
+
+    Reference datasets are drawn uniformly over the bounding box of the
+    features, all of them as one array. The data and every reference are
+    clustered with ``clustering.batched_kmeans``, each fit with its own
+    seed, so results do not depend on ``max_workers``.
+
+    Parameters
+    ----------
+    data : array-like of shape (n_samples, n_features)
+        Complete observations.
+    n_clusters : int
+        Number of clusters.
+    n_references : int, default=10
+        Number of reference datasets.
+    n_init : int, default=10
+        K-means restarts of every fit.
+    random_state : int, numpy.random.SeedSequence, or None, default=None
+        Seed of the reference datasets and of the fits.
+    max_workers : int or None, default=1
+        Size of the process pool running the fits; ``1`` fits in this
+        process, ``None`` uses every processor.
+
+    Returns
+    -------
+    gap : float
+        Mean log within-cluster dispersion of the references minus that of
+        ``data``.
+    sd : float
+        Standard deviation of the reference log dispersions times
+        ``sqrt(1 + 1 / n_references)``.
+    """
+    values = np.asarray(data, dtype=np.float64)
+    datasets, seeds = _gap_datasets(values, n_references, random_state)
+    arguments = (datasets, repeat(n_clusters), repeat(n_init), seeds)
+    if max_workers == 1:
+        log_inertias = list(map(_log_inertia, *arguments))
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            log_inertias = list(pool.map(_log_inertia, *arguments))
+    return _gap(log_inertias)
+
+
+def prediction_strength(
+    data: npt.ArrayLike,
+    n_clusters: int,
+    *,
+    n_splits: int = 10,
+    n_init: int = 10,
+    random_state: int | np.random.SeedSequence | None = None,
+) -> tuple[float, float]:
+    """Compute the prediction strength of one cluster count.
+
+    The observations are split in halves. Both halves are clustered, and
+    test observations are also assigned to the nearest training centroid.
+    For every test cluster, the share of its pairs that the training
+    centroids keep together is computed; the prediction strength of a
+    split is the smallest share.
+
+    Parameters
+    ----------
+    data : array-like of shape (n_samples, n_features)
+        Complete observations; every half needs at least ``n_clusters``
+        of them.
+    n_clusters : int
+        Number of clusters.
+    n_splits : int, default=10
+        Number of random halvings.
+    n_init : int, default=10
+        K-means restarts of every fit.
+    random_state : int, numpy.random.SeedSequence, or None, default=None
+        Seed of the splits and of the fits.
+
+    Returns
+    -------
+    mean, sd : float
+        Mean and standard deviation of the prediction strength over splits.
+    """
+    values = np.asarray(data, dtype=np.float64)
+    if n_clusters == 1:
+        return 1.0, 0.0
+    rng = np.random.default_rng(random_state)
+    n_samples = len(values)
+    strengths = np.empty(n_splits)
+    for split in range(n_splits):
+        order = rng.permutation(n_samples)
+        train = values[order[: n_samples // 2]]
+        test = values[order[n_samples // 2 :]]
+        centroids = clustering.batched_kmeans(
+            train, n_clusters, n_init=n_init, random_state=_seed(rng)
+        )[0]
+        test_labels = clustering.batched_kmeans(
+            test, n_clusters, n_init=n_init, random_state=_seed(rng)
+        )[1]
+        distances = ((test[:, None, :] - centroids[None, :, :]) ** 2).sum(axis=2)
+        predicted = distances.argmin(axis=1)
+        counts = np.bincount(
+            test_labels * n_clusters + predicted, minlength=n_clusters**2
+        ).reshape(n_clusters, n_clusters)
+        sizes = counts.sum(axis=1)
+        pairs = sizes * (sizes - 1)
+        kept = (counts * (counts - 1)).sum(axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            shares = np.where(pairs > 0, kept / pairs, np.nan)
+        strengths[split] = np.nanmin(shares)
+    return float(strengths.mean()), float(strengths.std())
+
+
+def ambiguous_fraction(consensus: pd.DataFrame | np.ndarray) -> float:
+    """Share of observed pairs with a consensus in ``AMBIGUOUS_INTERVAL``.
+
+    This is the proportion of ambiguous clustering (PAC); ``1 - PAC`` is
+    reported as stability.
+    """
+    values = np.asarray(consensus, dtype=np.float64)
+    upper = values[np.triu_indices(len(values), k=1)]
+    upper = upper[~np.isnan(upper)]
+    low, high = AMBIGUOUS_INTERVAL
+    return float(((upper > low) & (upper < high)).mean()) if len(upper) else np.nan
+
+
+def resampling_stability(
+    data: npt.ArrayLike,
+    n_clusters: int,
+    *,
+    n_resamples: int = 20,
+    fraction: float = 0.8,
+    n_init: int = 10,
+    random_state: int | np.random.SeedSequence | None = None,
+) -> float:
+    """Compute consensus stability of one cluster count under subsampling.
+
+    Every resample clusters a random ``fraction`` of the observations; the
+    co-clustering rates of all pairs form a consensus matrix, whose share
+    of unambiguous pairs is returned.
+
+    Parameters
+    ----------
+    data : array-like of shape (n_samples, n_features)
+        Complete observations.
+    n_clusters : int
+        Number of clusters.
+    n_resamples : int, default=20
+        Number of subsamples.
+    fraction : float, default=0.8
+        Share of the observations in every subsample.
+    n_init : int, default=10
+        K-means restarts of every fit.
+    random_state : int, numpy.random.SeedSequence, or None, default=None
+        Seed of the subsamples and of the fits.
+
+    Returns
+    -------
+    float
+        ``1 - ambiguous_fraction`` of the resampling consensus.
+    """
+    values = np.asarray(data, dtype=np.float64)
+    rng = np.random.default_rng(random_state)
+    n_samples = len(values)
+    size = max(n_clusters, int(round(fraction * n_samples)))
+    # label table of the resamples, -1 outside a subsample
+    clusters = np.full((n_samples, n_resamples), -1)
+    for resample in range(n_resamples):
+        members = rng.choice(n_samples, size=size, replace=False)
+        clusters[members, resample] = clustering.batched_kmeans(
+            values[members], n_clusters, n_init=n_init, random_state=_seed(rng)
+        )[1]
+    consensus = clustering.consensus_matrices(pd.DataFrame(clusters), n_clusters)[2]
+    return 1 - ambiguous_fraction(consensus)
+
+
+def _evaluate_subset(
+    subset: Any,
+    values: np.ndarray,
+    n_clusters: int,
+    options: dict[str, Any],
+    seeds: tuple[np.random.SeedSequence, np.random.SeedSequence],
+) -> list[dict[str, Any]]:
+    """Worker job: prediction strength and stability of one submatrix."""
+    strength_seed, stability_seed = seeds
+    strength, strength_sd = prediction_strength(
+        values,
+        n_clusters,
+        n_splits=options["n_splits"],
+        n_init=options["n_init"],
+        random_state=strength_seed,
+    )
+    stability = resampling_stability(
+        values,
+        n_clusters,
+        n_resamples=options["n_resamples"],
+        n_init=options["n_init"],
+        random_state=stability_seed,
+    )
+    return [
+        {
+            "subset": subset,
+            "k": n_clusters,
+            "metric": metric,
+            "value": value,
+            "sd": sd,
+        }
+        for metric, value, sd in (
+            ("prediction_strength", strength, strength_sd),
+            ("stability", stability, np.nan),
+        )
+    ]
+
+
+def _evaluate_consensus(
+    submatrices: Sequence[pd.DataFrame],
+    n_clusters: int,
+    options: dict[str, Any],
+    seed: np.random.SeedSequence,
+) -> list[dict[str, Any]]:
+    """Worker job: stability of the biclique consensus of one cluster count."""
+    result = pipeline.consensus_from_submatrices(
+        submatrices,
+        n_clusters,
+        n_init=options["n_init"],
+        random_state=int(seed.generate_state(1)[0]),
+        engine="batched",
+    )
+    return [
+        {
+            "subset": "consensus",
+            "k": n_clusters,
+            "metric": "stability",
+            "value": 1 - ambiguous_fraction(result["consensus"]),
+            "sd": np.nan,
+        }
+    ]
+
+
+def select_n_clusters(
+    submatrices: Sequence[pd.DataFrame],
+    cluster_counts: Iterable[int],
+    *,
+    n_references: int = 10,
+    n_splits: int = 10,
+    n_resamples: int = 20,
+    n_init: int = 10,
+    random_state: int | None = None,
+    include_consensus: bool = True,
+    max_workers: int | None = None,
+) -> pd.DataFrame:
+    """Evaluate cluster counts on every biclique and on their consensus.
+
+    For every submatrix and cluster count, the gap statistic, the prediction
+    strength, and the resampling stability are computed; for the consensus,
+    the stability of the consensus matrix built from all submatrices. Every
+    gap fit, of the data or of one reference, is one job on a process pool,
+    as are the other metrics of every (subset, cluster count) pair; each job
+    has its own child seed, so results do not depend on the number of
+    workers.
+
+    Parameters
+    ----------
+    submatrices : sequence of pandas.DataFrame
+        Complete, standardized submatrices, such as those returned by
+        ``preparation.import_bicliques``.
+    cluster_counts : iterable of int
+        Cluster counts to evaluate. Counts a submatrix is too small for are
+        skipped for that submatrix.
+    n_references, n_splits, n_resamples, n_init
+        See ``gap_statistic``, ``prediction_strength``, and
+        ``resampling_stability``.
+    random_state : int or None, default=None
+        Seed from which the seeds of all jobs are spawned.
+    include_consensus : bool, default=True
+        Whether to evaluate the consensus of all submatrices.
+    max_workers : int or None, default=None
+        Size of the process pool.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Tidy table with ``subset`` (submatrix position or ``"consensus"``),
+        ``k``, ``metric`` (``"gap"``, ``"prediction_strength"``, or
+        ``"stability"``), ``value``, and ``sd``.
+    """
+    cluster_counts = list(cluster_counts)
+    options = {
+        "n_splits": n_splits,
+        "n_resamples": n_resamples,
+        "n_init": n_init,
+    }
+    subsets = [
+        (position, values, k)
+        for position, values in enumerate(
+            submatrix.to_numpy(np.float64) for submatrix in submatrices
+        )
+        for k in cluster_counts
+        # prediction strength clusters halves of the observations
+        if k <= len(values) // 2
+    ]
+    seeds = np.random.SeedSequence(random_state).spawn(
+        len(subsets) + include_consensus * len(cluster_counts)
+    )
+    # gap, prediction strength, and stability seeds of every subset
+    subset_seeds = [seed.spawn(3) for seed in seeds[: len(subsets)]]
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        # every gap fit of the data and of its references is its own job
+        gap_futures = []
+        for (_, values, k), (gap_seed, *_) in zip(subsets, subset_seeds):
+            datasets, fit_seeds = _gap_datasets(values, n_references, gap_seed)
+            gap_futures.append(
+                [
+                    pool.submit(_log_inertia, dataset, k, n_init, fit_seed)
+                    for dataset, fit_seed in zip(datasets, fit_seeds)
+                ]
+            )
+        futures = [
+            pool.submit(_evaluate_subset, position, values, k, options, seed[1:])
+            for (position, values, k), seed in zip(subsets, subset_seeds)
+        ]
+        if include_consensus:
+            futures += [
+                pool.submit(_evaluate_consensus, list(submatrices), k, options, seed)
+                for k, seed in zip(cluster_counts, seeds[len(subsets) :])
+            ]
+
+        rows = []
+        for (position, _, k), fits in zip(subsets, gap_futures):
+            gap, sd = _gap([future.result() for future in fits])
+            rows.append(
+                {"subset": position, "k": k, "metric": "gap", "value": gap, "sd": sd}
+            )
+        rows += [row for future in futures for row in future.result()]
+    return pd.DataFrame(rows, columns=["subset", "k", "metric", "value", "sd"])
+
+
+def gap_choice(table: pd.DataFrame) -> pd.Series:
+    """Smallest K whose gap is within one deviation of the next K's gap.
+
+    Parameters
+    ----------
+    table : pandas.DataFrame
+        Result of ``select_n_clusters``.
+
+    Returns
+    -------
+    pandas.Series
+        Chosen cluster count of every subset with gap statistics, the
+        largest evaluated count when no count qualifies.
+    """
+    gaps = table[table["metric"] == "gap"].sort_values(["subset", "k"])
+    choices = {}
+    for subset, rows in gaps.groupby("subset", sort=False):
+        gap, sd, ks = (rows[column].to_numpy() for column in ("value", "sd", "k"))
+        qualifies = gap[:-1] >= gap[1:] - sd[1:]
+        choice = ks[np.argmax(qualifies)] if qualifies.any() else ks[-1]
+        choices[subset] = int(choice)
+    return pd.Series(choices, name="k")
@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from typing import Any
+
+import numpy as np
+import pandas as pd
+from scipy.sparse import csr_matrix
+
+Biclique = tuple[np.ndarray, np.ndarray]
+
+
+def incidence_matrices(
+    bicliques: Sequence[Biclique],
+    shape: tuple[int, int] | None = None,
+) -> tuple[csr_matrix, csr_matrix]:
+    """Build sparse biclique-by-row and biclique-by-column incidence matrices.
+
+    Parameters
+    ----------
+    bicliques : sequence of tuple of numpy.ndarray
+        Row positions and column positions of every biclique, as returned by
+        ``preparation.read_bicliques``.
+    shape : tuple of int or None, default=None
+        Number of rows and columns of the full matrix. When ``None``, the
+        largest positions found in ``bicliques`` are used.
+
+    Returns
+    -------
+    rows, columns : scipy.sparse.csr_matrix
+        Binary matrices with one row per biclique.
+    """
+    if shape is None:
+        shape = (
+            max((rows.max() + 1 for rows, _ in bicliques if len(rows)), default=0),
+            max((cols.max() + 1 for _, cols in bicliques if len(cols)), default=0),
+        )
+
+    def incidence(positions: list[np.ndarray], width: int) -> csr_matrix:
+        lengths = np.array([len(p) for p in positions])
+        indptr = np.concatenate([[0], np.cumsum(lengths)])
+        indices = np.concatenate(positions) if positions else np.array([], int)
+        return csr_matrix(
+            (np.ones(len(indices)), indices, indptr),
+            shape=(len(positions), width),
+        )
+
+    return (
+        incidence([rows for rows, _ in bicliques], shape[0]),
+        incidence([cols for _, cols in bicliques], shape[1]),
+    )
+
+
+def biclique_overlap(
+    bicliques: Sequence[Biclique],
+) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """Compute row, column, and cell Jaccard similarities of all biclique pairs.
+
+    Shared rows and columns of every pair come from two sparse products of
+    the incidence matrices. Two bicliques share exactly the cells at their
+    shared rows and shared columns, so cell overlaps follow from these counts
+    without building any submatrix.
+
+    Parameters
+    ----------
+    bicliques : sequence of tuple of numpy.ndarray
+        Row positions and column positions of every biclique.
+
+    Returns
+    -------
+    rows, columns, cells : pandas.DataFrame
+        Jaccard similarity of the row sets, the column sets, and the cell
+        sets of every biclique pair, indexed by biclique position.
+    """
+    row_incidence, col_incidence = incidence_matrices(bicliques)
+    shared_rows = (row_incidence @ row_incidence.T).toarray()
+    shared_cols = (col_incidence @ col_incidence.T).toarray()
+    n_rows = np.diag(shared_rows)
+    n_cols = np.diag(shared_cols)
+
+    def jaccard(shared: np.ndarray, sizes: np.ndarray) -> pd.DataFrame:
+        union = sizes[:, None] + sizes[None, :] - shared
+        with np.errstate(divide="ignore", invalid="ignore"):
+            similarity = np.where(union > 0, shared / union, 0.0)
+        return pd.DataFrame(similarity)
+
+    return (
+        jaccard(shared_rows, n_rows),
+        jaccard(shared_cols, n_cols),
+        jaccard(shared_rows * shared_cols, n_rows * n_cols),
+    )
+
+
+def _coverage(
+    bicliques: Sequence[Biclique],
+    shape: tuple[int, int],
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Rows, columns, and cells covered by at least one biclique."""
+    row_incidence, col_incidence = incidence_matrices(bicliques, shape)
+    cells = (row_incidence.T @ col_incidence).toarray() > 0
+    return (
+        np.asarray(row_incidence.sum(axis=0)).ravel() > 0,
+        np.asarray(col_incidence.sum(axis=0)).ravel() > 0,
+        cells,
+    )
+
+
+def _merge(representative: Biclique, member: Biclique) -> Biclique:
+    """Grow a biclique with a similar one while keeping it complete.
+
+    Shared columns are observed on the rows of both bicliques and shared
+    rows on the columns of both, so either combination is complete; the
+    larger one is kept if it adds cells.
+    """
+    rows, cols = representative
+    member_rows, member_cols = member
+    candidates = [
+        (np.union1d(rows, member_rows), np.intersect1d(cols, member_cols)),
+        (np.intersect1d(rows, member_rows), np.union1d(cols, member_cols)),
+    ]
+    merged = max(candidates, key=lambda b: len(b[0]) * len(b[1]))
+    if len(merged[0]) * len(merged[1]) > len(rows) * len(cols):
+        return merged
+    return representative
+
+
+def deduplicate_bicliques(
+    bicliques: Sequence[Biclique],
+    threshold: float = 0.9,
+    *,
+    similarity: str = "cells",
+    merge: bool = False,
+) -> tuple[list[Biclique], dict[str, Any]]:
+    """Drop or merge bicliques that nearly repeat a larger one.
+
+    Bicliques are visited from the largest to the smallest number of cells.
+    One whose similarity to an already kept biclique reaches ``threshold``
+    joins the group of the most similar kept biclique instead of being
+    kept.
+
+    Parameters
+    ----------
+    bicliques : sequence of tuple of numpy.ndarray
+        Row positions and column positions of every biclique.
+    threshold : float, default=0.9
+        Jaccard similarity from which two bicliques are duplicates.
+    similarity : {"cells", "rows", "columns"}, default="cells"
+        Similarity compared to ``threshold``, see ``biclique_overlap``.
+    merge : bool, default=False
+        Whether every kept biclique absorbs the rows or columns of its
+        duplicates when the result stays complete and has more cells.
+        Otherwise duplicates are dropped.
+
+    Returns
+    -------
+    kept : list of tuple of numpy.ndarray
+        Remaining bicliques, in their original order.
+    report : dict
+        ``n_bicliques`` and ``n_kept``; ``cells`` and ``cells_kept``, the
+        summed submatrix sizes that k-means is run on, and ``work_saved``,
+        the fraction of them avoided; ``row_coverage``, ``column_coverage``,
+        and ``cell_coverage``, the fractions of the rows, columns, and cells
+        covered by the input that are still covered; and ``groups``, the
+        input positions represented by every kept position.
+    """
+    kinds = {"rows": 0, "columns": 1, "cells": 2}
+    if similarity not in kinds:
+        raise ValueError(f"Unknown similarity: {similarity!r}.")
+    bicliques = list(bicliques)
+    scores = biclique_overlap(bicliques)[kinds[similarity]].to_numpy()
+    sizes = np.array([len(rows) * len(cols) for rows, cols in bicliques])
+
+    groups: dict[int, list[int]] = {}
+    for position in np.argsort(-sizes, kind="stable"):
+        representatives = list(groups)
+        if representatives:
+            closest = representatives[np.argmax(scores[position, representatives])]
+            if scores[position, closest] >= threshold:
+                groups[closest].append(int(position))
+                continue
+        groups[int(position)] = [int(position)]
+
+    kept = []
+    for representative in sorted(groups):
+        biclique = bicliques[representative]
+        if merge:
+            for member in groups[representative][1:]:
+                biclique = _merge(biclique, bicliques[member])
+        kept.append(biclique)
+
+    row_incidence, col_incidence = incidence_matrices(bicliques)
+    shape = (row_incidence.shape[1], col_incidence.shape[1])
+    before = _coverage(bicliques, shape)
+    after = _coverage(kept, shape)
+    cells = int(sizes.sum())
+    cells_kept = int(sum(len(rows) * len(cols) for rows, cols in kept))
+    report = {
+        "n_bicliques": len(bicliques),
+        "n_kept": len(kept),
+        "cells": cells,
+        "cells_kept": cells_kept,
+        "work_saved": 1 - cells_kept / cells if cells else 0.0,
+        "row_coverage": float(after[0].sum() / before[0].sum()),
+        "column_coverage": float(after[1].sum() / before[1].sum()),
+        "cell_coverage": float(after[2].sum() / before[2].sum()),
+        "groups": {
+            representative: members
+            for representative, members in sorted(groups.items())
+        },
+    }
+    return kept, report
@@ -0,0 +1,451 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+from concurrent.futures import Executor, ProcessPoolExecutor
+from os import PathLike
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+from scipy.stats import mode
+
+import clustering
+import preparation
+from caching import ResultStore
+from overlap import incidence_matrices
+
+
+def consensus_from_submatrices(
+    submatrices: Sequence[pd.DataFrame],
+    n_clusters: int,
+    *,
+    n_init: int | str | None = 100,
+    random_state: int | None = 42,
+    engine: str = "sklearn",
+    dtype: npt.DTypeLike | None = None,
+    cache: ResultStore | None = None,
+) -> dict[str, Any]:
+    """Cluster every submatrix and combine the results into a consensus.
+
+    Parameters
+    ----------
+    submatrices : sequence of pandas.DataFrame
+        Complete, standardized submatrices.
+    n_clusters : int
+        Number of clusters of every submatrix clustering and of the final
+        agglomerative clustering.
+    n_init, random_state, engine, dtype, cache
+        Passed to ``clustering.fit_kmeans_by_submatrix``. ``dtype`` also sets
+        the type of the consensus matrix.
+
+    Returns
+    -------
+    dict
+        ``models`` and ``labels`` keyed by submatrix position, the padded
+        ``clusters`` table with a ``final`` column, and the ``coobserved``,
+        ``coclustered``, and ``consensus`` matrices.
+    """
+    models, labels = clustering.fit_kmeans_by_submatrix(
+        submatrices,
+        n_clusters,
+        n_init=n_init,
+        random_state=random_state,
+        cache=cache,
+        engine=engine,
+        dtype=dtype,
+    )
+    clusters = clustering.biclique_label_matrix(submatrices, labels)
+    coobserved, coclustered, consensus = clustering.consensus_matrices(
+        clusters,
+        n_clusters,
+        dtype=np.float64 if dtype is None else dtype,
+    )
+    clusters["final"] = clustering.consensus_clustering(consensus, n_clusters)
+    return {
+        "models": models,
+        "labels": labels,
+        "clusters": clusters,
+        "coobserved": coobserved,
+        "coclustered": coclustered,
+        "consensus": consensus,
+    }
+
+
+def run_consensus(
+    processed_data_file: str | PathLike[str],
+    bicliques_file: str | PathLike[str],
+    n_clusters: int,
+    **options: Any,
+) -> dict[str, Any]:
+    """Run the consensus pipeline of one wave from its processed files.
+
+    Parameters
+    ----------
+    processed_data_file : str or path-like
+        Parquet file containing the country-by-indicator matrix.
+    bicliques_file : str or path-like
+        CSV file describing the complete submatrices.
+    n_clusters : int
+        Number of clusters.
+    **options
+        Passed to ``consensus_from_submatrices``.
+
+    Returns
+    -------
+    dict
+        Result of ``consensus_from_submatrices`` extended with the
+        standardized ``data``, its ``submatrices``, and the unstandardized
+        ``raw_data`` that ``update_consensus`` compares revisions with.
+    """
+    data, submatrices = preparation.import_bicliques(
+        processed_data_file,
+        bicliques_file,
+        standardized=True,
+        dtype=options.get("dtype"),
+    )
+    result = consensus_from_submatrices(submatrices, n_clusters, **options)
+    result["data"] = data
+    result["submatrices"] = submatrices
+    result["raw_data"] = preparation.load_matrix(
+        processed_data_file, options.get("dtype")
+    )
+    return result
+
+
+def diff_matrices(old: pd.DataFrame, new: pd.DataFrame) -> pd.DataFrame:
+    """List the cells that differ between two versions of a feature matrix.
+
+    Parameters
+    ----------
+    old, new : pandas.DataFrame
+        Previous and revised matrices with the same countries and
+        indicators, zeros already treated as missing.
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per changed cell with its ``country_id``, ``series_id``,
+        ``old`` and ``new`` values, and ``change``: ``"value"`` for a
+        corrected value, ``"appeared"`` or ``"disappeared"`` when the cell
+        became available or missing.
+
+    Raises
+    ------
+    ValueError
+        If the countries or indicators differ.
+    """
+    if not (old.index.equals(new.index) and old.columns.equals(new.columns)):
+        raise ValueError("Matrices differ in countries or indicators.")
+    before = old.to_numpy(np.float64)
+    after = new.to_numpy(np.float64)
+    missing_before = np.isnan(before)
+    missing_after = np.isnan(after)
+    changed = (missing_before != missing_after) | (
+        ~missing_before & ~missing_after & (before != after)
+    )
+
+    rows, cols = np.nonzero(changed)
+    change = np.select(
+        [missing_before[rows, cols], missing_after[rows, cols]],
+        ["appeared", "disappeared"],
+        default="value",
+    )
+    return pd.DataFrame(
+        {
+            "country_id": old.index[rows],
+            "series_id": old.columns[cols],
+            "old": before[rows, cols],
+            "new": after[rows, cols],
+            "change": change,
+        }
+    )
+
+
+def update_consensus(
+    previous: dict[str, Any],
+    processed_data_file: str | PathLike[str],
+    n_clusters: int,
+    **options: Any,
+) -> dict[str, Any]:
+    """Bring a consensus run up to date with a revised feature matrix.
+
+    The revised matrix is compared cell by cell with ``previous["raw_data"]``.
+    The bicliques are those of ``previous["submatrices"]``. A biclique in
+    which values disappeared is pruned so that it stays complete: its
+    indicators with missing values are left out, or, when every indicator
+    is affected, its countries with missing values; it is dropped when fewer
+    than ``n_clusters`` countries remain. Standardization parameters are
+    fitted per indicator, so a change anywhere in an indicator alters every
+    biclique using it. Only pruned bicliques and bicliques using a changed
+    indicator are re-extracted and re-clustered. The consensus counts are
+    patched by subtracting the previous contributions of these bicliques
+    and adding the new ones. The final clustering is then recomputed and
+    aligned with the previous final labels. Countries left in no biclique
+    are excluded from the result and reported.
+
+    Parameters
+    ----------
+    previous : dict
+        Result of ``run_consensus`` or of an earlier ``update_consensus``.
+    processed_data_file : str or path-like
+        Parquet file containing the revised country-by-indicator matrix.
+    n_clusters : int
+        Number of clusters of the previous run.
+    **options
+        Passed to ``consensus_from_submatrices``; use the options of the
+        previous run.
+
+    Returns
+    -------
+    dict
+        Result with the same keys as ``run_consensus``, bicliques renumbered
+        after dropped ones, plus ``changes``, the table of
+        ``diff_matrices``; the previous positions of the ``reclustered``
+        bicliques, of the ``pruned`` ones among them, and of the ``dropped``
+        ones; and the ``uncovered`` countries excluded from the result.
+
+    Raises
+    ------
+    ValueError
+        If the revision adds or removes countries or indicators, or if
+        pruning leaves countries that no longer share a biclique; run
+        ``run_consensus`` again in that case.
+    """
+    dtype = options.get("dtype")
+    raw = preparation.load_matrix(processed_data_file, dtype)
+    changes = diff_matrices(previous["raw_data"], raw)
+    mean, scale = preparation.standardization_parameters(processed_data_file)
+    if dtype is not None:
+        mean, scale = mean.astype(dtype), scale.astype(dtype)
+    data = preparation.standardize(raw, mean, scale)
+
+    bicliques = [
+        (raw.index.get_indexer(sub.index), raw.columns.get_indexer(sub.columns))
+        for sub in previous["submatrices"]
+    ]
+    # prune bicliques in which values disappeared so that they stay complete
+    missing = raw.isna().to_numpy()
+    _, col_incidence = incidence_matrices(bicliques, raw.shape)
+    lost_columns = raw.columns.isin(
+        changes.loc[changes["change"] == "disappeared", "series_id"]
+    ).astype(np.float64)
+    pruned, dropped = [], []
+    for position in np.flatnonzero(col_incidence @ lost_columns > 0):
+        rows, cols = bicliques[position]
+        block = missing[np.ix_(rows, cols)]
+        if not block.any():
+            continue
+        complete_columns = ~block.any(axis=0)
+        if complete_columns.any():
+            # leaving indicators out keeps every country of the biclique
+            cols = cols[complete_columns]
+        else:
+            rows = rows[~block.any(axis=1)]
+        bicliques[position] = (rows, cols)
+        (pruned if len(rows) >= n_clusters else dropped).append(position)
+    pruned, dropped = np.array(pruned, dtype=int), np.array(dropped, dtype=int)
+
+    _, col_incidence = incidence_matrices(bicliques, raw.shape)
+    changed_columns = raw.columns.isin(changes["series_id"]).astype(np.float64)
+    reclustered = np.setdiff1d(
+        np.union1d(np.flatnonzero(col_incidence @ changed_columns > 0), pruned),
+        dropped,
+    )
+
+    # contributions of the bicliques that change
+    clusters = previous["clusters"].drop(columns="final")
+    old_coobserved, old_coclustered, _ = clustering.consensus_matrices(
+        clusters.iloc[:, np.union1d(reclustered, dropped)], n_clusters
+    )
+    submatrices = list(previous["submatrices"])
+    labels = dict(previous["labels"])
+    models = dict(previous["models"])
+    for position in reclustered:
+        rows, cols = bicliques[position]
+        submatrices[position] = data.iloc[rows, cols]
+    new_models, new_labels = clustering.fit_kmeans_by_submatrix(
+        [submatrices[position] for position in reclustered],
+        n_clusters,
+        n_init=options.get("n_init", 100),
+        random_state=options.get("random_state", 42),
+        cache=options.get("cache"),
+        engine=options.get("engine", "sklearn"),
+        dtype=dtype,
+    )
+    for offset, position in enumerate(reclustered):
+        models[position] = new_models[offset]
+        labels[position] = new_labels[offset]
+        # pruned bicliques no longer label the countries they left
+        clusters[position] = -1
+        clusters.loc[submatrices[position].index, position] = new_labels[offset]
+    new_coobserved, new_coclustered, _ = clustering.consensus_matrices(
+        clusters.iloc[:, reclustered], n_clusters
+    )
+
+    # dropped bicliques leave the tables and the positions are renumbered
+    kept = np.setdiff1d(np.arange(len(bicliques)), dropped)
+    clusters = clusters[kept]
+    clusters.columns = range(len(kept))
+    covered = (clusters >= 0).any(axis=1).to_numpy()
+    uncovered = clusters.index[~covered]
+    clusters = clusters[covered]
+
+    coobserved = (
+        previous["coobserved"] - old_coobserved + new_coobserved
+    ).to_numpy()[np.ix_(covered, covered)]
+    coclustered = (
+        previous["coclustered"] - old_coclustered + new_coclustered
+    ).to_numpy()[np.ix_(covered, covered)]
+    if (coobserved == 0).any():
+        raise ValueError(
+            "Some countries no longer share a biclique after pruning; "
+            "run run_consensus with revised bicliques."
+        )
+    consensus_dtype = np.float64 if dtype is None else dtype
+    consensus = np.divide(coclustered, coobserved, dtype=consensus_dtype)
+
+    final = clustering.consensus_clustering(consensus, n_clusters)
+    mapping = clustering.find_label_alignment(
+        previous["clusters"]["final"].to_numpy()[covered], final, n_clusters
+    )
+    clusters["final"] = clustering.relabel(final, mapping)
+
+    def frame(matrix: np.ndarray) -> pd.DataFrame:
+        return pd.DataFrame(matrix, index=clusters.index, columns=clusters.index)
+
+    return {
+        "models": {new: models[old] for new, old in enumerate(kept)},
+        "labels": {new: labels[old] for new, old in enumerate(kept)},
+        "clusters": clusters,
+        "coobserved": frame(coobserved),
+        "coclustered": frame(coclustered),
+        "consensus": frame(consensus),
+        "data": data,
+        "submatrices": [submatrices[position] for position in kept],
+        "raw_data": raw,
+        "changes": changes,
+        "reclustered": reclustered,
+        "pruned": pruned,
+        "dropped": dropped,
+        "uncovered": uncovered,
+    }
+
+
+def _final_labels(
+    submatrices: Sequence[pd.DataFrame],
+    n_clusters: int,
+    options: dict[str, Any],
+) -> pd.Series:
+    """Worker job of the panel: final consensus labels of one run."""
+    return consensus_from_submatrices(submatrices, n_clusters, **options)[
+        "clusters"
+    ]["final"]
+
+
+def run_panel_consensus(
+    waves: Iterable[int],
+    processed_data_folder: str | PathLike[str],
+    n_clusters: int,
+    *,
+    random_states: Sequence[int] = (42,),
+    max_workers: int | None = None,
+    executor: Executor | None = None,
+    **options: Any,
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Run the consensus pipeline for several waves and track countries.
+
+    Every wave is loaded once and its consensus is computed for every seed in
+    ``random_states``; all (wave, seed) runs share one worker pool. Runs of a
+    wave are aligned to its first run and summarized by the most frequent
+    label. Waves are then aligned in order, each to the previous wave on the
+    countries they share, so a country keeping its label keeps its group.
+
+    Parameters
+    ----------
+    waves : iterable of int
+        Findex waves, in trajectory order.
+    processed_data_folder : str or path-like
+        Folder with ``base_values_wave_N.parquet`` and
+        ``bicliques_wave_N.csv`` files.
+    n_clusters : int
+        Number of clusters of every wave.
+    random_states : sequence of int, default=(42,)
+        Seeds of the repeated runs of every wave.
+    max_workers : int or None, default=None
+        Size of the process pool created when ``executor`` is ``None``.
+    executor : concurrent.futures.Executor or None, default=None
+        Pool to submit runs to, for sharing workers with other jobs.
+    **options
+        Passed to ``consensus_from_submatrices``. ``random_state`` is taken
+        from ``random_states``.
+
+    Returns
+    -------
+    trajectories : pandas.DataFrame
+        Aligned final label of every country (rows, union over waves) in
+        every wave (columns); ``<NA>`` where a country is absent.
+    runs : pandas.DataFrame
+        Aligned final labels of every run, with (wave, seed) columns.
+    """
+    folder = Path(processed_data_folder)
+    waves = list(waves)
+    submatrices = {
+        wave: preparation.import_bicliques(
+            folder / f"base_values_wave_{wave}.parquet",
+            folder / f"bicliques_wave_{wave}.csv",
+            standardized=True,
+            dtype=options.get("dtype"),
+        )[1]
+        for wave in waves
+    }
+    options.pop("random_state", None)
+
+    pool = executor or ProcessPoolExecutor(max_workers=max_workers)
+    try:
+        futures = {
+            (wave, seed): pool.submit(
+                _final_labels,
+                submatrices[wave],
+                n_clusters,
+                {**options, "random_state": seed},
+            )
+            for wave in waves
+            for seed in random_states
+        }
+        run_labels = {key: future.result() for key, future in futures.items()}
+    finally:
+        if executor is None:
+            pool.shutdown()
+
+    # shared country index, missing countries are labeled -1
+    countries = pd.Index(
+        sorted(set().union(*(labels.index for labels in run_labels.values())))
+    )
+    runs = pd.DataFrame(
+        {
+            key: labels.reindex(countries, fill_value=-1)
+            for key, labels in run_labels.items()
+        },
+        index=countries,
+    )
+    runs.columns = pd.MultiIndex.from_tuples(runs.columns, names=["wave", "seed"])
+
+    trajectories = pd.DataFrame(-1, index=countries, columns=waves)
+    previous: np.ndarray | None = None
+    for wave in waves:
+        aligned = clustering.align_labels(runs[wave].to_numpy().T)
+        summary = mode(aligned, axis=0, keepdims=False).mode
+        if previous is not None:
+            # countries absent from either wave do not vote
+            mapping = clustering.find_label_alignment(previous, summary)
+            aligned = clustering.relabel(aligned, mapping)
+            summary = clustering.relabel(summary, mapping)
+        runs[wave] = aligned.T
+        trajectories[wave] = summary
+        previous = summary
+
+    trajectories = trajectories.where(trajectories >= 0).astype("Int64")
+    trajectories.columns.name = "wave"
+    return trajectories, runs
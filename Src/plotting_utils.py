@@ -12,8 +12,11 @@ import pandas as pd
 
 import geopandas as gpd
 
+from functools import lru_cache
 from pathlib import Path
 
+import countries
+
 # CURVE_COLOR = '#246A73'
 GRID_COLOR = '#D2CCC3'
 MAP_BCKGND_COLOR = 'ghostwhite'
@@ -113,6 +116,41 @@ def pretty_plot(
 
     return ax
 
+@lru_cache(maxsize=4)
+def load_world(projection: str = "ESRI:54048") -> gpd.GeoDataFrame:
+    """Load the projected Natural Earth 1:10m countries without Antarctica.
+
+    The result is cached per projection; copy it before modifying it.
+
+    Parameters
+    ----------
+    projection : str, default="ESRI:54048"
+        Coordinate reference system of the returned geometries.
+
+    Returns
+    -------
+    geopandas.GeoDataFrame
+        Country geometries and attributes.
+    """
+    #world_file = '../data/raw/geodata/ne_10m_admin_0_countries.zip'
+    world_file = (
+        Path(__file__).resolve().parent.parent
+        / "Data"
+        / "Raw"
+        / "geodatasets"
+        / "ne_10m_admin_0_countries.zip"
+    )
+
+    # import world data to draw countries
+    world = gpd.read_file(world_file)
+    assert not world.empty
+    
+    # drop Antarctica
+    world = world[world["CONTINENT"] != "Antarctica"].copy()
+
+    # choose a projection
+    return world.to_crs(projection)
+
 def plot_cluster_map(
     ax: Axes,
     cluster_series: pd.Series,
@@ -121,7 +159,9 @@ def plot_cluster_map(
     projection: str = "ESRI:54048",
     title: str | None = None,
     legend_orientation: str  = 'vertical', # horizontal or vertical
-    save_file_name: str | Path | None = None
+    save_file_name: str | Path | None = None,
+    crosswalk: pd.DataFrame | None = None,
+    data360_areas: pd.DataFrame | None = None,
 ) -> Axes:
     """
     Plot a world choropleth map of categorical cluster assignments.
@@ -158,6 +198,16 @@ def plot_cluster_map(
     save_file_name : str, pathlib.Path, or None, default=None
         Requested output path. Retained for compatibility and currently unused.
 
+    crosswalk : pandas.DataFrame or None, default=None
+        Country crosswalk from ``countries.load_crosswalk``. When ``None``,
+        the persisted crosswalk is read, and only built from the codes of
+        ``cluster_series`` and the map when it lacks any of them.
+
+    data360_areas : pandas.DataFrame or None, default=None
+        Data360 country names from ``data360.load_data360_areas``, used
+        when the crosswalk is built to match codes missing from the map by
+        name.
+
     Returns
     -------
     matplotlib.axes.Axes
@@ -187,27 +237,19 @@ def plot_cluster_map(
         f"Clusters in labels and palette not equal"
     )
 
-    #world_file = '../data/raw/geodata/ne_10m_admin_0_countries.zip'
-    world_file = (
-        Path(__file__).resolve().parent.parent
-        / "Data"
-        / "Raw"
-        / "geodatasets"
-        / "ne_10m_admin_0_countries.zip"
-    )
-
-    # import world data to draw countries
-    world = gpd.read_file(world_file)
-    assert not world.empty
-    
-    # drop Antarctica
-    world = world[world["CONTINENT"] != "Antarctica"].copy()
-
-    # choose a projection
-    world = world.to_crs(projection)
+    # the projected map is read once per process
+    world = load_world(projection).copy()
 
     # prepare dataframe for plotting
-    world["_cluster"] = world["SOV_A3"].map(cluster_series)
+    # SOV_A3 differs from ISO3 for some countries (FR1 for France),
+    # the crosswalk maps Findex codes to ADM0_A3
+    if crosswalk is None:
+        crosswalk = countries.load_crosswalk(
+            codes=cluster_series.index, world=world, data360_areas=data360_areas
+        )
+    world["_cluster"] = world["ADM0_A3"].map(
+        countries.translate(cluster_series, crosswalk)
+    )
 
     cmap = ListedColormap(
         [palette[c] for c in categories]
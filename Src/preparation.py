@@ -1,19 +1,290 @@
 from __future__ import annotations
 
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from os import PathLike
+from pathlib import Path
+from threading import RLock
+from time import perf_counter
+from typing import Any
 
 import pandas as pd
 import numpy as np
+import numpy.typing as npt
 
 from sklearn.preprocessing import StandardScaler
 
+from overlap import deduplicate_bicliques
+
+# loaded files keyed by (kind, resolved paths)
+# every entry keeps the modification times it was built from
+_import_cache: dict[tuple[str, ...], tuple[tuple[int, ...], Any]] = {}
+_import_cache_lock = RLock()
+
+
+def _cached(
+    kind: str,
+    files: tuple[str | PathLike[str], ...],
+    loader: Callable[..., Any],
+) -> Any:
+    """Return a cached value built from ``files``, rebuilding stale entries.
+
+    An entry is stale when the modification time of any of its files differs
+    from the one recorded when the entry was built.
+    """
+    paths = tuple(Path(file).resolve() for file in files)
+    mtimes = tuple(path.stat().st_mtime_ns for path in paths)
+    key = (kind, *map(str, paths))
+    with _import_cache_lock:
+        entry = _import_cache.get(key)
+        if entry is not None and entry[0] == mtimes:
+            return entry[1]
+    value = loader(*paths)
+    with _import_cache_lock:
+        _import_cache[key] = (mtimes, value)
+    return value
+
+
+def _parse_bicliques(bicliques_file: Path) -> list[tuple[np.ndarray, np.ndarray]]:
+    bicliques = pd.read_csv(bicliques_file, index_col=0)
+
+    # bicliques are written in the file as strings separated with whitespace, with occasional \n
+    bicliques['found_rows'] = bicliques['found_rows'].map(
+        lambda s: np.fromstring(s.strip("[ ]").replace('\n', ''), sep=' ', dtype=int)
+    )
+    bicliques['found_cols'] = bicliques['found_cols'].map(
+        lambda s: np.fromstring(s.strip("[ ]").replace('\n', ''), sep=' ', dtype=int)
+    )
+    return list(zip(bicliques['found_rows'], bicliques['found_cols']))
+
+
+def _read_matrix(
+    processed_data_file: Path,
+    dtype: np.dtype | None,
+) -> dict[str, Any]:
+    data = pd.read_parquet(processed_data_file)
+    # parameters are fitted on the stored precision and then cast
+    scaler = StandardScaler().fit(data)
+    mean = pd.Series(scaler.mean_, index=data.columns)
+    scale = pd.Series(scaler.scale_, index=data.columns)
+    if dtype is not None:
+        data = data.astype(dtype)
+        mean = mean.astype(dtype)
+        scale = scale.astype(dtype)
+    return {"data": data, "mean": mean, "scale": scale}
+
+
+def _matrix(
+    processed_data_file: str | PathLike[str],
+    dtype: npt.DTypeLike | None,
+) -> dict[str, Any]:
+    dtype = None if dtype is None else np.dtype(dtype)
+    return _cached(
+        f"matrix[{dtype}]",
+        (processed_data_file,),
+        partial(_read_matrix, dtype=dtype),
+    )
+
+
+def _extract_views(
+    processed_data_file: Path,
+    bicliques_file: Path,
+    dtype: npt.DTypeLike | None,
+) -> dict[str, list[pd.DataFrame]]:
+    matrix = _matrix(processed_data_file, dtype)
+    bicliques = read_bicliques(bicliques_file)
+    data = matrix["data"]
+    data_std = standardize(data, matrix["mean"], matrix["scale"])
+
+    complete_data = [data.iloc[rows, cols] for rows, cols in bicliques]
+    if not all(df.notna().all().all() for df in complete_data):
+        raise ValueError("Bicliques contain missing elements")
+
+    return {
+        "raw": complete_data,
+        "standardized": [data_std.iloc[rows, cols] for rows, cols in bicliques],
+        "data_std": data_std,
+    }
+
+
+def read_bicliques(
+    bicliques_file: str | PathLike[str],
+) -> list[tuple[np.ndarray, np.ndarray]]:
+    """Read the row and column positions of complete submatrices.
+
+    The file is parsed once per process and modification; later calls return
+    the cached positions.
+
+    Parameters
+    ----------
+    bicliques_file : str or path-like
+        CSV file containing serialized row and column index arrays for complete
+        submatrices.
+
+    Returns
+    -------
+    list of tuple of numpy.ndarray
+        Row positions and column positions of every biclique, in file order.
+    """
+    return list(_cached("bicliques", (bicliques_file,), _parse_bicliques))
+
+
+def standardize(
+    data: pd.DataFrame,
+    mean: pd.Series,
+    scale: pd.Series,
+) -> pd.DataFrame:
+    """Apply stored standardization parameters to a feature matrix.
+
+    Parameters
+    ----------
+    data : pandas.DataFrame
+        Feature matrix whose columns are a subset of the parameters' index.
+    mean, scale : pandas.Series
+        Per-feature mean and scale, as fitted by
+        ``sklearn.preprocessing.StandardScaler``.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Standardized copy of ``data``.
+    """
+    return (data - mean[data.columns]) / scale[data.columns]
+
+
+def load_matrix(
+    processed_data_file: str | PathLike[str],
+    dtype: npt.DTypeLike | None = None,
+) -> pd.DataFrame:
+    """Load a processed feature matrix through the import cache.
+
+    Parameters
+    ----------
+    processed_data_file : str or path-like
+        Parquet file containing the country-by-indicator matrix, including its
+        missing values.
+    dtype : data-type or None, default=None
+        Floating-point type of the returned values, see ``import_bicliques``.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Copy of the loaded feature matrix.
+    """
+    return _matrix(processed_data_file, dtype)["data"].copy()
+
+
+def standardization_parameters(
+    processed_data_file: str | PathLike[str],
+) -> tuple[pd.Series, pd.Series]:
+    """Return the per-feature mean and scale used by standardized imports.
+
+    The parameters are fitted once per file on all observed values, missing
+    values ignored, exactly as ``StandardScaler`` fits them.
+
+    Parameters
+    ----------
+    processed_data_file : str or path-like
+        Parquet file containing the country-by-indicator matrix.
+
+    Returns
+    -------
+    mean, scale : pandas.Series
+        Per-feature mean and scale indexed by indicator.
+    """
+    matrix = _matrix(processed_data_file, None)
+    return matrix["mean"].copy(), matrix["scale"].copy()
+
+
+def clear_import_cache(file: str | PathLike[str] | None = None) -> int:
+    """Invalidate cached imports.
+
+    Parameters
+    ----------
+    file : str, path-like, or None, default=None
+        Only entries built from this file are removed. When ``None``, the
+        whole cache is cleared.
+
+    Returns
+    -------
+    int
+        Number of removed entries.
+    """
+    with _import_cache_lock:
+        if file is None:
+            removed = len(_import_cache)
+            _import_cache.clear()
+            return removed
+        path = str(Path(file).resolve())
+        stale = [key for key in _import_cache if path in key[1:]]
+        for key in stale:
+            del _import_cache[key]
+        return len(stale)
+
+
+def import_biclique_views(
+    processed_data_file: str | PathLike[str],
+    bicliques_file: str | PathLike[str],
+    dtype: npt.DTypeLike | None = None,
+) -> tuple[pd.DataFrame, list[pd.DataFrame], pd.DataFrame, list[pd.DataFrame]]:
+    """Load raw and standardized views of a feature matrix from one read.
+
+    Parameters
+    ----------
+    processed_data_file : str or path-like
+        Parquet file containing the country-by-indicator matrix, including its
+        missing values.
+
+    bicliques_file : str or path-like
+        CSV file containing serialized row and column index arrays for complete
+        submatrices.
+
+    dtype : data-type or None, default=None
+        Floating-point type of the returned values, see ``import_bicliques``.
+
+    Returns
+    -------
+    data : pandas.DataFrame
+        Loaded feature matrix.
+
+    complete_data : list of pandas.DataFrame
+        Complete submatrices of ``data``.
+
+    data_std : pandas.DataFrame
+        Standardized feature matrix.
+
+    complete_data_std : list of pandas.DataFrame
+        Complete submatrices of ``data_std``.
+
+    Raises
+    ------
+    ValueError
+        If any extracted submatrix contains a missing value.
+    """
+    data, complete_data = import_bicliques(
+        processed_data_file, bicliques_file, dtype=dtype
+    )
+    data_std, complete_data_std = import_bicliques(
+        processed_data_file, bicliques_file, standardized=True, dtype=dtype
+    )
+    return data, complete_data, data_std, complete_data_std
+
+
 def import_bicliques(
     processed_data_file: str | PathLike[str],
     bicliques_file: str | PathLike[str],
     standardized: bool = False,
+    dtype: npt.DTypeLike | None = None,
+    deduplicate: float | None = None,
+    merge: bool = False,
 ) -> tuple[pd.DataFrame, list[pd.DataFrame]]:
     """Load a processed feature matrix and extract its complete submatrices.
 
+    Files are read and submatrices are extracted once per process; repeated
+    calls, raw or standardized, are served from a cache that is refreshed when
+    either file is modified and can be emptied with ``clear_import_cache``.
+
     Parameters
     ----------
     processed_data_file : str or path-like
@@ -27,6 +298,23 @@ def import_bicliques(
     standardized : bool, default=False
         Whether to standardize every feature before extracting submatrices.
 
+    dtype : data-type or None, default=None
+        Floating-point type of the returned values. ``numpy.float32`` halves
+        memory; Findex percentages carry far fewer significant digits than it
+        resolves. Standardization parameters are fitted on the stored values
+        before casting. When ``None``, the stored type is kept.
+
+    deduplicate : float or None, default=None
+        Cell Jaccard similarity from which a biclique counts as a duplicate
+        of a larger one and is left out, see
+        ``overlap.deduplicate_bicliques``. When ``None``, every biclique is
+        extracted.
+
+    merge : bool, default=False
+        Whether kept bicliques absorb the rows or columns of their
+        duplicates instead of dropping them. ``deduplication_report``
+        describes the saved clustering work and the kept coverage.
+
     Returns
     -------
     data : pandas.DataFrame
@@ -40,28 +328,155 @@ def import_bicliques(
     ValueError
         If any extracted submatrix contains a missing value.
     """
-    bicliques = pd.read_csv(bicliques_file, index_col=0)
+    views = _cached(
+        f"views[{None if dtype is None else np.dtype(dtype)}]",
+        (processed_data_file, bicliques_file),
+        partial(_extract_views, dtype=dtype),
+    )
+    if standardized:
+        data = views["data_std"]
+        complete_data = views["standardized"]
+    else:
+        data = _matrix(processed_data_file, dtype)["data"]
+        complete_data = views["raw"]
 
-    # bicliques are written in the file as strings separated with whitespace, with occasional \n
-    bicliques['found_rows'] = bicliques['found_rows'].map(
-        lambda s: np.fromstring(s.strip("[ ]").replace('\n', ''), sep=' ', dtype=int)
+    if deduplicate is None:
+        # callers receive copies, the cached frames stay untouched
+        return data.copy(), [df.copy() for df in complete_data]
+
+    kept, _ = deduplicate_bicliques(
+        read_bicliques(bicliques_file), deduplicate, merge=merge
     )
-    bicliques['found_cols'] = bicliques['found_cols'].map(
-        lambda s: np.fromstring(s.strip("[ ]").replace('\n', ''), sep=' ', dtype=int)
+    complete_data = [data.iloc[rows, cols] for rows, cols in kept]
+    if merge and not all(df.notna().all().all() for df in complete_data):
+        raise ValueError("Bicliques contain missing elements")
+    return data.copy(), complete_data
+
+
+def deduplication_report(
+    bicliques_file: str | PathLike[str],
+    deduplicate: float | None = None,
+    merge: bool = False,
+) -> dict[str, Any]:
+    """Describe what ``import_bicliques`` keeps with the same settings.
+
+    Parameters
+    ----------
+    bicliques_file : str or path-like
+        CSV file containing serialized row and column index arrays for complete
+        submatrices.
+
+    deduplicate, merge
+        As in ``import_bicliques``.
+
+    Returns
+    -------
+    dict
+        Report of ``overlap.deduplicate_bicliques``, with the saved
+        clustering work and the kept coverage.
+    """
+    # a threshold above any Jaccard similarity keeps every biclique
+    _, report = deduplicate_bicliques(
+        read_bicliques(bicliques_file),
+        np.inf if deduplicate is None else deduplicate,
+        merge=merge,
     )
+    return report
 
-    data = pd.read_parquet(processed_data_file)
 
-    if standardized:
-        scaler = StandardScaler().set_output(transform="pandas")
-        data = scaler.fit_transform(data)
+def _timed(load: Callable[..., Any], *args: Any) -> tuple[Any, float]:
+    start = perf_counter()
+    value = load(*args)
+    return value, perf_counter() - start
 
-    complete_data = []
-    for _, bc in bicliques.iterrows():
-        rows, cols = bc[["found_rows", "found_cols"]]
-        complete_data.append(data.iloc[rows, cols])
 
-    if not all(df.notna().all().all() for df in complete_data):
-        raise ValueError("Bicliques contain missing elements")
+def load_waves(
+    waves: Iterable[int],
+    processed_data_folder: str | PathLike[str],
+    *,
+    dtype: npt.DTypeLike | None = None,
+    max_workers: int | None = None,
+) -> tuple[dict[int, dict[str, Any]], pd.DataFrame]:
+    """Load the matrices and bicliques of several waves concurrently.
+
+    All files are read on a thread pool, parquet decoding and CSV parsing
+    largely running outside the GIL, and go through the import cache. The
+    matrices are then reindexed to the union of countries and indicators
+    over the loaded waves, and biclique positions are translated to it.
+
+    Parameters
+    ----------
+    waves : iterable of int
+        Findex waves to load.
+    processed_data_folder : str or path-like
+        Folder with ``base_values_wave_N.parquet`` and
+        ``bicliques_wave_N.csv`` files.
+    dtype : data-type or None, default=None
+        Floating-point type of the matrices, see ``import_bicliques``.
+    max_workers : int or None, default=None
+        Size of the thread pool.
 
-    return data, complete_data
+    Returns
+    -------
+    collections : dict of int to dict
+        For every wave, ``data``, its matrix on the shared countries and
+        indicators with ``NaN`` where a country or indicator is absent from
+        the wave, and ``bicliques``, row and column positions in ``data``.
+    timings : pandas.DataFrame
+        ``wave``, ``kind`` (``"matrix"`` or ``"bicliques"``), ``file``, and
+        load ``seconds`` of every file.
+    """
+    folder = Path(processed_data_folder)
+    waves = list(waves)
+    jobs = {}
+    for wave in waves:
+        jobs[wave, "matrix"] = (
+            folder / f"base_values_wave_{wave}.parquet",
+            partial(_matrix, dtype=dtype),
+        )
+        jobs[wave, "bicliques"] = (
+            folder / f"bicliques_wave_{wave}.csv",
+            read_bicliques,
+        )
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {
+            key: pool.submit(_timed, load, file)
+            for key, (file, load) in jobs.items()
+        }
+        loaded = {key: future.result() for key, future in futures.items()}
+
+    matrices = {wave: loaded[wave, "matrix"][0]["data"] for wave in waves}
+    countries = pd.Index(
+        sorted(set().union(*(m.index for m in matrices.values())))
+    )
+    indicators = pd.Index(
+        sorted(set().union(*(m.columns for m in matrices.values())))
+    )
+    countries.name = "country_id"
+    indicators.name = "series_id"
+
+    collections = {}
+    for wave, matrix in matrices.items():
+        rows = countries.get_indexer(matrix.index)
+        cols = indicators.get_indexer(matrix.columns)
+        collections[wave] = {
+            "data": matrix.reindex(index=countries, columns=indicators),
+            "bicliques": [
+                (rows[found_rows], cols[found_cols])
+                for found_rows, found_cols in loaded[wave, "bicliques"][0]
+            ],
+        }
+
+    timings = pd.DataFrame(
+        [
+            {
+                "wave": wave,
+                "kind": kind,
+                "file": str(file),
+                "seconds": loaded[wave, kind][1],
+            }
+            for (wave, kind), (file, _) in jobs.items()
+        ]
+    )
+    return collections, timings
@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+import numpy as np
+import pandas as pd
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import connected_components
+
+from correlation import pairwise_complete_correlation
+
+Biclique = tuple[np.ndarray, np.ndarray]
+
+METHODS = ("representative", "pca")
+
+
+def collinear_groups(
+    data: pd.DataFrame,
+    threshold: float = 0.95,
+    *,
+    min_periods: int = 10,
+    correlation: pd.DataFrame | None = None,
+) -> pd.Series:
+    """Group indicators linked by chains of near-collinear pairs.
+
+    Two indicators are linked when the absolute pairwise-complete
+    correlation reaches ``threshold``; groups are the connected components
+    of the links, found in one pass over the sparse link graph, so an
+    indicator joins a group as soon as it is collinear with one member.
+    Below about 0.95, chains can join weakly correlated indicators; the
+    ``correlation`` column of ``reduce_indicators``'s mapping shows it.
+
+    Parameters
+    ----------
+    data : pandas.DataFrame
+        Observations by row and indicators by column, missing values as
+        ``NaN``.
+    threshold : float, default=0.95
+        Absolute correlation from which two indicators are linked.
+    min_periods : int, default=10
+        Minimum number of shared observations for a pair to be linked.
+    correlation : pandas.DataFrame or None, default=None
+        Precomputed correlation of the columns of ``data``, as returned by
+        ``correlation.pairwise_complete_correlation``.
+
+    Returns
+    -------
+    pandas.Series
+        Group of every indicator, numbered from ``0`` in order of first
+        appearance in ``data.columns``.
+    """
+    if correlation is None:
+        correlation = pairwise_complete_correlation(
+            data, min_periods=min_periods
+        )[0]
+    values = np.abs(correlation.loc[data.columns, data.columns].to_numpy())
+    links = np.nan_to_num(values, nan=0.0) >= threshold
+    np.fill_diagonal(links, False)
+    _, components = connected_components(csr_matrix(links), directed=False)
+    # renumber groups by their first column
+    groups, _ = pd.factorize(components)
+    return pd.Series(groups, index=data.columns, name="group")
+
+
+def _first_component(
+    standardized: np.ndarray,
+    correlation: np.ndarray,
+    anchor: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    """First principal component scores and loadings of one group.
+
+    Loadings are the leading eigenvector of the pairwise-complete
+    correlation, signed to load positively on ``anchor``. A row's score is
+    the least-squares fit of its observed standardized values, so rows
+    missing some members still get a score.
+    """
+    _, vectors = np.linalg.eigh(np.nan_to_num(correlation, nan=0.0))
+    loadings = vectors[:, -1] * np.sign(vectors[anchor, -1] or 1.0)
+    observed = ~np.isnan(standardized)
+    weights = observed @ loadings**2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scores = np.nan_to_num(standardized) @ loadings / weights
+    scores[weights == 0] = np.nan
+    return scores, loadings
+
+
+def reduce_indicators(
+    data: pd.DataFrame,
+    threshold: float = 0.95,
+    *,
+    method: str = "representative",
+    min_periods: int = 10,
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Replace every group of near-collinear indicators by one feature.
+
+    Groups come from ``collinear_groups``. The representative of a group is
+    its most observed member, ties going to the member most correlated with
+    the others. With ``method="representative"`` it is kept as it is; with
+    ``method="pca"`` the group is replaced by the first principal component
+    of its standardized members, named after the representative.
+
+    Parameters
+    ----------
+    data : pandas.DataFrame
+        Observations by row and indicators by column, missing values as
+        ``NaN``, such as a ``base_values_wave_N`` matrix.
+    threshold : float, default=0.95
+        Absolute correlation from which two indicators are collinear.
+    method : {"representative", "pca"}, default="representative"
+        Feature kept for every group.
+    min_periods : int, default=10
+        Minimum number of shared observations for a pair to count.
+
+    Returns
+    -------
+    reduced : pandas.DataFrame
+        One column per group, in the order of the first member of every
+        group in ``data``. Singleton groups are left unchanged.
+    mapping : pandas.DataFrame
+        One row per indicator of ``data`` with its ``group``, the ``feature``
+        of ``reduced`` replacing it, whether it is the ``representative``,
+        its ``correlation`` with that feature, and its ``loading`` on the
+        first principal component (``NaN`` where no component replaces
+        the group).
+
+    Raises
+    ------
+    ValueError
+        If ``method`` is unknown.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown method: {method!r}.")
+    correlation = pairwise_complete_correlation(data, min_periods=min_periods)[0]
+    groups = collinear_groups(data, threshold, correlation=correlation)
+    corr = correlation.to_numpy()
+    counts = data.notna().sum().to_numpy()
+
+    values = data.to_numpy(dtype=np.float64)
+    features = {}
+    feature = np.empty(len(data.columns), dtype=object)
+    is_representative = np.zeros(len(data.columns), dtype=bool)
+    feature_correlation = np.ones(len(data.columns))
+    loading = np.full(len(data.columns), np.nan)
+    for group in range(groups.max() + 1):
+        members = np.flatnonzero(groups.to_numpy() == group)
+        if len(members) == 1:
+            representative = members[0]
+        else:
+            block = np.abs(corr[np.ix_(members, members)])
+            np.fill_diagonal(block, np.nan)
+            # mean absolute correlation with the other members, from sums
+            # and counts so that missing pairs raise no warning
+            linked = ~np.isnan(block)
+            centrality = np.nansum(block, axis=1) / np.maximum(linked.sum(axis=1), 1)
+            # most observed member, then the most central one
+            order = np.lexsort((-centrality, -counts[members]))
+            representative = members[order[0]]
+        name = data.columns[representative]
+        feature[members] = name
+        is_representative[representative] = True
+
+        if method == "representative" or len(members) == 1:
+            features[name] = values[:, representative]
+            feature_correlation[members] = corr[members, representative]
+            continue
+
+        block = values[:, members]
+        standardized = (block - np.nanmean(block, axis=0)) / np.nanstd(
+            block, axis=0
+        )
+        scores, loading[members] = _first_component(
+            standardized,
+            corr[np.ix_(members, members)],
+            int(np.flatnonzero(members == representative)[0]),
+        )
+        features[name] = scores
+        feature_correlation[members] = pd.DataFrame(block).corrwith(
+            pd.Series(scores)
+        )
+
+    mapping = pd.DataFrame(
+        {
+            "group": groups,
+            "feature": feature,
+            "representative": is_representative,
+            "correlation": feature_correlation,
+            "loading": loading,
+        },
+        index=data.columns,
+    )
+    reduced = pd.DataFrame(features, index=data.index)
+    reduced.columns.name = data.columns.name
+    return reduced, mapping
+
+
+def reduce_bicliques(
+    bicliques: Sequence[Biclique],
+    mapping: pd.DataFrame,
+    reduced: pd.DataFrame,
+) -> list[Biclique]:
+    """Map biclique columns from the original indicators to reduced features.
+
+    Every biclique keeps its rows and takes the features replacing its
+    indicators. Features missing on any of its rows are left out, which can
+    only happen to a representative that is not itself in the biclique, so
+    every reduced biclique stays complete.
+
+    Parameters
+    ----------
+    bicliques : sequence of tuple of numpy.ndarray
+        Row positions and column positions of every biclique in the matrix
+        ``mapping`` was built from.
+    mapping, reduced : pandas.DataFrame
+        Results of ``reduce_indicators``.
+
+    Returns
+    -------
+    list of tuple of numpy.ndarray
+        Row positions and sorted column positions in ``reduced``.
+    """
+    positions = reduced.columns.get_indexer(mapping["feature"])
+    observed = reduced.notna().to_numpy()
+    narrowed = []
+    for rows, cols in bicliques:
+        features = np.unique(positions[cols])
+        complete = observed[np.ix_(rows, features)].all(axis=0)
+        narrowed.append((rows, features[complete]))
+    return narrowed
@@ -0,0 +1,297 @@
+"""Render every clustering diagnostic to image files without notebooks.
+
+Usage::
+
+    python Src/report.py --waves 1 2 3 4 5 --output report
+"""
+from __future__ import annotations
+
+import argparse
+from collections.abc import Iterable, Sequence
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from os import PathLike
+from pathlib import Path
+from typing import Any
+
+import matplotlib as mpl
+import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+
+import numpy as np
+
+import clustering
+import clustering_plotting_utils
+import countries
+import data360
+import pipeline
+import plotting_utils
+import preparation
+
+PROCESSED_DATA_FOLDER = Path(__file__).resolve().parent.parent / "Data" / "Processed"
+
+
+def _init_worker() -> None:
+    # workers never open windows
+    mpl.use("Agg", force=True)
+
+
+def _save(
+    fig: Figure,
+    output_dir: Path,
+    name: str,
+    formats: Sequence[str],
+) -> list[Path]:
+    paths = []
+    for file_format in formats:
+        path = output_dir / f"{name}.{file_format}"
+        fig.savefig(path, bbox_inches="tight")
+        paths.append(path)
+    plt.close(fig)
+    return paths
+
+
+def _biclique_report(
+    processed_data_folder: Path,
+    wave: int,
+    position: int,
+    output_dir: Path,
+    options: dict[str, Any],
+) -> list[Path]:
+    """Metrics, refinement, and silhouette maps of one biclique."""
+    _, submatrices = preparation.import_bicliques(
+        processed_data_folder / f"base_values_wave_{wave}.parquet",
+        processed_data_folder / f"bicliques_wave_{wave}.csv",
+        standardized=True,
+    )
+    submatrix = submatrices[position]
+    data = submatrix.to_numpy()
+    ks = [k for k in options["ks"] if k < len(submatrix)]
+    models, labels = clustering.fit_kmeans_by_cluster_count(
+        data,
+        ks,
+        n_init=options["n_init"],
+        random_state=options["random_state"],
+        index=submatrix.index,
+        engine=options["engine"],
+    )
+    colors = mpl.color_sequences["tab20"]
+    name = f"biclique_{position:03d}"
+    shape = f"{submatrix.shape[0]} x {submatrix.shape[1]}"
+    formats = options["formats"]
+
+    paths = _save(
+        clustering_plotting_utils.clustering_metrics_figure(
+            {
+                shape: {
+                    "data": data,
+                    "labels": labels,
+                    "models": models,
+                    "color": colors[0],
+                }
+            },
+            ks,
+        ),
+        output_dir,
+        f"{name}_metrics",
+        formats,
+    )
+    paths += _save(
+        clustering_plotting_utils.refinement_figure(
+            clustering.reassignment_purity(labels),
+            title=f"Refinement between successive k-means partitions\n{shape} subset",
+        ),
+        output_dir,
+        f"{name}_refinement",
+        formats,
+    )
+    for k in options["map_ks"]:
+        if k in labels.columns:
+            paths += _save(
+                clustering_plotting_utils.silhouette_and_cluster_map_figure(
+                    data,
+                    labels,
+                    k,
+                    colors,
+                    title=f"{shape} subset clustering",
+                    crosswalk=options["crosswalk"],
+                ),
+                output_dir,
+                f"{name}_k{k}_silhouette_map",
+                formats,
+            )
+    return paths
+
+
+def _consensus_report(
+    processed_data_folder: Path,
+    wave: int,
+    k: int,
+    output_dir: Path,
+    options: dict[str, Any],
+) -> list[Path]:
+    """Map of the final consensus clustering of one wave for one K."""
+    result = pipeline.run_consensus(
+        processed_data_folder / f"base_values_wave_{wave}.parquet",
+        processed_data_folder / f"bicliques_wave_{wave}.csv",
+        k,
+        n_init=options["n_init"],
+        random_state=options["random_state"],
+        engine=options["engine"],
+    )
+    final = result["clusters"]["final"]
+    clusters = np.sort(final.unique())
+    colors = mpl.color_sequences["tab20"]
+    fig, ax = plt.subplots(figsize=(18, 9), layout="tight")
+    plotting_utils.plot_cluster_map(
+        ax,
+        final,
+        {cluster: str(cluster) for cluster in clusters},
+        {cluster: mpl.colors.to_hex(colors[cluster]) for cluster in clusters},
+        title=f"Wave {wave}: final clustering, K = {k}",
+        crosswalk=options["crosswalk"],
+    )
+    return _save(fig, output_dir, f"consensus_k{k}_map", options["formats"])
+
+
+def build_report(
+    waves: Iterable[int],
+    output_dir: str | PathLike[str],
+    *,
+    processed_data_folder: str | PathLike[str] = PROCESSED_DATA_FOLDER,
+    data360_db_path: str | PathLike[str] | None = None,
+    ks: Sequence[int] = tuple(range(2, 20)),
+    map_ks: Sequence[int] = (4, 5),
+    n_init: int = 100,
+    random_state: int = 42,
+    engine: str = "batched",
+    formats: Sequence[str] = ("png", "svg"),
+    max_workers: int | None = None,
+) -> list[Path]:
+    """Render every diagnostic of every wave to image files.
+
+    For every biclique: clustering metrics and refinement purity over ``ks``
+    and silhouette diagnostics with a cluster map for every K in ``map_ks``.
+    For every wave: a map of the final consensus clustering for every K in
+    ``map_ks``. Figures are rendered with the Agg backend across a process
+    pool. Countries are matched with the map through the crosswalk kept in
+    ``processed_data_folder``, built on first use; codes missing from the
+    map are matched by their Data360 name when ``data360_db_path`` is given.
+
+    Parameters
+    ----------
+    waves : iterable of int
+        Findex waves to report on.
+    output_dir : str or path-like
+        Root folder; each wave is written to its own ``wave_N`` subfolder.
+    processed_data_folder : str or path-like, default=Data/Processed
+        Folder with the processed matrices and biclique files.
+    data360_db_path : str, path-like, or None, default=None
+        Data360 SQLite database prepared with ``data360.prepare_data360``,
+        read for country names when the crosswalk is built.
+    ks : sequence of int, default=2..19
+        Cluster counts of the metric and refinement figures.
+    map_ks : sequence of int, default=(4, 5)
+        Cluster counts drawn on maps.
+    n_init, random_state, engine
+        K-means settings, see ``clustering.fit_kmeans_by_cluster_count``.
+    formats : sequence of str, default=("png", "svg")
+        File formats written for every figure.
+    max_workers : int or None, default=None
+        Size of the process pool.
+
+    Returns
+    -------
+    list of pathlib.Path
+        Written files.
+    """
+    folder = Path(processed_data_folder)
+    root = Path(output_dir)
+    waves = list(waves)
+    options = {
+        "ks": list(ks),
+        "map_ks": list(map_ks),
+        "n_init": n_init,
+        "random_state": random_state,
+        "engine": engine,
+        "formats": list(formats),
+    }
+
+    # countries are matched with the map once, not in every figure
+    codes = sorted(
+        set().union(
+            *(
+                preparation.load_matrix(
+                    folder / f"base_values_wave_{wave}.parquet"
+                ).index
+                for wave in waves
+            )
+        )
+    )
+    crosswalk_file = folder / countries.CROSSWALK_FILE.name
+    try:
+        options["crosswalk"] = countries.load_crosswalk(crosswalk_file, codes=codes)
+    except FileNotFoundError:
+        # the map and the Data360 names are only read for a build
+        options["crosswalk"] = countries.load_crosswalk(
+            crosswalk_file,
+            codes=codes,
+            world=plotting_utils.load_world(),
+            data360_areas=(
+                None
+                if data360_db_path is None
+                else data360.load_data360_areas(data360_db_path)
+            ),
+        )
+
+    jobs = []
+    for wave in waves:
+        wave_dir = root / f"wave_{wave}"
+        wave_dir.mkdir(parents=True, exist_ok=True)
+        bicliques = preparation.read_bicliques(folder / f"bicliques_wave_{wave}.csv")
+        jobs += [
+            (_biclique_report, folder, wave, position, wave_dir, options)
+            for position in range(len(bicliques))
+        ]
+        jobs += [
+            (_consensus_report, folder, wave, k, wave_dir, options)
+            for k in map_ks
+        ]
+
+    paths: list[Path] = []
+    with ProcessPoolExecutor(
+        max_workers=max_workers, initializer=_init_worker
+    ) as pool:
+        futures = [pool.submit(job, *arguments) for job, *arguments in jobs]
+        for future in as_completed(futures):
+            paths += future.result()
+    return sorted(paths)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--waves", type=int, nargs="+", default=[5])
+    parser.add_argument("--output", type=Path, required=True)
+    parser.add_argument("--processed", type=Path, default=PROCESSED_DATA_FOLDER)
+    parser.add_argument(
+        "--data360-db", type=Path, help="Data360 database with country names"
+    )
+    parser.add_argument("--map-ks", type=int, nargs="+", default=[4, 5])
+    parser.add_argument("--formats", nargs="+", default=["png", "svg"])
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    mpl.use("Agg", force=True)
+    paths = build_report(
+        args.waves,
+        args.output,
+        processed_data_folder=args.processed,
+        data360_db_path=args.data360_db,
+        map_ks=args.map_ks,
+        formats=args.formats,
+        max_workers=args.workers,
+    )
+    print(f"{len(paths)} files written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
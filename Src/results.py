@@ -0,0 +1,346 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Mapping
+from os import PathLike
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+
+FORMAT_VERSION = 1
+MATRICES = ("coobserved", "coclustered", "consensus")
+MANIFEST_FILE = "manifest.json"
+LABELS_FILE = "labels.parquet"
+NEIGHBOURS_FILE = "neighbours.npy"
+PROFILES_FILE = "profiles.parquet"
+
+
+def condense(matrix: pd.DataFrame | np.ndarray) -> np.ndarray:
+    """Upper triangle of a symmetric matrix, diagonal included, row by row.
+
+    Parameters
+    ----------
+    matrix : pandas.DataFrame or numpy.ndarray of shape (n, n)
+        Symmetric matrix.
+
+    Returns
+    -------
+    numpy.ndarray of shape (n * (n + 1) // 2,)
+        Condensed values, in the dtype of ``matrix``.
+    """
+    values = np.asarray(matrix)
+    return values[np.triu_indices(len(values))]
+
+
+def condensed_index(n: int, i: npt.ArrayLike, j: npt.ArrayLike) -> np.ndarray:
+    """Position of entry (i, j) of an ``n x n`` matrix in its condensed form."""
+    i, j = np.asarray(i), np.asarray(j)
+    low, high = np.minimum(i, j), np.maximum(i, j)
+    return low * n - low * (low - 1) // 2 + (high - low)
+
+
+def neighbour_index(consensus: pd.DataFrame | np.ndarray) -> np.ndarray:
+    """Sort every row of a consensus matrix by decreasing consensus.
+
+    Parameters
+    ----------
+    consensus : pandas.DataFrame or numpy.ndarray of shape (n, n)
+        Consensus matrix.
+
+    Returns
+    -------
+    numpy.ndarray of shape (n, n - 1)
+        Positions of the other rows, most co-clustered first; ties keep the
+        row order.
+    """
+    values = np.array(consensus, dtype=np.float64)
+    n = len(values)
+    np.fill_diagonal(values, -np.inf)
+    order = np.argsort(-values, axis=1, kind="stable")[:, : n - 1]
+    return order.astype(np.int16 if n <= np.iinfo(np.int16).max else np.int32)
+
+
+def cluster_profiles(data: pd.DataFrame, final: pd.Series) -> pd.DataFrame:
+    """Describe every final cluster by its mean indicator values.
+
+    Parameters
+    ----------
+    data : pandas.DataFrame
+        Unstandardized feature matrix, countries by row.
+    final : pandas.Series
+        Final cluster of every country.
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per cluster and indicator, with the cluster ``mean``, the
+        ``overall`` mean, their ``difference`` in overall standard
+        deviations, ``n_obs``, the observed countries of the cluster, and
+        ``coverage``, their share of the cluster. Rows of every cluster are
+        sorted by decreasing absolute difference.
+    """
+    data = data.loc[final.index]
+    grouped = data.groupby(final.to_numpy())
+    profiles = pd.DataFrame(
+        {
+            "mean": grouped.mean().stack(),
+            "n_obs": grouped.count().stack(),
+        }
+    )
+    profiles.index.names = ["cluster", "indicator"]
+    profiles = profiles.reset_index()
+    indicators = profiles["indicator"]
+    profiles["overall"] = indicators.map(data.mean()).to_numpy()
+    profiles["difference"] = (
+        profiles["mean"] - profiles["overall"]
+    ) / indicators.map(data.std()).to_numpy()
+    profiles["coverage"] = profiles["n_obs"] / profiles["cluster"].map(
+        final.value_counts()
+    )
+    order = np.lexsort((-profiles["difference"].abs(), profiles["cluster"]))
+    return profiles.iloc[order].reset_index(drop=True)[
+        ["cluster", "indicator", "mean", "overall", "difference", "n_obs", "coverage"]
+    ]
+
+
+def index_results(
+    directory: str | PathLike[str],
+    data: pd.DataFrame | None = None,
+) -> Path:
+    """Add the neighbour index and cluster profiles to saved results.
+
+    Parameters
+    ----------
+    directory : str or path-like
+        Folder written by ``save_results``.
+    data : pandas.DataFrame or None, default=None
+        Unstandardized feature matrix the profiles are computed from. When
+        ``None``, only the neighbour index is written.
+
+    Returns
+    -------
+    pathlib.Path
+        Path of the updated manifest.
+    """
+    stored = Results(directory)
+    manifest = stored.manifest
+    if "consensus" in manifest["matrices"]:
+        neighbours = neighbour_index(stored.matrix("consensus"))
+        np.save(stored.directory / NEIGHBOURS_FILE, neighbours)
+        manifest["neighbours"] = {
+            "file": NEIGHBOURS_FILE,
+            "dtype": neighbours.dtype.str,
+            "shape": list(neighbours.shape),
+        }
+    if data is not None:
+        final = pd.Series(stored.labels["final"].to_numpy(), stored.countries)
+        cluster_profiles(data, final).to_parquet(
+            stored.directory / PROFILES_FILE, index=False
+        )
+        manifest["profiles"] = {"file": PROFILES_FILE}
+    path = stored.directory / MANIFEST_FILE
+    path.write_text(json.dumps(manifest, indent=1))
+    return path
+
+
+def save_results(
+    result: Mapping[str, Any],
+    directory: str | PathLike[str],
+    **metadata: Any,
+) -> Path:
+    """Write clustering results in a columnar, memory-mappable layout.
+
+    Labels are written as one ``int8`` parquet column per biclique plus
+    ``final``. Each of the ``coobserved``, ``coclustered``, and
+    ``consensus`` matrices found in ``result`` is written as the ``.npy``
+    array of its condensed upper triangle. ``manifest.json`` lists the
+    countries, the files, and their dtypes. The neighbour index and, when
+    ``result`` holds the ``raw_data``, the cluster profiles are added by
+    ``index_results``.
+
+    Parameters
+    ----------
+    result : mapping
+        Result of ``pipeline.run_consensus``, or any mapping with the padded
+        ``clusters`` table and optionally the count and consensus matrices.
+    directory : str or path-like
+        Destination folder, created if needed.
+    **metadata
+        JSON-serializable values stored in the manifest, such as the wave
+        and the number of clusters.
+
+    Returns
+    -------
+    pathlib.Path
+        Path of the manifest.
+
+    Raises
+    ------
+    ValueError
+        If a label does not fit in ``int8``.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    clusters = result["clusters"]
+    if clusters.to_numpy().max() > np.iinfo(np.int8).max:
+        raise ValueError("Labels do not fit in int8.")
+
+    labels = clusters.astype(np.int8)
+    labels.columns = labels.columns.astype(str)
+    labels.to_parquet(directory / LABELS_FILE)
+
+    matrices = {}
+    for name in MATRICES:
+        if name not in result:
+            continue
+        matrix = result[name]
+        if isinstance(matrix, pd.DataFrame) and not matrix.index.equals(
+            clusters.index
+        ):
+            matrix = matrix.loc[clusters.index, clusters.index]
+        condensed = condense(matrix)
+        np.save(directory / f"{name}.npy", condensed)
+        matrices[name] = {
+            "file": f"{name}.npy",
+            "dtype": condensed.dtype.str,
+            "length": len(condensed),
+        }
+
+    manifest = {
+        "format_version": FORMAT_VERSION,
+        "countries": [str(country) for country in clusters.index],
+        "labels": {"file": LABELS_FILE, "columns": list(labels.columns)},
+        "matrices": matrices,
+        "triangle": "upper, diagonal included, row-major",
+        "metadata": metadata,
+    }
+    path = directory / MANIFEST_FILE
+    path.write_text(json.dumps(manifest, indent=1))
+    return index_results(directory, result.get("raw_data"))
+
+
+class Results:
+    """Lazy reader of results written by ``save_results``.
+
+    Only the manifest is read when opening. Labels are read on first
+    access; matrices are memory-mapped and expanded only on request.
+
+    Parameters
+    ----------
+    directory : str or path-like
+        Folder written by ``save_results``.
+    """
+
+    def __init__(self, directory: str | PathLike[str]) -> None:
+        self.directory = Path(directory)
+        self.manifest = json.loads((self.directory / MANIFEST_FILE).read_text())
+        if self.manifest["format_version"] != FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported results format {self.manifest['format_version']}."
+            )
+        self.countries = pd.Index(self.manifest["countries"])
+        self._labels: pd.DataFrame | None = None
+        self._condensed: dict[str, np.ndarray] = {}
+        self._neighbours: np.ndarray | None = None
+        self._profiles: pd.DataFrame | None = None
+
+    @property
+    def metadata(self) -> dict[str, Any]:
+        return self.manifest["metadata"]
+
+    @property
+    def labels(self) -> pd.DataFrame:
+        """Label table with string biclique columns and ``final``."""
+        if self._labels is None:
+            self._labels = pd.read_parquet(
+                self.directory / self.manifest["labels"]["file"]
+            )
+        return self._labels
+
+    def condensed(self, name: str) -> np.ndarray:
+        """Memory-mapped condensed upper triangle of a matrix."""
+        if name not in self._condensed:
+            if name not in self.manifest["matrices"]:
+                raise KeyError(f"No {name!r} matrix in {self.directory}.")
+            file = self.manifest["matrices"][name]["file"]
+            self._condensed[name] = np.load(self.directory / file, mmap_mode="r")
+        return self._condensed[name]
+
+    def matrix(self, name: str) -> pd.DataFrame:
+        """Expand a matrix to its square form."""
+        n = len(self.countries)
+        square = np.empty((n, n), dtype=self.condensed(name).dtype)
+        upper = np.triu_indices(n)
+        square[upper] = self.condensed(name)
+        square.T[upper] = self.condensed(name)
+        return pd.DataFrame(square, index=self.countries, columns=self.countries)
+
+    def row(self, name: str, country: str) -> pd.Series:
+        """Values of one country against every country, without expanding."""
+        n = len(self.countries)
+        position = self.countries.get_loc(country)
+        values = self.condensed(name)[condensed_index(n, position, np.arange(n))]
+        return pd.Series(values, index=self.countries, name=country)
+
+    def pair(self, name: str, first: str, second: str) -> Any:
+        """Value of one pair of countries."""
+        n = len(self.countries)
+        i, j = self.countries.get_indexer([first, second])
+        return self.condensed(name)[condensed_index(n, i, j)]
+
+    @property
+    def neighbour_positions(self) -> np.ndarray:
+        """Memory-mapped neighbour index, see ``neighbour_index``."""
+        if self._neighbours is None:
+            if "neighbours" not in self.manifest:
+                raise KeyError(
+                    f"No neighbour index in {self.directory}, "
+                    "see index_results."
+                )
+            self._neighbours = np.load(
+                self.directory / self.manifest["neighbours"]["file"],
+                mmap_mode="r",
+            )
+        return self._neighbours
+
+    def neighbours(self, country: str, n: int | None = None) -> pd.Series:
+        """Countries most often co-clustered with ``country``, in order."""
+        position = self.countries.get_loc(country)
+        others = np.asarray(self.neighbour_positions[position, :n])
+        values = self.condensed("consensus")[
+            condensed_index(len(self.countries), position, others)
+        ]
+        return pd.Series(values, index=self.countries[others], name=country)
+
+    @property
+    def profiles(self) -> pd.DataFrame:
+        """Cluster profiles, see ``cluster_profiles``."""
+        if self._profiles is None:
+            if "profiles" not in self.manifest:
+                raise KeyError(
+                    f"No cluster profiles in {self.directory}, "
+                    "see index_results."
+                )
+            self._profiles = pd.read_parquet(
+                self.directory / self.manifest["profiles"]["file"]
+            )
+        return self._profiles
+
+
+def open_results(directory: str | PathLike[str]) -> Results:
+    """Open results written by ``save_results`` without reading the arrays.
+
+    Parameters
+    ----------
+    directory : str or path-like
+        Folder written by ``save_results``.
+
+    Returns
+    -------
+    Results
+        Lazy reader.
+    """
+    return Results(directory)
@@ -0,0 +1,309 @@
+"""Answer label, neighbour, and profile queries over saved clustering results.
+
+Usage::
+
+    python Src/service.py Data/Processed/results_4 Data/Processed/results_5
+
+    curl "localhost:8000/labels?country=BRA"
+    curl "localhost:8000/neighbours?country=KEN&n=10&results=results_5"
+    curl "localhost:8000/profile?cluster=2&results=results_4"
+"""
+from __future__ import annotations
+
+import argparse
+import json
+from collections.abc import Iterable, Sequence
+from itertools import islice
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from os import PathLike
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+import pandas as pd
+
+import countries
+from results import Results, condensed_index, open_results
+
+
+def _check_count(n: int) -> None:
+    if n < 1:
+        raise ValueError(f"n must be at least 1, got {n}.")
+
+
+class QueryService:
+    """In-process queries over results written by ``results.save_results``.
+
+    Consensus values and the neighbour index stay memory-mapped; labels,
+    cluster members, and profiles are read once when the service starts
+    and kept in dictionaries, so every query is a few lookups.
+
+    Parameters
+    ----------
+    directories : iterable of str or path-like
+        Result folders with the neighbour index and cluster profiles, see
+        ``results.index_results``. Each is queried by its folder name; the
+        last one is the default.
+    crosswalk : pandas.DataFrame or None, default=None
+        Country crosswalk from ``countries.load_crosswalk``, naming the
+        countries of neighbour and profile answers.
+    """
+
+    def __init__(
+        self,
+        directories: Iterable[str | PathLike[str]],
+        crosswalk: pd.DataFrame | None = None,
+    ) -> None:
+        self.results = {
+            Path(directory).name: open_results(directory)
+            for directory in directories
+        }
+        if not self.results:
+            raise ValueError("At least one results folder is required.")
+        self.default = list(self.results)[-1]
+        self._names = (
+            {}
+            if crosswalk is None
+            else crosswalk.dropna(subset=["name"]).set_index("iso3")["name"].to_dict()
+        )
+        self._countries = {}
+        self._positions = {}
+        self._labels = {}
+        self._members = {}
+        self._profiles = {}
+        for name, stored in self.results.items():
+            self._countries[name] = list(stored.countries)
+            self._positions[name] = {
+                country: position
+                for position, country in enumerate(self._countries[name])
+            }
+            labels = stored.labels
+            final = labels["final"].to_numpy()
+            biclique_labels = labels.drop(columns="final")
+            self._labels[name] = (
+                list(biclique_labels.columns),
+                biclique_labels.to_numpy(),
+                final,
+            )
+            self._members[name] = {
+                int(cluster): [
+                    {"country": country, "name": self._names.get(country)}
+                    for country in stored.countries[final == cluster]
+                ]
+                for cluster in np.unique(final)
+            }
+            self._profiles[name] = {
+                int(cluster): profile.drop(columns="cluster").to_dict("records")
+                for cluster, profile in stored.profiles.groupby("cluster")
+            }
+        # warm the memory maps
+        for stored in self.results.values():
+            stored.neighbour_positions
+            stored.condensed("consensus")
+
+    def _stored(self, name: str | None) -> tuple[str, Results]:
+        name = self.default if name is None else name
+        if name not in self.results:
+            raise KeyError(f"Unknown results {name!r}.")
+        return name, self.results[name]
+
+    def _position(self, name: str, country: str) -> int:
+        try:
+            return self._positions[name][country]
+        except KeyError:
+            raise KeyError(f"Unknown country {country!r} in {name}.") from None
+
+    def countries(self) -> dict[str, Any]:
+        """Countries and clusters of every results folder."""
+        return {
+            name: {
+                "countries": self._countries[name],
+                "clusters": list(self._members[name]),
+                "metadata": stored.metadata,
+            }
+            for name, stored in self.results.items()
+        }
+
+    def labels(self, country: str, results: str | None = None) -> dict[str, Any]:
+        """Final and per-biclique labels of a country.
+
+        Every results folder is answered when ``results`` is ``None``, so
+        the labels under different numbers of clusters come side by side.
+        Bicliques that do not cover the country are left out.
+        """
+        if results is None:
+            names = list(self.results)
+        else:
+            names = [self._stored(results)[0]]
+        answer = {}
+        for name in names:
+            position = self._position(name, country)
+            columns, biclique_labels, final = self._labels[name]
+            row = biclique_labels[position]
+            answer[name] = {
+                "final": int(final[position]),
+                "bicliques": {
+                    column: int(label)
+                    for column, label in zip(columns, row)
+                    if label >= 0
+                },
+            }
+        return answer
+
+    def neighbours(
+        self,
+        country: str,
+        n: int = 10,
+        results: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """Countries most often co-clustered with ``country``, in order.
+
+        Countries are named through the crosswalk, ``None`` without one.
+        """
+        _check_count(n)
+        name, stored = self._stored(results)
+        position = self._position(name, country)
+        others = np.asarray(stored.neighbour_positions[position, :n])
+        values = stored.condensed("consensus")[
+            condensed_index(len(stored.countries), position, others)
+        ]
+        countries = self._countries[name]
+        return [
+            {
+                "country": countries[other],
+                "name": self._names.get(countries[other]),
+                "consensus": float(value),
+            }
+            for other, value in zip(others.tolist(), values.tolist())
+        ]
+
+    def profile(
+        self,
+        cluster: int,
+        n: int = 10,
+        results: str | None = None,
+        min_coverage: float = 0.5,
+    ) -> dict[str, Any]:
+        """Members of a final cluster and its most distinctive indicators.
+
+        Indicators observed in less than ``min_coverage`` of the members are
+        left out; members are named like in ``neighbours``.
+        """
+        _check_count(n)
+        name, _ = self._stored(results)
+        if cluster not in self._members[name]:
+            raise KeyError(f"Unknown cluster {cluster} in {name}.")
+        # profiles are sorted, the first covered indicators are the answer
+        covered = (
+            row
+            for row in self._profiles[name][cluster]
+            if row["coverage"] >= min_coverage
+        )
+        return {
+            "cluster": cluster,
+            "members": self._members[name][cluster],
+            "indicators": list(islice(covered, n)),
+        }
+
+    def query(self, path: str) -> tuple[int, Any]:
+        """Answer a URL path such as ``/neighbours?country=KEN&n=5``.
+
+        Returns
+        -------
+        status : int
+            HTTP status: ``200``, ``400`` for invalid parameters, or ``404``
+            for unknown routes, results, countries, or clusters.
+        payload
+            JSON-serializable answer or ``{"error": message}``.
+        """
+        url = urlsplit(path)
+        parameters = {
+            key: values[-1] for key, values in parse_qs(url.query).items()
+        }
+        routes = {
+            "/countries": lambda: self.countries(),
+            "/labels": lambda: self.labels(
+                parameters["country"], parameters.get("results")
+            ),
+            "/neighbours": lambda: self.neighbours(
+                parameters["country"],
+                int(parameters.get("n", 10)),
+                parameters.get("results"),
+            ),
+            "/profile": lambda: self.profile(
+                int(parameters["cluster"]),
+                int(parameters.get("n", 10)),
+                parameters.get("results"),
+                float(parameters.get("min_coverage", 0.5)),
+            ),
+        }
+        if url.path not in routes:
+            return 404, {"error": f"Unknown route {url.path!r}."}
+        required = "cluster" if url.path == "/profile" else "country"
+        if url.path != "/countries" and required not in parameters:
+            return 400, {"error": f"Missing parameter {required!r}."}
+        try:
+            return 200, routes[url.path]()
+        except KeyError as error:
+            return 404, {"error": error.args[0]}
+        except ValueError as error:
+            return 400, {"error": str(error)}
+
+
+def serve(
+    service: QueryService,
+    host: str = "127.0.0.1",
+    port: int = 8000,
+) -> ThreadingHTTPServer:
+    """Create an HTTP server answering ``QueryService.query`` with JSON.
+
+    Call ``serve_forever`` on the returned server to start answering.
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            status, payload = service.query(self.path)
+            body = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            # requests are not logged, load tests would flood the console
+            pass
+
+    return ThreadingHTTPServer((host, port), Handler)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("results", nargs="+", help="results folders")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument(
+        "--crosswalk",
+        type=Path,
+        default=countries.CROSSWALK_FILE,
+        help="country crosswalk naming the countries",
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        crosswalk = countries.load_crosswalk(args.crosswalk)
+    except FileNotFoundError:
+        crosswalk = None
+    server = serve(QueryService(args.results, crosswalk), args.host, args.port)
+    print(f"Serving on http://{args.host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
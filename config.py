@@ -21,3 +21,16 @@ try:
     from config_local import DATA360_DB_PATH
 except ImportError:
     pass
+
+# fitted results reused across notebook runs
+CACHE_DIR = Path(
+    os.getenv(
+        "FINDEX_CACHE_DIR",
+        PROJECT_ROOT / "Data" / "Cache"
+    )
+)
+
+try:
+    from config_local import CACHE_DIR
+except ImportError:
+    pass
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# the modules of Src are imported flat, as in the notebooks
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "Src"))
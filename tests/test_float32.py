@@ -0,0 +1,57 @@
+"""The float32 compute mode reproduces the float64 clustering of wave 5."""
+from pathlib import Path
+
+import numpy as np
+import pytest
+from sklearn.metrics import adjusted_rand_score
+
+import pipeline
+
+PROCESSED_DATA_FOLDER = Path(__file__).resolve().parent.parent / "Data" / "Processed"
+N_CLUSTERS = 5
+# consensus values are co-clustering rates over at most a few dozen
+# bicliques; float32 division keeps them within a few float32 epsilons
+CONSENSUS_ATOL = 1e-6
+
+
+@pytest.fixture(scope="module")
+def results():
+    return {
+        dtype: pipeline.run_consensus(
+            PROCESSED_DATA_FOLDER / "base_values_wave_5.parquet",
+            PROCESSED_DATA_FOLDER / "bicliques_wave_5.csv",
+            N_CLUSTERS,
+            dtype=dtype,
+        )
+        for dtype in (np.float64, np.float32)
+    }
+
+
+def test_float32_end_to_end(results):
+    single = results[np.float32]
+    assert (single["data"].dtypes == np.float32).all()
+    assert all((df.dtypes == np.float32).all() for df in single["submatrices"])
+    assert (single["consensus"].dtypes == np.float32).all()
+
+
+def test_biclique_labels_match(results):
+    double, single = results[np.float64], results[np.float32]
+    assert double["labels"].keys() == single["labels"].keys()
+    for position in double["labels"]:
+        assert adjusted_rand_score(
+            double["labels"][position], single["labels"][position]
+        ) == pytest.approx(1.0), f"biclique {position}"
+
+
+def test_final_labels_match(results):
+    assert adjusted_rand_score(
+        results[np.float64]["clusters"]["final"],
+        results[np.float32]["clusters"]["final"],
+    ) == pytest.approx(1.0)
+
+
+def test_consensus_within_tolerance(results):
+    double = results[np.float64]["consensus"].to_numpy()
+    single = results[np.float32]["consensus"].to_numpy(np.float64)
+    np.testing.assert_array_equal(np.isnan(double), np.isnan(single))
+    np.testing.assert_allclose(single, double, rtol=0, atol=CONSENSUS_ATOL)
@@ -0,0 +1,37 @@
+"""Out-of-sample assignment places revised countries by their new values."""
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+import model
+import pipeline
+import preparation
+
+PROCESSED_DATA_FOLDER = Path(__file__).resolve().parent.parent / "Data" / "Processed"
+DATA_FILE = PROCESSED_DATA_FOLDER / "base_values_wave_5.parquet"
+BICLIQUES_FILE = PROCESSED_DATA_FOLDER / "bicliques_wave_5.csv"
+N_CLUSTERS = 5
+OPTIONS = {"engine": "batched", "n_init": 10, "random_state": 42}
+
+
+@pytest.fixture(scope="module")
+def fitted():
+    result = pipeline.run_consensus(DATA_FILE, BICLIQUES_FILE, N_CLUSTERS, **OPTIONS)
+    mean, scale = preparation.standardization_parameters(DATA_FILE)
+    return result, model.build_model(result, mean, scale)
+
+
+def test_revised_country_follows_its_new_values(fitted):
+    result, fitted_model = fitted
+    final = result["clusters"]["final"]
+    consensus = result["consensus"].to_numpy()
+    # every country takes the values of its most co-clustered country
+    # outside its own final cluster, so its old cluster should not hold it
+    outside = np.where(final.to_numpy()[:, None] != final.to_numpy(), consensus, -1)
+    donors = final.index[outside.argmax(axis=1)]
+    revised = result["raw_data"].loc[donors].set_axis(final.index)
+
+    placed = model.predict(fitted_model, revised)["final"]
+    expected = final[donors].set_axis(final.index)
+    assert (placed == expected).all(), list(final.index[placed != expected])
@@ -0,0 +1,96 @@
+"""Incremental updates keep revised bicliques complete and every country."""
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import pipeline
+
+PROCESSED_DATA_FOLDER = Path(__file__).resolve().parent.parent / "Data" / "Processed"
+DATA_FILE = PROCESSED_DATA_FOLDER / "base_values_wave_5.parquet"
+BICLIQUES_FILE = PROCESSED_DATA_FOLDER / "bicliques_wave_5.csv"
+N_CLUSTERS = 5
+OPTIONS = {"engine": "batched", "n_init": 10, "random_state": 42}
+# the 140 x 6 biclique covering every country
+BACKBONE = 0
+BACKBONE_COLUMNS = [
+    "account.t.d", "con1", "con9a", "fiaccount.t.d", "fin2.t.d", "internet"
+]
+
+
+@pytest.fixture(scope="module")
+def previous():
+    return pipeline.run_consensus(DATA_FILE, BICLIQUES_FILE, N_CLUSTERS, **OPTIONS)
+
+
+def revise(folder: Path, country: str, columns: list[str]) -> Path:
+    data = pd.read_parquet(DATA_FILE)
+    data.loc[country, columns] = np.nan
+    revised_file = folder / DATA_FILE.name
+    data.to_parquet(revised_file)
+    return revised_file
+
+
+def check_consistent(result):
+    """Complete submatrices whose counts equal a full consensus run on them."""
+    assert all(sub.notna().all().all() for sub in result["submatrices"])
+    assert not result["consensus"].isna().any().any()
+    full = pipeline.consensus_from_submatrices(
+        result["submatrices"], N_CLUSTERS, **OPTIONS
+    )
+    countries = result["clusters"].index
+    assert full["clusters"].index.sort_values().equals(countries.sort_values())
+    for matrix in ("coobserved", "coclustered"):
+        np.testing.assert_array_equal(
+            result[matrix].to_numpy(),
+            full[matrix].loc[countries, countries].to_numpy(),
+        )
+
+
+def test_lost_value_prunes_indicator(previous, tmp_path):
+    # fin10 of Azerbaijan is in 49 of the 59 bicliques
+    result = pipeline.update_consensus(
+        previous, revise(tmp_path, "AZE", ["fin10"]), N_CLUSTERS, **OPTIONS
+    )
+    assert len(result["dropped"]) == 0
+    assert len(result["pruned"]) == 49
+    assert len(result["submatrices"]) == len(previous["submatrices"])
+    for position in result["pruned"]:
+        before = previous["submatrices"][position]
+        after = result["submatrices"][position]
+        assert after.index.equals(before.index)
+        assert after.columns.equals(before.columns.drop("fin10"))
+    assert len(result["uncovered"]) == 0
+    check_consistent(result)
+
+    # a later update starts from the pruned bicliques
+    again = pipeline.update_consensus(
+        result, revise(tmp_path, "AZE", ["fin10"]), N_CLUSTERS, **OPTIONS
+    )
+    assert len(again["changes"]) == 0
+    assert len(again["reclustered"]) == 0
+    pd.testing.assert_frame_equal(again["clusters"], result["clusters"])
+
+
+def test_lost_backbone_value_keeps_country(previous, tmp_path):
+    # the United States are only covered by the backbone
+    result = pipeline.update_consensus(
+        previous, revise(tmp_path, "USA", ["internet"]), N_CLUSTERS, **OPTIONS
+    )
+    backbone = result["submatrices"][BACKBONE]
+    assert "USA" in backbone.index
+    assert "internet" not in backbone.columns
+    assert "USA" in result["clusters"].index
+    assert len(result["uncovered"]) == 0
+    check_consistent(result)
+
+
+def test_country_losing_all_coverage_is_excluded(previous, tmp_path):
+    result = pipeline.update_consensus(
+        previous, revise(tmp_path, "USA", BACKBONE_COLUMNS), N_CLUSTERS, **OPTIONS
+    )
+    assert list(result["uncovered"]) == ["USA"]
+    assert "USA" not in result["clusters"].index
+    assert "USA" not in result["submatrices"][BACKBONE].index
+    check_consistent(result)